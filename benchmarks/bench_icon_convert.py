@@ -0,0 +1,76 @@
+"""图标转换基准：临时文件（BMP -> PIL -> ICO -> QIcon）vs 内存直接构造 QImage
+
+使用构造的 32 位位图数据，可在任何平台运行。
+用法: python benchmarks/bench_icon_convert.py [次数] [边长]
+"""
+import os
+import sys
+import time
+import tempfile
+import importlib.util
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PIL import Image  # noqa: E402
+from PyQt5.QtGui import QGuiApplication, QIcon, QPixmap  # noqa: E402
+
+# 直接加载转换模块，不经过 utils 包（包内其他模块依赖 pywin32）
+_spec = importlib.util.spec_from_file_location(
+    "icon_convert", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                 "utils", "icon_convert.py"))
+icon_convert = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(icon_convert)
+bitmap_bits_to_qimage = icon_convert.bitmap_bits_to_qimage
+bitmap_stride = icon_convert.bitmap_stride
+
+
+def make_bitmap(size):
+    """构造一个 BGRA 渐变位图（与 GetBitmapBits 返回的布局相同）"""
+    row = bytearray()
+    for x in range(size):
+        row += bytes((x * 255 // size, 128, 255 - x * 255 // size, 255))
+    return bytes(row) * size
+
+
+def bench_tempfile(bits, size, count):
+    """原方式：写 BMP，PIL 打开后另存 ICO，再由 QIcon 加载"""
+    start = time.perf_counter()
+    for _ in range(count):
+        with tempfile.NamedTemporaryFile(suffix='.bmp', delete=False) as temp_bmp:
+            bmp_path = temp_bmp.name
+        with tempfile.NamedTemporaryFile(suffix='.ico', delete=False) as temp_ico:
+            ico_path = temp_ico.name
+        Image.frombuffer("RGBA", (size, size), bits, "raw", "BGRA", 0, 1).save(bmp_path)
+        Image.open(bmp_path).save(ico_path, format='ICO')
+        icon = QIcon(ico_path)
+        icon.pixmap(size, size)
+        os.remove(bmp_path)
+        os.remove(ico_path)
+    return (time.perf_counter() - start) / count
+
+
+def bench_memory(bits, size, count):
+    """内存方式：像素数据直接构造 QImage"""
+    start = time.perf_counter()
+    for _ in range(count):
+        image = bitmap_bits_to_qimage(bits, size, size, 32, bitmap_stride(size, 32))
+        icon = QIcon(QPixmap.fromImage(image))
+        icon.pixmap(size, size)
+    return (time.perf_counter() - start) / count
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    size = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+    app = QGuiApplication(sys.argv[:1])  # noqa: F841  QPixmap 需要应用实例
+
+    bits = make_bitmap(size)
+    tempfile_ms = bench_tempfile(bits, size, count)
+    memory_ms = bench_memory(bits, size, count)
+    print(f"图标边长: {size}, 次数: {count}")
+    print(f"临时文件 : {tempfile_ms * 1000:.3f} ms/个")
+    print(f"内存转换 : {memory_ms * 1000:.3f} ms/个 ({tempfile_ms / memory_ms:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""启动引擎基准：shell 启动 vs 直接启动
+
+用法: python benchmarks/bench_spawn.py [次数] [可执行文件]
+"""
+import os
+import sys
+import time
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.spawn_utils import resolve_launch_spec, spawn_process  # noqa: E402
+
+
+def wait_exit(proc):
+    """等待子进程退出（Popen 与 SpawnedProcess 通用）"""
+    while proc.poll() is None:
+        time.sleep(0.0005)
+
+
+def bench_shell(path, count):
+    """原方式：Popen(path, shell=True)"""
+    start = time.perf_counter()
+    for _ in range(count):
+        proc = subprocess.Popen(path, shell=True)
+        wait_exit(proc)
+    return (time.perf_counter() - start) / count
+
+
+def bench_direct(path, count):
+    """直接启动：解析缓存 + posix_spawn/Popen，无shell"""
+    start = time.perf_counter()
+    for _ in range(count):
+        proc = spawn_process(resolve_launch_spec(path))
+        wait_exit(proc)
+    return (time.perf_counter() - start) / count
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    default = "C:\\Windows\\System32\\whoami.exe" if os.name == 'nt' else "/bin/true"
+    path = sys.argv[2] if len(sys.argv) > 2 else default
+
+    # 模拟体积较大的启动器进程（fork 成本随常驻内存增长）
+    ballast = b"\x01" * (256 * 1024 * 1024)
+
+    shell = bench_shell(path, count)
+    direct = bench_direct(path, count)
+    print(f"目标: {path}, 次数: {count}")
+    print(f"shell=True : {shell * 1000:.3f} ms/次")
+    print(f"直接启动   : {direct * 1000:.3f} ms/次 ({shell / direct:.2f}x)")
+    del ballast
+
+
+if __name__ == "__main__":
+    main()
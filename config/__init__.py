@@ -1,3 +1,4 @@
 """配置管理模块"""
 from .settings import *
 from .constants import *
+from .groups import *
@@ -3,11 +3,19 @@
 # 配置文件名
 CONFIG_FILE = "software_groups.json"
 SETTINGS_FILE = "settings.json"
+LAUNCH_REGISTRY_FILE = "launched_processes.json"  # 启动器拉起的进程登记表
+PREWARM_CACHE_FILE = "prewarm_cache.json"  # 启动预热记录
+LAUNCH_TELEMETRY_FILE = "launch_telemetry.json"  # 启动耗时记录
 
 # 默认设置
 DEFAULT_SETTINGS = {
     "auto_start": False,
-    "minimize_to_tray": True
+    "minimize_to_tray": True,
+    "close_grace_timeout": 3.0,  # 关闭组时等待程序自行退出的秒数，超时后强制结束
+    "switch_policy": "close_then_launch",  # 切换组策略：close_then_launch、overlap 或 freeze
+    "dynamic_priority": False,  # 当前组以前台优先级运行，其他组降为后台优先级（仅启动器拉起的进程）
+    "prewarm": False,  # 启动组前预读应用的可执行文件和库文件
+    "log_level": "INFO"  # 日志级别：DEBUG、INFO、WARNING 或 ERROR
 }
 
 # UI 相关常量
@@ -17,5 +25,60 @@ CARD_HEIGHT = int(90 * SCALE_FACTOR)
 ICON_SIZE = int(32 * SCALE_FACTOR)
 BUTTON_HEIGHT = int(36 * SCALE_FACTOR)
 
+# 进程状态检测
+STATUS_REFRESH_INTERVAL = 2000  # 运行状态刷新间隔（毫秒）
+PROCESS_SNAPSHOT_TTL = 1.0  # 进程快照有效期（秒），期间重复查询直接复用
+PROCESS_REUSE_CHECK_BATCH = 32  # 每次刷新轮流校验创建时间的未匹配进程数
+
+# 后台任务
+WORKER_POOL_SIZE = 8  # 后台线程池大小（就绪检测在独立线程中等待，不占用线程池）
+ICON_LOADER_WORKERS = 2  # 图标加载线程数（独立线程池，不占用启动任务的线程）
+CLOSE_KILL_TIMEOUT = 1.0  # 强制结束后等待进程消失的秒数
+
+# 就绪检测
+READINESS_POLL_INTERVAL = 0.1  # 检测间隔（秒）
+DEFAULT_READY_TIMEOUT = 30.0  # 默认超时（秒）
+
+# 进程优先级（组和应用的 priority 选项可覆盖）
+DEFAULT_PRIORITY_PROFILES = {
+    "foreground": {"nice": 0, "ionice": "normal", "affinity": "all"},
+    "background": {"nice": 10, "ionice": "low", "affinity": "half"},
+}
+
+# 启动预热
+PREWARM_MAX_FILES = 300  # 每个应用最多记录的文件数
+PREWARM_MAX_BYTES = 256 * 1024 * 1024  # 每个应用最多预读的字节数
+PREWARM_READ_CHUNK = 1024 * 1024  # 不支持 posix_fadvise 时顺序读取的块大小
+PREWARM_HISTORY = 20  # 预热/未预热就绪耗时各保留的次数
+PREWARM_RECORD_DELAY = 5.0  # 应用就绪后延迟多少秒在后台记录其用到的文件
+
+# 启动耗时统计
+TELEMETRY_HISTORY = 100  # 每个应用每个阶段保留的样本数
+TELEMETRY_ALIVE_MS = 500  # 持续存活多久视为稳定存活（毫秒）
+TELEMETRY_FOLLOW_TIMEOUT = 30.0  # 启动后最多跟进多久（秒）
+TELEMETRY_POLL_INTERVAL = 0.05  # 跟进检测间隔（秒）
+
+# 资源采样
+RESOURCE_SAMPLE_INTERVAL = 2000  # 默认采样间隔（毫秒）
+RESOURCE_SAMPLE_MAX_INTERVAL = 30000  # 采样耗时超预算时最多放宽到的间隔（毫秒）
+RESOURCE_SAMPLE_BUDGET = 0.02  # 单次采样耗时占采样间隔的上限比例
+RESOURCE_RAW_CAPACITY = 150  # 原始采样保留条数（默认间隔下约5分钟）
+RESOURCE_DOWNSAMPLE_FACTOR = 15  # 每15个原始采样合并为一个长期采样
+RESOURCE_COARSE_CAPACITY = 240  # 长期采样保留条数（默认间隔下约2小时）
+
+# 日志
+LOG_FILE = "aprogram.log"  # 滚动日志文件
+LOG_MAX_BYTES = 1024 * 1024  # 单个日志文件上限
+LOG_BACKUP_COUNT = 3  # 保留的旧日志文件数
+LOG_BUFFER_SIZE = 1000  # 内存中保留的最近日志行数
+
+# 图标缓存
+ICON_CACHE_DIR = "icon_cache"  # 磁盘图标缓存目录
+ICON_CACHE_MAX_BYTES = 32 * 1024 * 1024  # 磁盘图标缓存上限
+ICON_THEME_INDEX_FILE = "icon_theme_index.json"  # freedesktop 图标主题索引（Linux）
+ICON_ATLAS_FILE = "icon_atlas.bin"  # 卡片图标图集（内存映射）
+ICON_ATLAS_INDEX_FILE = "icon_atlas.json"  # 图集索引
+PIXMAP_CACHE_MAX_BYTES = 16 * 1024 * 1024  # 内存中圆角卡片图标的上限
+
 # 应用图标路径
 APP_ICON_PATH = "app.ico"
@@ -0,0 +1,47 @@
+"""软件组数据格式
+
+组数据支持三种格式：
+- 旧格式：纯路径列表 ["a.exe", "b.lnk"]
+- 列表格式：[{"path": "a.exe", "enabled": true, "after": ["b.lnk"]}, ...]
+  allow_multiple 为 true 的应用在启动组时即使已在运行也会再启动一个实例
+- 字典格式：{"apps": [...], "max_parallel": 2}，用于保存组级选项
+应用条目和组级选项都可以带 priority 字段（见 utils.priority_utils），
+应用条目可以带 match 字段配置进程匹配规则（见 utils.process_matcher）。
+"""
+
+
+def normalize_app_item(item):
+    """把单个应用条目统一为字典格式"""
+    if isinstance(item, str):
+        return {'path': item, 'enabled': True}
+    item = dict(item)
+    item.setdefault('enabled', True)
+    return item
+
+
+def get_group_apps(group_data):
+    """获取组内所有应用（字典格式）"""
+    if isinstance(group_data, dict):
+        group_data = group_data.get('apps', [])
+    return [normalize_app_item(item) for item in group_data or []]
+
+
+def get_enabled_apps(group_data):
+    """获取组内所有已启用的应用"""
+    return [app for app in get_group_apps(group_data) if app['enabled']]
+
+
+def get_group_options(group_data):
+    """获取组级选项（如 max_parallel）"""
+    if isinstance(group_data, dict):
+        return {key: value for key, value in group_data.items() if key != 'apps'}
+    return {}
+
+
+def make_group_data(apps, options=None):
+    """根据应用列表和组级选项生成组数据，没有组级选项时保持列表格式"""
+    if options:
+        data = dict(options)
+        data['apps'] = apps
+        return data
+    return apps
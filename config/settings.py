@@ -1,10 +1,15 @@
 """设置管理模块"""
+import logging
 import os
 import json
 import sys
-import winreg
 from .constants import DEFAULT_SETTINGS, CONFIG_FILE, SETTINGS_FILE
 
+if sys.platform == 'win32':
+    import winreg
+
+log = logging.getLogger(__name__)
+
 
 def load_config():
     """加载软件组配置"""
@@ -33,7 +38,7 @@ def load_settings():
                     settings[key] = default_value
             return settings
     except Exception as e:
-        print(f"[设置加载失败] {e}")
+        log.warning("设置加载失败: %s", e)
         return DEFAULT_SETTINGS.copy()
 
 
@@ -43,11 +48,13 @@ def save_settings(settings):
         with open(SETTINGS_FILE, "w", encoding="utf-8") as f:
             json.dump(settings, f, indent=2, ensure_ascii=False)
     except Exception as e:
-        print(f"[设置保存失败] {e}")
+        log.error("设置保存失败: %s", e)
 
 
 def set_auto_start(enable):
-    """设置开机自启"""
+    """设置开机自启（仅 Windows，其他平台返回False）"""
+    if sys.platform != 'win32':
+        return False
     try:
         key = winreg.OpenKey(
             winreg.HKEY_CURRENT_USER,
@@ -75,12 +82,14 @@ def set_auto_start(enable):
         winreg.CloseKey(key)
         return True
     except Exception as e:
-        print(f"[开机自启设置失败] {e}")
+        log.error("开机自启设置失败: %s", e)
         return False
 
 
 def get_auto_start_status():
-    """获取开机自启状态"""
+    """获取开机自启状态（仅 Windows）"""
+    if sys.platform != 'win32':
+        return False
     try:
         key = winreg.OpenKey(
             winreg.HKEY_CURRENT_USER,
@@ -96,5 +105,5 @@ def get_auto_start_status():
             winreg.CloseKey(key)
             return False
     except Exception as e:
-        print(f"[获取开机自启状态失败] {e}")
+        log.warning("获取开机自启状态失败: %s", e)
         return False
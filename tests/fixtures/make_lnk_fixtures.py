@@ -0,0 +1,164 @@
+"""生成 test_lnk_parser.py 使用的快捷方式样本（按 MS-SHLLINK 格式逐字段构造）
+
+用法: python tests/fixtures/make_lnk_fixtures.py
+"""
+import os
+import struct
+
+LINK_CLSID = bytes.fromhex("0114020000000000c000000000000046")
+MY_COMPUTER_CLSID = bytes.fromhex("e04fd020ea3a6910a2d808002b30309d")
+
+HAS_TARGET_ID_LIST = 0x01
+HAS_LINK_INFO = 0x02
+HAS_NAME = 0x04
+HAS_RELATIVE_PATH = 0x08
+HAS_WORKING_DIR = 0x10
+HAS_ARGUMENTS = 0x20
+HAS_ICON_LOCATION = 0x40
+IS_UNICODE = 0x80
+HAS_EXP_STRING = 0x200
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "lnk")
+
+
+def header(flags, icon_index=0):
+    return (struct.pack("<I", 0x4C) + LINK_CLSID + struct.pack("<II", flags, 0x20) +
+            b"\0" * 24 + struct.pack("<IiIH", 0, icon_index, 1, 0) + b"\0" * 10)
+
+
+def root_item():
+    return struct.pack("<HBB", 20, 0x1F, 0x50) + MY_COMPUTER_CLSID
+
+
+def drive_item(drive):
+    body = struct.pack("<B", 0x2F) + drive.encode("ascii")
+    body = body.ljust(23, b"\0")
+    return struct.pack("<H", len(body) + 2) + body
+
+
+def extension_block(long_name, version=9):
+    """BEEF0004 扩展块（Windows 8 及以后为版本 9）"""
+    fields = struct.pack("<HI", version, 0xBEEF0004) + b"\0" * 8 + struct.pack("<H", 0x2E)
+    if version >= 7:
+        fields += b"\0" * 18
+    if version >= 3:
+        fields += struct.pack("<H", 0)
+    if version >= 9:
+        fields += b"\0" * 4
+    if version >= 8:
+        fields += b"\0" * 4
+    fields += long_name.encode("utf-16-le") + b"\0\0"
+    return struct.pack("<H", len(fields) + 4) + fields
+
+
+def file_item(short_name, long_name=None, is_dir=False, version=9):
+    body = struct.pack("<BBIIH", 0x31 if is_dir else 0x32, 0, 0, 0, 0x10 if is_dir else 0x20)
+    body += short_name.encode("ascii") + b"\0"
+    if (len(body) + 2) % 2:
+        body += b"\0"
+    if long_name is not None:
+        ext_offset = len(body) + 2
+        body += extension_block(long_name, version) + struct.pack("<H", ext_offset)
+    return struct.pack("<H", len(body) + 2) + body
+
+
+def id_list(items):
+    data = b"".join(items) + b"\0\0"
+    return struct.pack("<H", len(data)) + data
+
+
+def link_info_local(path):
+    volume_id = struct.pack("<IIII", 17, 3, 0x12345678, 16) + b"\0"
+    header_size = 28
+    local_base = header_size + len(volume_id)
+    base = path.encode("ascii") + b"\0"
+    suffix = local_base + len(base)
+    body = volume_id + base + b"\0"
+    return struct.pack("<7I", header_size + len(body), header_size, 0x1, header_size,
+                       local_base, 0, suffix) + body
+
+
+def link_info_network(net_name, path_suffix):
+    net = net_name.encode("ascii") + b"\0"
+    network_link = struct.pack("<5I", 20 + len(net), 0, 20, 0, 0) + net
+    header_size = 28
+    suffix = header_size + len(network_link)
+    body = network_link + path_suffix.encode("ascii") + b"\0"
+    return struct.pack("<7I", header_size + len(body), header_size, 0x2, 0, 0,
+                       header_size, suffix) + body
+
+
+def string_data(value):
+    return struct.pack("<H", len(value)) + value.encode("utf-16-le")
+
+
+def environment_block(target):
+    ansi = target.encode("ascii").ljust(260, b"\0")
+    unicode = target.encode("utf-16-le").ljust(520, b"\0")
+    return struct.pack("<II", 788, 0xA0000001) + ansi + unicode
+
+
+TERMINAL_BLOCK = b"\0\0\0\0"
+
+PROGRAM_FILES_ITEMS = [
+    root_item(),
+    drive_item("C:\\"),
+    file_item("PROGRA~1", "Program Files", is_dir=True),
+    file_item("MYAPPL~1", "My Application", is_dir=True),
+    file_item("APPLIC~1.EXE", "application.exe"),
+]
+
+
+def build_fixtures():
+    flags = (HAS_TARGET_ID_LIST | HAS_LINK_INFO | HAS_NAME | HAS_WORKING_DIR |
+             HAS_ARGUMENTS | HAS_ICON_LOCATION | IS_UNICODE)
+    target = "C:\\Program Files\\My Application\\application.exe"
+    yield "local_app.lnk", (
+        header(flags, icon_index=2) + id_list(PROGRAM_FILES_ITEMS) + link_info_local(target) +
+        string_data("My Application") + string_data("C:\\Program Files\\My Application") +
+        string_data('--profile "work"') +
+        string_data("C:\\Program Files\\My Application\\app.ico") + TERMINAL_BLOCK)
+
+    yield "id_list_only.lnk", (
+        header(HAS_TARGET_ID_LIST | IS_UNICODE) + id_list(PROGRAM_FILES_ITEMS) + TERMINAL_BLOCK)
+
+    # Windows 7 写入的扩展块为版本 8，长文件名前的字段少 4 字节
+    yield "id_list_win7.lnk", (
+        header(HAS_TARGET_ID_LIST | IS_UNICODE) +
+        id_list([root_item(), drive_item("C:\\"),
+                 file_item("PROGRA~2", "Program Files (x86)", is_dir=True, version=8),
+                 file_item("LEGACY~1.EXE", "Legacy Tool.exe", version=8)]) + TERMINAL_BLOCK)
+
+    # Windows XP 时代的文件项没有扩展块，只能得到 8.3 短文件名
+    yield "id_list_short_names.lnk", (
+        header(HAS_TARGET_ID_LIST | IS_UNICODE) +
+        id_list([root_item(), drive_item("D:\\"), file_item("TOOLS", is_dir=True),
+                 file_item("TOOL.EXE")]) + TERMINAL_BLOCK)
+
+    yield "network.lnk", (
+        header(HAS_LINK_INFO | IS_UNICODE) +
+        link_info_network("\\\\fileserver\\share", "tools\\tool.exe") + TERMINAL_BLOCK)
+
+    yield "env_target.lnk", (
+        header(HAS_LINK_INFO | HAS_EXP_STRING | IS_UNICODE) +
+        link_info_local("C:\\Program Files\\Tool\\tool.exe") +
+        environment_block("%ProgramFiles%\\Tool\\tool.exe") + TERMINAL_BLOCK)
+
+    for name in ("tool", "other"):
+        yield f"relative_{name}.lnk", (
+            header(HAS_RELATIVE_PATH | IS_UNICODE) +
+            string_data(f"..\\bin\\{name}.exe") + TERMINAL_BLOCK)
+
+    yield "not_a_link.lnk", b"[InternetShortcut]\r\nURL=https://example.com/\r\n"
+
+
+def main():
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    for name, data in build_fixtures():
+        with open(os.path.join(FIXTURE_DIR, name), "wb") as f:
+            f.write(data)
+        print(f"{name}: {len(data)} 字节")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""位图像素到 QImage 的转换：用构造的 BGR(A) 位图数据验证格式、行对齐和行顺序"""
+import pytest
+
+from PyQt5.QtGui import QImage, qRgba
+from utils.icon_convert import bitmap_bits_to_qimage, bitmap_stride
+
+# 2x2 图像，按从上到下、从左到右的顺序：红、绿 / 蓝、白
+PIXELS = [[(255, 0, 0), (0, 255, 0)],
+          [(0, 0, 255), (255, 255, 255)]]
+
+
+def make_bits(rows, bits_per_pixel, alpha=None, stride=None, bottom_up=False):
+    """按 Windows 位图布局构造像素数据：BGR(A)，每行按 stride 补齐"""
+    width = len(rows[0])
+    if stride is None:
+        stride = bitmap_stride(width, bits_per_pixel)
+    if bottom_up:
+        rows = rows[::-1]
+    data = bytearray()
+    for y, row in enumerate(rows):
+        line = bytearray()
+        for x, (r, g, b) in enumerate(row):
+            line += bytes((b, g, r))
+            if bits_per_pixel == 32:
+                line.append(alpha[y][x] if alpha else 0)
+        data += line.ljust(stride, b"\xee")  # 填充字节不应出现在图像中
+    return bytes(data)
+
+
+def rgba(image, x, y):
+    color = image.pixelColor(x, y)
+    return color.red(), color.green(), color.blue(), color.alpha()
+
+
+def assert_pixels(image, rows, alpha=None):
+    assert (image.width(), image.height()) == (len(rows[0]), len(rows))
+    for y, row in enumerate(rows):
+        for x, (r, g, b) in enumerate(row):
+            a = alpha[y][x] if alpha else 255
+            assert rgba(image, x, y) == (r, g, b, a), (x, y)
+
+
+def test_stride_is_dword_aligned():
+    assert bitmap_stride(2, 24) == 8
+    assert bitmap_stride(3, 24) == 12
+    assert bitmap_stride(4, 24) == 12
+    assert bitmap_stride(3, 32) == 12
+
+
+@pytest.mark.parametrize("bits_per_pixel", [24, 32])
+@pytest.mark.parametrize("bottom_up", [False, True])
+def test_row_order_and_channels(bits_per_pixel, bottom_up):
+    bits = make_bits(PIXELS, bits_per_pixel, bottom_up=bottom_up)
+    image = bitmap_bits_to_qimage(bits, 2, 2, bits_per_pixel, bottom_up=bottom_up)
+    assert_pixels(image, PIXELS)
+
+
+def test_24bit_row_padding_is_skipped():
+    rows = [[(10, 20, 30), (40, 50, 60), (70, 80, 90)],
+            [(1, 2, 3), (4, 5, 6), (7, 8, 9)]]
+    bits = make_bits(rows, 24)
+    assert len(bits) == 2 * 12  # 每行 9 字节补齐到 12 字节
+    assert_pixels(bitmap_bits_to_qimage(bits, 3, 2, 24), rows)
+
+
+def test_explicit_stride_wider_than_row():
+    bits = make_bits(PIXELS, 32, stride=16)
+    assert_pixels(bitmap_bits_to_qimage(bits, 2, 2, 32, stride=16), PIXELS)
+
+
+def test_32bit_without_alpha_ignores_fourth_byte():
+    # DDB 的第四个字节没有意义（DrawIconEx 绘制后通常为 0），不能当作全透明
+    bits = make_bits(PIXELS, 32, alpha=[[0, 0], [0, 0]])
+    image = bitmap_bits_to_qimage(bits, 2, 2, 32)
+    assert not image.hasAlphaChannel()
+    assert_pixels(image, PIXELS)
+
+
+def test_32bit_with_alpha_keeps_transparency():
+    alpha = [[255, 0], [128, 255]]
+    bits = make_bits(PIXELS, 32, alpha=alpha)
+    image = bitmap_bits_to_qimage(bits, 2, 2, 32, alpha=True)
+    assert image.format() == QImage.Format_ARGB32
+    assert image.pixel(1, 0) == qRgba(0, 255, 0, 0)
+    assert_pixels(image, PIXELS, alpha)
+
+
+def test_alpha_flag_ignored_for_24bit():
+    bits = make_bits(PIXELS, 24)
+    image = bitmap_bits_to_qimage(bits, 2, 2, 24, alpha=True)
+    assert not image.hasAlphaChannel()
+    assert_pixels(image, PIXELS)
+
+
+def test_result_does_not_reference_input_buffer():
+    buffer = bytearray(make_bits(PIXELS, 32))
+    for bottom_up in (False, True):
+        image = bitmap_bits_to_qimage(buffer, 2, 2, 32, bottom_up=bottom_up)
+        expected = [rgba(image, x, y) for y in range(2) for x in range(2)]
+        buffer[:] = b"\0" * len(buffer)
+        assert [rgba(image, x, y) for y in range(2) for x in range(2)] == expected
+        buffer[:] = make_bits(PIXELS, 32)
+
+
+def test_invalid_input():
+    with pytest.raises(ValueError):
+        bitmap_bits_to_qimage(b"\0" * 16, 2, 2, 16)
+    with pytest.raises(ValueError):
+        bitmap_bits_to_qimage(make_bits(PIXELS, 24)[:-1], 2, 2, 24)
@@ -0,0 +1,113 @@
+"""图标主题查找：在临时目录中构造 XDG 数据目录、主题和 .desktop 文件"""
+import os
+import sys
+import pytest
+
+import utils.icon_theme as icon_theme
+
+pytestmark = pytest.mark.skipif(sys.platform == 'win32', reason="图标主题查找仅用于非 Windows 平台")
+
+FIXTURE_THEME = """[Icon Theme]
+Name=Fixture
+Inherits=hicolor
+Directories=48x48/apps,scalable/apps
+
+[48x48/apps]
+Size=48
+Type=Fixed
+
+[scalable/apps]
+Size=64
+MinSize=16
+MaxSize=256
+Type=Scalable
+"""
+
+HICOLOR_THEME = """[Icon Theme]
+Name=Hicolor
+Directories=32x32/apps
+
+[32x32/apps]
+Size=32
+Type=Threshold
+"""
+
+DESKTOP_ENTRY = """[Desktop Entry]
+Type=Application
+Name=My App
+Exec=env LANG=C /opt/myapp/bin/myapp %U
+Icon=foo
+"""
+
+
+def _write(path, content=""):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+    return str(path)
+
+
+@pytest.fixture
+def theme_dirs(tmp_path, monkeypatch):
+    data_home = tmp_path / "data"
+    config_home = tmp_path / "config"
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    monkeypatch.setenv("XDG_DATA_HOME", str(data_home))
+    monkeypatch.setenv("XDG_DATA_DIRS", str(tmp_path / "empty"))
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(config_home))
+
+    icons = data_home / "icons"
+    paths = {
+        'foo_48': _write(icons / "Fixture" / "48x48" / "apps" / "foo.png"),
+        'foo_svg': _write(icons / "Fixture" / "scalable" / "apps" / "foo.svg"),
+        'bar_32': _write(icons / "hicolor" / "32x32" / "apps" / "bar.png"),
+        'baz': _write(data_home / "pixmaps" / "baz.xpm"),
+        'desktop': _write(data_home / "applications" / "myapp.desktop", DESKTOP_ENTRY),
+        'apps_dir': str(icons / "Fixture" / "48x48" / "apps"),
+    }
+    _write(icons / "Fixture" / "index.theme", FIXTURE_THEME)
+    _write(icons / "hicolor" / "index.theme", HICOLOR_THEME)
+    _write(config_home / "gtk-3.0" / "settings.ini", "[Settings]\ngtk-icon-theme-name=Fixture\n")
+
+    index = icon_theme.IconThemeIndex(str(tmp_path / "icon_theme_index.json"))
+    monkeypatch.setattr(icon_theme, "_theme_index", index)
+    return index, paths
+
+
+def test_theme_name_from_gtk_settings(theme_dirs):
+    assert icon_theme.get_icon_theme_name() == "Fixture"
+
+
+def test_lookup_by_size(theme_dirs):
+    index, paths = theme_dirs
+    assert index.lookup("foo", 48) == paths['foo_48']
+    assert index.lookup("foo", 128) == paths['foo_svg']
+
+
+def test_lookup_inherited_theme_and_pixmaps(theme_dirs):
+    index, paths = theme_dirs
+    assert index.lookup("bar", 32) == paths['bar_32']
+    assert index.lookup("bar", 48) == paths['bar_32']  # 没有匹配尺寸时取最接近的
+    assert index.lookup("baz", 48) == paths['baz']
+    assert index.lookup("missing", 48) is None
+
+
+def test_find_app_icon_file(theme_dirs):
+    _index, paths = theme_dirs
+    assert icon_theme.find_app_icon_file("/opt/myapp/bin/myapp", 48) == paths['foo_48']
+    assert icon_theme.find_app_icon_file(paths['desktop'], 48) == paths['foo_48']
+    assert icon_theme.find_app_icon_file("/usr/bin/bar", 32) == paths['bar_32']
+
+
+def test_index_persisted_and_rebuilt_when_dirs_change(theme_dirs):
+    index, paths = theme_dirs
+    assert index.lookup("new", 48) is None
+    assert os.path.exists(index.file_path)
+
+    reloaded = icon_theme.IconThemeIndex(index.file_path)
+    assert reloaded.lookup("foo", 48) == paths['foo_48']
+
+    new_icon = _write(os.path.join(paths['apps_dir'], "new.png"))
+    os.utime(paths['apps_dir'], ns=(0, 0))  # 保证目录修改时间与索引中的不同
+    index.invalidate()
+    assert index.lookup("new", 48) == new_icon
@@ -0,0 +1,112 @@
+"""快捷方式解析：样本文件由 fixtures/make_lnk_fixtures.py 生成"""
+import os
+import shutil
+import pytest
+
+from utils.lnk_parser import parse_lnk, parse_lnk_bytes
+from utils.process_matcher import (get_app_match_keys, set_app_match_rules,
+                                   refresh_app_match_rules, get_process_matcher)
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "lnk")
+
+
+def fixture(name):
+    return os.path.join(FIXTURES, name)
+
+
+def read_fixture(name):
+    with open(fixture(name), "rb") as f:
+        return f.read()
+
+
+def test_local_link_info_and_strings():
+    shortcut = parse_lnk(fixture("local_app.lnk"))
+    assert shortcut == {
+        'target': "C:\\Program Files\\My Application\\application.exe",
+        'arguments': '--profile "work"',
+        'working_dir': "C:\\Program Files\\My Application",
+        'icon_location': "C:\\Program Files\\My Application\\app.ico,2",
+        'name': "My Application",
+        'relative_path': "",
+    }
+
+
+def test_id_list_uses_long_names():
+    shortcut = parse_lnk(fixture("id_list_only.lnk"))
+    assert shortcut['target'] == "C:\\Program Files\\My Application\\application.exe"
+
+
+def test_id_list_version_8_extension_block():
+    shortcut = parse_lnk(fixture("id_list_win7.lnk"))
+    assert shortcut['target'] == "C:\\Program Files (x86)\\Legacy Tool.exe"
+
+
+def test_id_list_without_extension_block_falls_back_to_short_names():
+    shortcut = parse_lnk(fixture("id_list_short_names.lnk"))
+    assert shortcut['target'] == "D:\\TOOLS\\TOOL.EXE"
+
+
+def test_network_path():
+    shortcut = parse_lnk(fixture("network.lnk"))
+    assert shortcut['target'] == "\\\\fileserver\\share\\tools\\tool.exe"
+
+
+def test_environment_block_is_expanded(monkeypatch):
+    monkeypatch.setenv("ProgramFiles", "D:\\Apps")
+    shortcut = parse_lnk_bytes(read_fixture("env_target.lnk"))
+    assert shortcut['target'] == "D:\\Apps\\Tool\\tool.exe"
+
+
+def test_relative_path_resolved_against_link():
+    shortcut = parse_lnk(fixture("relative_tool.lnk"))
+    assert shortcut['relative_path'] == "..\\bin\\tool.exe"
+    assert shortcut['target'] == os.path.normpath(os.path.join(FIXTURES, "..", "bin", "tool.exe"))
+
+
+def test_invalid_files():
+    assert parse_lnk(fixture("not_a_link.lnk")) is None
+    assert parse_lnk(fixture("missing.lnk")) is None
+    with pytest.raises(ValueError):
+        parse_lnk_bytes(read_fixture("local_app.lnk")[:40])
+
+
+@pytest.fixture
+def retargetable_link(tmp_path):
+    """links/app.lnk 指向 bin/tool.exe，可以改写为指向 bin/other.exe"""
+    (tmp_path / "bin").mkdir()
+    (tmp_path / "links").mkdir()
+    for name in ("tool.exe", "other.exe"):
+        (tmp_path / "bin" / name).write_bytes(b"")
+    link = str(tmp_path / "links" / "app.lnk")
+    shutil.copyfile(fixture("relative_tool.lnk"), link)
+
+    def retarget():
+        shutil.copyfile(fixture("relative_other.lnk"), link)
+        stat = os.stat(link)
+        os.utime(link, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    return link, retarget
+
+
+def test_parse_cache_follows_retarget(retargetable_link):
+    link, retarget = retargetable_link
+    assert parse_lnk(link)['target'].endswith("tool.exe")
+    retarget()
+    assert parse_lnk(link)['target'].endswith("other.exe")
+
+
+def test_match_keys_follow_retarget(retargetable_link):
+    link, retarget = retargetable_link
+    assert get_app_match_keys(link)[0] == "tool.exe"
+    retarget()
+    assert get_app_match_keys(link)[0] == "other.exe"
+
+
+def test_matcher_recompiled_after_retarget(retargetable_link):
+    link, retarget = retargetable_link
+    set_app_match_rules({link: None})
+    assert "tool.exe" in get_process_matcher().by_name
+    assert not refresh_app_match_rules()
+    retarget()
+    assert refresh_app_match_rules()
+    assert "other.exe" in get_process_matcher().by_name
+    set_app_match_rules({})
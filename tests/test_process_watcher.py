@@ -0,0 +1,35 @@
+"""pidfd 退出跟踪：启动器类程序拉起子进程后立即退出"""
+import os
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QCoreApplication, QTimer  # noqa: E402
+from utils.process_watcher import ProcessExitWatcher, is_pidfd_supported  # noqa: E402
+from utils.spawn_utils import LaunchSpec, spawn_process  # noqa: E402
+
+pytestmark = pytest.mark.skipif(not is_pidfd_supported(), reason="需要 Linux pidfd")
+
+
+def run_events(app, ms):
+    QTimer.singleShot(ms, app.quit)
+    app.exec_()
+
+
+def test_child_of_exited_launcher_stub_is_adopted():
+    app = QCoreApplication.instance() or QCoreApplication([])
+    watcher = ProcessExitWatcher()
+    adopted, exited = [], []
+    watcher.process_adopted.connect(lambda path, pid: adopted.append(pid))
+    watcher.app_exited.connect(exited.append)
+
+    # 存根在第一次定时收养（300 毫秒）之前就退出
+    proc = spawn_process(LaunchSpec(['/bin/sh', '-c', 'sleep 1.5 & exit 0']))
+    assert watcher.watch('app', proc.pid, proc)
+    run_events(app, 800)
+    assert adopted and not exited
+    assert watcher.is_tracking('app')
+
+    run_events(app, 1500)
+    assert exited == ['app']
+    assert not watcher.is_tracking('app')
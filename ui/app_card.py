@@ -1,20 +1,46 @@
 """应用卡片组件"""
+import logging
 import os
 from PyQt5.QtWidgets import QFrame, QVBoxLayout, QLabel, QPushButton, QMessageBox
-from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtCore import Qt, QTimer, QEvent
 from PyQt5.QtGui import QPainter, QColor
 from config.constants import CARD_WIDTH, CARD_HEIGHT, ICON_SIZE
 from utils.file_utils import get_app_name
-from utils.process_utils import launch_application, is_application_running
+from utils.process_registry import is_app_running
+from utils.freeze_engine import is_app_frozen
+from utils.resource_sampler import RSS, CPU, format_bytes, format_duration
+from utils.launch_telemetry import get_launch_telemetry
+from utils.pixmap_cache import get_rounded_pixmap
+
+log = logging.getLogger(__name__)
+
+
+# 状态指示器
+STATUS_STARTING = "starting"  # 已启动，等待就绪
+STATUS_RUNNING = "running"    # 运行中 / 已就绪
+STATUS_FROZEN = "frozen"      # 已冻结（进程挂起）
+STATUS_COLORS = {
+    STATUS_STARTING: "#F59E0B",
+    STATUS_RUNNING: "#10B981",
+    STATUS_FROZEN: "#60A5FA",
+}
+STATUS_TEXTS = {
+    STATUS_STARTING: "启动中",
+    STATUS_RUNNING: "运行中",
+    STATUS_FROZEN: "已冻结",
+}
 
 
 class AppCardWidget(QFrame):
-    def __init__(self, icon, name, path, parent_launcher, enabled=True):
+    def __init__(self, icon, name, path, parent_launcher, enabled=True, config=None):
         super().__init__()
         self.path = path
+        self.config = dict(config or {})  # 应用条目的其他配置（如 after 依赖）
         self.parent_launcher = parent_launcher
         self.enabled = enabled
         self.is_running = False
+        self.status = None
+        self.resource_usage = (None, None, None)  # 最近一次资源采样 (当前, 近期平均, 长期统计)
 
         # 用于解决单击双击冲突的定时器
         self.click_timer = QTimer()
@@ -33,14 +59,11 @@ class AppCardWidget(QFrame):
         layout.setContentsMargins(8, 8, 8, 8)
         layout.setSpacing(8)
 
-        # 图标区域 - 使用圆角图标
-        from utils.icon_utils import create_rounded_icon
-        rounded_icon = create_rounded_icon(icon, ICON_SIZE, radius=8)
-
-        icon_label = QLabel()
-        icon_label.setPixmap(rounded_icon.pixmap(ICON_SIZE, ICON_SIZE))
-        icon_label.setAlignment(Qt.AlignCenter)
-        layout.addWidget(icon_label)
+        # 图标区域 - 使用圆角图标（内容相同的图标共享缓存中的像素图）
+        self.icon_label = QLabel()
+        self.set_icon(icon)
+        self.icon_label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(self.icon_label)
 
         # 名称区域
         name_label = QLabel(name)
@@ -83,26 +106,20 @@ class AppCardWidget(QFrame):
         # 创建状态指示器（绿色圆点）
         self.status_indicator = QLabel(self)
         self.status_indicator.setFixedSize(12, 12)
-        self.status_indicator.setStyleSheet("""
-            QLabel {
-                background-color: #10B981;
-                border-radius: 6px;
-                border: 2px solid white;
-            }
-        """)
         self.status_indicator.hide()  # 初始隐藏
 
         # 将状态指示器定位到左下角
         self.status_indicator.move(8, self.height() - 20)
 
-        # 启动状态检测定时器
-        self.status_timer = QTimer()
-        self.status_timer.timeout.connect(self.update_running_status)
-        self.status_timer.start(2000)  # 每2秒检查一次状态
-
-        # 立即检查一次状态
+        # 运行状态由主窗口统一基于共享进程快照刷新，这里只立即检查一次
         self.update_running_status()
 
+    def set_icon(self, icon):
+        """设置卡片图标（后台加载完成后替换占位图标）"""
+        rounded_pixmap = get_rounded_pixmap(icon, ICON_SIZE, radius=8)
+        if rounded_pixmap is not None:
+            self.icon_label.setPixmap(rounded_pixmap)
+
     def update_style(self):
         """更新样式表，根据选中状态设置背景色"""
         if self.enabled:
@@ -203,23 +220,75 @@ class AppCardWidget(QFrame):
         if reply == QMessageBox.Yes:
             self.parent_launcher.remove_app_from_current_group(self.path)
 
-    def update_running_status(self):
+    def set_status(self, status):
+        """设置状态指示器：None（未运行）、启动中（黄色）、运行中（绿色）或已冻结（蓝色）"""
+        if status == self.status:
+            return
+        self.status = status
+        self.is_running = status is not None
+        if status is None:
+            self.status_indicator.hide()
+            return
+        self.status_indicator.setStyleSheet(f"""
+            QLabel {{
+                background-color: {STATUS_COLORS[status]};
+                border-radius: 6px;
+                border: 2px solid white;
+            }}
+        """)
+        self.status_indicator.setToolTip(STATUS_TEXTS[status])
+        self.status_indicator.show()
+
+    def set_running(self, running):
+        """设置运行状态指示器（启动中的应用在就绪前保持黄色，冻结的应用保持蓝色）"""
+        if running and self.status in (STATUS_STARTING, STATUS_FROZEN):
+            return
+        self.set_status(STATUS_RUNNING if running else None)
+
+    def set_resource_usage(self, latest, recent, long_term=None):
+        """记录最近一次资源采样，在卡片提示中显示"""
+        self.resource_usage = (latest, recent, long_term)
+
+    def build_tooltip(self):
+        """卡片提示：路径、资源占用（当前、近期和长期）和启动耗时"""
+        lines = [self.path]
+        latest, recent, long_term = self.resource_usage
+        if latest is not None and self.is_running:
+            lines.append(f"内存: {format_bytes(latest[RSS])}（近期平均 {format_bytes(recent[RSS])}）")
+            lines.append(f"CPU: {latest[CPU]:.1f}%（近期平均 {recent[CPU]:.1f}%）")
+        if long_term is not None:
+            mean, peak, span = long_term
+            lines.append(f"近 {format_duration(span)}: 内存平均 {format_bytes(mean[RSS])}，"
+                         f"峰值 {format_bytes(peak[RSS])}；CPU平均 {mean[CPU]:.1f}%")
+        startup = get_launch_telemetry().startup_percentiles(self.path)
+        if startup is not None:
+            lines.append(f"启动耗时: p50 {startup[0]:.2f} 秒，p95 {startup[1]:.2f} 秒")
+        return "\n".join(lines)
+
+    def event(self, event):
+        # 提示在显示时才生成，始终反映最新的采样和耗时统计
+        if event.type() == QEvent.ToolTip:
+            self.setToolTip(self.build_tooltip())
+        return super().event(event)
+
+    def update_running_status(self, snapshot=None):
         """更新应用运行状态"""
         try:
-            running = is_application_running(self.path)
-            if running != self.is_running:
-                self.is_running = running
-                if self.is_running:
-                    self.status_indicator.show()
-                else:
-                    self.status_indicator.hide()
+            running = is_app_running(self.path, snapshot)
+            if running and is_app_frozen(self.path, snapshot):
+                self.set_status(STATUS_FROZEN)
+            else:
+                self.set_running(running)
         except Exception as e:
-            print(f"[状态更新失败] {self.path}: {str(e)}")
+            log.warning("状态更新失败 %s: %s", self.path, e)
 
     def launch_app(self, event=None):
-        """启动应用"""
-        if not launch_application(self.path):
+        """启动应用（已冻结的应用直接解冻）"""
+        if self.status == STATUS_FROZEN:
+            self.parent_launcher.thaw_apps([self.path])
+            return
+        if not self.parent_launcher.start_app(self.path):
             QMessageBox.warning(self, "启动失败", f"无法启动应用：\n{self.path}")
-        else:
-            # 启动后立即更新状态
+        elif not self.parent_launcher.exit_watcher.is_tracking(self.path):
+            # 无法跟踪退出的平台上，启动后稍等再更新状态
             QTimer.singleShot(1000, self.update_running_status)
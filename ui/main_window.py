@@ -1,28 +1,59 @@
 """主窗口类"""
+import logging
 import os
 import sys
 import copy
+import time
 import subprocess
 from PyQt5.QtWidgets import (QWidget, QListWidget, QPushButton, QVBoxLayout,
                              QHBoxLayout, QInputDialog, QMessageBox, QLabel,
-                             QMenu, QAction, QSystemTrayIcon, QDialog, QScrollArea)
+                             QMenu, QAction, QSystemTrayIcon, QDialog, QScrollArea,
+                             QFileDialog)
 from PyQt5.QtGui import QIcon, QFont, QPixmap
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
 
 from config.settings import load_config, save_config, load_settings, save_settings, set_auto_start
-from config.constants import SCALE_FACTOR, BUTTON_HEIGHT, APP_ICON_PATH
+from config.groups import (get_group_apps, get_enabled_apps, get_group_options,
+                           make_group_data)
+from config.constants import (SCALE_FACTOR, BUTTON_HEIGHT, APP_ICON_PATH, STATUS_REFRESH_INTERVAL,
+                              ICON_SIZE)
 from utils.file_utils import is_valid_app_file, get_app_name
-from utils.icon_utils import get_app_icon
-from utils.process_utils import close_application_by_path, launch_application, is_application_running
-from utils.system_utils import create_default_icon
-from .app_card import AppCardWidget
+from utils.process_utils import (spawn_application, get_process_snapshot,
+                                 invalidate_process_snapshot, add_process_delta_listener)
+from utils.process_matcher import set_app_match_rules, refresh_app_match_rules
+from utils.close_engine import close_applications_in_order
+from utils.freeze_engine import freeze_applications, thaw_applications
+from utils.transition_planner import plan_transition, SWITCH_OVERLAP, SWITCH_FREEZE
+from utils.launch_scheduler import (resolve_dependencies, topological_levels,
+                                    DependencyError)
+from utils.spawn_utils import reap_spawned_processes
+from utils.process_watcher import ProcessExitWatcher
+from utils.process_registry import get_process_registry, is_app_running
+from utils.resource_sampler import ResourceSampler
+from utils.launch_telemetry import (LaunchTimer, start_follow_launch, get_launch_telemetry,
+                                    PHASE_SPAWN)
+from utils.priority_utils import (group_priority_profiles, apply_priorities,
+                                  apply_pid_priority, resolve_priority,
+                                  PRIORITY_FOREGROUND, PRIORITY_BACKGROUND)
+from utils.system_utils import create_default_icon, create_white_default_icon
+from utils.icon_atlas import IconAtlas
+from utils.log_utils import setup_logging, set_log_level
+from .app_card import AppCardWidget, STATUS_STARTING, STATUS_RUNNING, STATUS_FROZEN
 from .settings_dialog import SettingsDialog
 from .flow_layout import FlowLayout
+from .resource_panel import ResourcePanel
+from .workers import (BackgroundTask, LaunchPipeline, IconLoader, LAUNCH_LAUNCHED,
+                      LAUNCH_RUNNING, LAUNCH_FAILED, LAUNCH_BLOCKED)
 from .styles import (get_main_window_style, get_close_button_style,
                      get_program_container_style, get_scroll_area_style)
 
+log = logging.getLogger(__name__)
+
 
 class SoftwareLauncher(QWidget):
+    # 进程变化可能在工作线程中产生，通过信号转发到主线程
+    process_delta_received = pyqtSignal(object)
+
     def __init__(self):
         super().__init__()
         self.setWindowIcon(create_default_icon())
@@ -35,12 +66,28 @@ class SoftwareLauncher(QWidget):
 
         # 加载设置和数据
         self.settings = load_settings()
+        setup_logging(self.settings.get("log_level", "INFO"))
         self.data = load_config()
         self.current_group = None
+        self.update_match_rules()
 
         # 保留加载状态标记
         self.loading_group = False  # 标记是否正在加载组
 
+        # 正在执行的后台任务（保持引用直到完成）
+        self.background_tasks = set()
+        self.launch_pipelines = set()
+
+        # 后台图标加载，已加载的图标按路径保留，切回组时无需重新加载；
+        # 图标同时写入内存映射的图集，下次冷启动直接从图集显示
+        self.card_icons = {}
+        self.checked_icons = set()  # 本次运行中已检查过来源图标的应用
+        self.icon_atlas = IconAtlas()
+        self.icon_atlas.prune(app['path'] for group in self.data.values()
+                              for app in get_group_apps(group))
+        self.icon_loader = IconLoader(parent=self)
+        self.icon_loader.icon_loaded.connect(self.on_icon_loaded)
+
         # 初始化系统托盘
         self.setup_system_tray()
 
@@ -63,6 +110,9 @@ class SoftwareLauncher(QWidget):
             f"color: #4a5568; font-size: {int(12*scale)}px; padding: {int(5*scale)}px {int(10*scale)}px; background: rgba(255,255,255,0.8); border-radius: {int(4*scale)}px; border: 1px solid #e2e8f0;")
         self.status_label.setAlignment(Qt.AlignCenter)
 
+        # 当前组的资源占用
+        self.resource_panel = ResourcePanel()
+
         # 先创建程序显示区域
         self.program_container = QWidget()
         self.program_container.setStyleSheet(get_program_container_style())
@@ -145,6 +195,7 @@ class SoftwareLauncher(QWidget):
         right_layout = QVBoxLayout()
         right_layout.addLayout(app_title_layout)
         right_layout.addWidget(self.program_container)
+        right_layout.addWidget(self.resource_panel)
         right_layout.addWidget(self.status_label)
 
         # 主内容布局
@@ -162,6 +213,183 @@ class SoftwareLauncher(QWidget):
         self.setLayout(main_layout)
         self.refresh_group_list()
 
+        # 由启动器拉起的进程通过pidfd即时获知退出，其余应用仍靠轮询
+        self.exit_watcher = ProcessExitWatcher(self)
+        self.exit_watcher.app_exited.connect(self.on_app_exited)
+
+        # 启动器拉起的进程持久登记，重启后重新校验并继续跟踪
+        self.process_registry = get_process_registry()
+        self.exit_watcher.process_exited.connect(self.process_registry.unregister)
+        self.exit_watcher.process_adopted.connect(self.on_process_adopted)
+        for record in self.process_registry.get_records():
+            if self.exit_watcher.watch(record.path, record.pid):
+                self.set_card_running(record.path, True)
+
+        # 卡片只响应进程启动/退出的增量变化
+        self.process_delta_received.connect(self.on_process_delta)
+        add_process_delta_listener(self.process_delta_received.emit)
+
+        # 所有卡片共用一个状态刷新定时器，每次只增量刷新一次进程表
+        self.status_timer = QTimer(self)
+        self.status_timer.timeout.connect(self.refresh_running_status)
+        self.status_timer.start(STATUS_REFRESH_INTERVAL)
+
+        # 资源采样在后台线程进行，上一次完成后按采样器给出的间隔安排下一次
+        self.resource_sampler = ResourceSampler()
+        self.resource_timer = QTimer(self)
+        self.resource_timer.setSingleShot(True)
+        self.resource_timer.timeout.connect(self.sample_resources)
+        self.resource_timer.start(self.resource_sampler.interval)
+
+    def get_app_cards(self):
+        """获取当前显示的所有应用卡片"""
+        cards = []
+        for i in range(self.program_cards_layout.count()):
+            widget = self.program_cards_layout.itemAt(i).widget()
+            if isinstance(widget, AppCardWidget):
+                cards.append(widget)
+        return cards
+
+    def on_icon_loaded(self, path, image, key):
+        """后台图标加载完成，更新图集并替换对应卡片的图标"""
+        self.checked_icons.add(path)
+        if image is None or image.isNull():
+            return  # 图标未变化或加载失败，保留当前图标
+        self.icon_atlas.put(path, key, image)
+        icon = QIcon(QPixmap.fromImage(image))
+        self.card_icons[path] = icon
+        for card in self.get_app_cards():
+            if card.path == path:
+                card.set_icon(icon)
+
+    def refresh_running_status(self):
+        """刷新共享进程表，进程变化通过 on_process_delta 反映到卡片"""
+        reap_spawned_processes()
+        refresh_app_match_rules()
+        try:
+            get_process_snapshot()
+        except Exception as e:
+            log.warning("状态刷新失败: %s", e)
+
+    def on_process_delta(self, delta):
+        """只更新受本次进程启动/退出影响的卡片"""
+        snapshot = get_process_snapshot()
+        exited_pids = {entry.pid for entry in delta.exited}
+        for card in self.get_app_cards():
+            # 已被pidfd跟踪的应用无需轮询结果
+            if self.exit_watcher.is_tracking(card.path):
+                continue
+            registered_exit = any(record.pid in exited_pids for record in
+                                  self.process_registry.get_records(card.path))
+            if registered_exit or delta.affects(card.path):
+                # 启动器拉起的应用只看登记的进程，其余按名称匹配
+                card.set_running(is_app_running(card.path, snapshot))
+
+    def sample_resources(self):
+        """后台采样当前组的资源占用"""
+        paths = [card.path for card in self.get_app_cards()]
+        configured = {app['path'] for group_data in self.data.values()
+                      for app in get_group_apps(group_data)}
+        group = self.current_group
+
+        def schedule_next(_error=None):
+            self.resource_timer.start(self.resource_sampler.interval)
+
+        def show(result):
+            schedule_next()
+            if group != self.current_group:
+                return
+            usage, (latest, recent, long_term) = result
+            for card in self.get_app_cards():
+                card.set_resource_usage(*usage.get(card.path, (None, None, None)))
+            self.resource_panel.update_usage(latest, recent, long_term, self.resource_sampler)
+
+        self.run_in_background(show, self.resource_sampler.sample_group, paths, configured,
+                               on_failed=schedule_next)
+
+    def on_process_adopted(self, path, pid):
+        """启动的进程拉起的子孙进程同样登记"""
+        records = self.process_registry.get_records(path)
+        group = records[0].group if records else None
+        self.process_registry.register(path, pid, group)
+        self.apply_launch_priority(path, pid, group)
+
+    def on_app_exited(self, path):
+        """被跟踪的应用全部进程退出时，按最新的进程表重新确认后更新指示器
+
+        跟踪期间增量刷新跳过了该应用，其间未被收养的进程只能通过重新检查发现。
+        """
+        invalidate_process_snapshot()
+        self.set_card_running(path, is_app_running(path))
+
+    def start_app(self, path):
+        """启动应用并跟踪其进程，返回是否启动成功"""
+        timer = LaunchTimer(path)
+        popen = spawn_application(path)
+        if popen is None:
+            return False
+        # 单独启动时没有就绪检测，启动耗时由跟进线程记录的存活/窗口时间反映
+        timer.mark(PHASE_SPAWN)
+        if popen.pid is not None:
+            start_follow_launch(timer, popen.pid)
+        else:
+            timer.part_done()
+        self.track_launched_app(path, popen, self.current_group)
+        return True
+
+    def track_launched_app(self, path, popen, group=None):
+        """登记并跟踪启动器拉起的进程，支持时立即点亮卡片指示器"""
+        if popen.pid is None:
+            return  # 交给系统默认程序打开，只能依靠轮询
+        self.process_registry.register(path, popen.pid, group)
+        self.apply_launch_priority(path, popen.pid, group)
+        if self.exit_watcher.watch(path, popen.pid, popen):
+            self.set_card_running(path, True)
+
+    def apply_launch_priority(self, path, pid, group):
+        """新启动的进程按所属组是否为当前组设置前台/后台优先级"""
+        if not self.settings.get("dynamic_priority", False):
+            return
+        profile = group_priority_profiles(self.data, self.current_group).get(path)
+        if profile is None:
+            role = PRIORITY_FOREGROUND if group == self.current_group else PRIORITY_BACKGROUND
+            profile = resolve_priority(role)
+        apply_pid_priority(pid, profile)
+
+    def update_group_priorities(self):
+        """当前组变化后，在后台把当前组的应用调为前台优先级，其他组调为后台优先级"""
+        if not self.settings.get("dynamic_priority", False):
+            return
+        profiles = group_priority_profiles(self.data, self.current_group)
+        if profiles:
+            self.run_in_background(lambda adjusted: None, apply_priorities, profiles)
+
+    def set_card_running(self, path, running):
+        """设置指定应用卡片的运行状态"""
+        for card in self.get_app_cards():
+            if card.path == path:
+                card.set_running(running)
+
+    def set_card_status(self, path, status):
+        """设置指定应用卡片的状态指示器"""
+        for card in self.get_app_cards():
+            if card.path == path:
+                card.set_status(status)
+
+    def save_data(self):
+        """保存组配置，并按最新配置重新编译进程匹配规则"""
+        save_config(self.data)
+        self.update_match_rules()
+
+    def update_match_rules(self):
+        """把所有组内应用的 match 规则编译为一个匹配器"""
+        rules = {}
+        for group_data in self.data.values():
+            for app in get_group_apps(group_data):
+                if app.get('match') or app['path'] not in rules:
+                    rules[app['path']] = app.get('match')
+        set_app_match_rules(rules)
+
     def update_group_display(self, group_name):
         """更新组列表中的显示状态"""
         # 不再在组名上显示*标记，改为在状态栏显示
@@ -202,30 +430,20 @@ class SoftwareLauncher(QWidget):
     def switch_to_group(self, group_name):
         """切换到指定组"""
         self.current_group = group_name
+        self.icon_loader.cancel_pending()  # 旧组未完成的图标加载不再需要
         self.clear_program_cards()
+        self.resource_panel.clear_usage()
 
         # 重新加载程序列表时不触发修改状态
         self.loading_group = True
-        group_data = self.data[group_name]
-
-        # 兼容旧格式（纯路径列表）和新格式（包含enabled状态的字典列表）
-        if group_data:
-            if isinstance(group_data[0], str):
-                # 旧格式：转换为新格式，默认全部启用
-                for path in group_data:
-                    self.add_program_item(path, enabled=True)
-            else:
-                # 新格式
-                for item in group_data:
-                    if isinstance(item, dict):
-                        self.add_program_item(
-                            item['path'], enabled=item.get('enabled', True))
-                    else:
-                        # 兼容混合格式
-                        self.add_program_item(item, enabled=True)
+
+        # 兼容旧格式（纯路径列表）、列表格式和带组级选项的字典格式
+        for app in get_group_apps(self.data[group_name]):
+            self.add_program_item(app['path'], enabled=app['enabled'], config=app)
 
         self.loading_group = False
         self.update_status_message()
+        self.update_group_priorities()
 
     def clear_program_cards(self):
         """清空程序卡片"""
@@ -240,10 +458,11 @@ class SoftwareLauncher(QWidget):
         for i in range(self.program_cards_layout.count()):
             widget = self.program_cards_layout.itemAt(i).widget()
             if isinstance(widget, AppCardWidget):
-                programs.append({
-                    'path': widget.path,
-                    'enabled': widget.enabled
-                })
+                # 保留卡片上的其他配置项（如 after 依赖）
+                program = dict(widget.config)
+                program['path'] = widget.path
+                program['enabled'] = widget.enabled
+                programs.append(program)
         return programs
 
     def auto_save_current_group(self):
@@ -252,11 +471,12 @@ class SoftwareLauncher(QWidget):
             return
 
         programs = self.get_current_program_paths()
-        self.data[self.current_group] = programs
-        save_config(self.data)
+        options = get_group_options(self.data.get(self.current_group))
+        self.data[self.current_group] = make_group_data(programs, options)
+        self.save_data()
 
         self.update_status_message()
-        print(f"[自动保存] 组 '{self.current_group}' 已保存 ({len(programs)} 个程序)")
+        log.debug("组 '%s' 已自动保存 (%d 个程序)", self.current_group, len(programs))
 
     def remove_app_from_current_group(self, app_path):
         """从当前组中移除应用"""
@@ -287,7 +507,7 @@ class SoftwareLauncher(QWidget):
                 QMessageBox.warning(self, "警告", "组名已存在")
                 return
             self.data[name] = []
-            save_config(self.data)  # 立即保存新组
+            self.save_data()  # 立即保存新组
             self.refresh_group_list()
 
     def delete_group(self, name=None):
@@ -298,7 +518,7 @@ class SoftwareLauncher(QWidget):
             self, "确认", f"确定要删除组 '{group}'？", QMessageBox.Yes | QMessageBox.No)
         if reply == QMessageBox.Yes:
             del self.data[group]
-            save_config(self.data)  # 立即保存
+            self.save_data()  # 立即保存
             self.refresh_group_list()
             self.clear_program_cards()
 
@@ -312,35 +532,106 @@ class SoftwareLauncher(QWidget):
             # 更新当前组名
             if self.current_group == old_name:
                 self.current_group = new_name
-            save_config(self.data)  # 立即保存
+            self.save_data()  # 立即保存
             self.refresh_group_list()
 
     def launch_group(self, name):
         if not name or name not in self.data:
             self.status_label.setText("❌ 请先选择一个组")
             return
-        launched_count = 0
-        total_enabled = 0
-        group_data = self.data[name]
-
-        for item in group_data:
-            # 兼容旧格式和新格式
-            if isinstance(item, str):
-                path = item
-                enabled = True  # 旧格式默认启用
-            else:
-                path = item['path']
-                enabled = item.get('enabled', True)
 
-            if enabled:
-                total_enabled += 1
-                if launch_application(path):
-                    launched_count += 1
-                else:
-                    QMessageBox.warning(self, "启动失败", f"{path}")
+        apps = get_enabled_apps(self.data[name])
+        if not apps:
+            self.status_label.setText(f"🚀 组 '{name}' 中没有已启用的程序")
+            return
+        try:
+            pipeline = self.create_launch_pipeline(name, apps)
+        except DependencyError as e:
+            self.status_label.setText(f"❌ 无法启动组 '{name}': {str(e)}")
+            return
+
+        def launch_finished(results):
+            get_launch_telemetry().record_group(name, time.monotonic() - pipeline.started)
+            self.on_launch_finished(pipeline, results)
+
+        pipeline.finished.connect(launch_finished)
+        self.status_label.setText(f"🚀 正在启动 {len(apps)} 个已启用程序...")
+        # 已冻结的应用在运行检测中视为已在运行，这里顺便解冻
+        self.thaw_apps([app['path'] for app in apps], quiet=True)
+        pipeline.start()
+
+    def create_launch_pipeline(self, name, apps):
+        """为组内指定应用创建启动流水线（依赖、并发上限和就绪检测取自组配置）
+
+        依赖关系存在循环时抛出 DependencyError。
+        """
+        paths = [app['path'] for app in apps]
+        max_parallel = get_group_options(self.data[name]).get('max_parallel', 0)
+        probes = {app['path']: app['ready'] for app in apps if app.get('ready')}
+        allow_multiple = {app['path'] for app in apps if app.get('allow_multiple')}
+        launching = set()
+        for other in self.launch_pipelines:
+            launching |= other.active_paths()
+        dependencies = resolve_dependencies(apps)
+        topological_levels(dependencies)
+
+        # 启动在后台线程池中进行，结果逐个回到界面
+        pipeline = LaunchPipeline(paths, dependencies, max_parallel, probes, name,
+                                  prewarm=self.settings.get("prewarm", False),
+                                  allow_multiple=allow_multiple, launching=launching,
+                                  parent=self)
+        pipeline.app_starting.connect(
+            lambda result: self.on_app_starting(pipeline, result))
+        pipeline.app_result.connect(
+            lambda result: self.on_launch_result(pipeline, result))
+        self.launch_pipelines.add(pipeline)
+        return pipeline
+
+    def on_app_starting(self, pipeline, result):
+        """进程已创建：登记并跟踪，卡片显示为启动中"""
+        self.track_launched_app(result.path, result.popen, pipeline.group)
+        self.set_card_status(result.path, STATUS_STARTING)
+
+    def on_launch_result(self, pipeline, result):
+        """单个应用启动完成，逐步更新卡片和状态栏"""
+        if result.status in (LAUNCH_LAUNCHED, LAUNCH_RUNNING):
+            self.set_card_status(result.path, STATUS_RUNNING)
+        elif result.popen is not None:
+            # 进程已创建但未能就绪，按实际运行情况显示
+            snapshot = get_process_snapshot()
+            for card in self.get_app_cards():
+                if card.path == result.path:
+                    card.set_status(None)
+                    card.set_running(self.exit_watcher.is_tracking(card.path)
+                                     or snapshot.is_running(card.path))
 
         self.status_label.setText(
-            f"🚀 已启动 {launched_count}/{total_enabled} 个已启用程序")
+            f"🚀 正在启动... {len(pipeline.results)}/{len(pipeline.paths)}")
+
+    def on_launch_finished(self, pipeline, results):
+        """整组启动完成，汇总结果，失败项集中在一个非模态提示中"""
+        self.launch_pipelines.discard(pipeline)
+        pipeline.deleteLater()
+
+        launched = [r for r in results if r.status == LAUNCH_LAUNCHED]
+        running = [r for r in results if r.status == LAUNCH_RUNNING]
+        failed = [r for r in results if r.status == LAUNCH_FAILED]
+        blocked = [r for r in results if r.status == LAUNCH_BLOCKED]
+
+        message = (f"🚀 启动 {len(launched)} 个，跳过 {len(running)} 个（已在运行），"
+                   f"失败 {len(failed)} 个")
+        if blocked:
+            message += f"，{len(blocked)} 个因依赖未启动而跳过"
+        self.status_label.setText(message)
+
+        if failed:
+            details = "\n".join(f"{r.path}：{r.message}" for r in failed)
+            box = QMessageBox(QMessageBox.Warning, "启动失败",
+                              f"{len(failed)} 个程序启动失败：", QMessageBox.Ok, self)
+            box.setInformativeText(details)
+            box.setModal(False)
+            box.setAttribute(Qt.WA_DeleteOnClose)
+            box.show()
 
     def launch_all(self):
         """启动当前组中选中的应用"""
@@ -367,29 +658,108 @@ class SoftwareLauncher(QWidget):
         if reply != QMessageBox.Yes:
             return
 
-        closed_count = 0
-        total_enabled = 0
-        group_data = self.data[name]
+        apps = get_enabled_apps(self.data[name])
+        paths = [app['path'] for app in apps]
 
-        for item in group_data:
-            # 兼容旧格式和新格式
-            if isinstance(item, str):
-                path = item
-                enabled = True  # 旧格式默认启用
-            else:
-                path = item['path']
-                enabled = item.get('enabled', True)
-
-            if enabled:
-                total_enabled += 1
-                try:
-                    if close_application_by_path(path):
-                        closed_count += 1
-                except Exception as e:
-                    print(f"[关闭失败] {path}: {str(e)}")
+        # 按依赖关系的逆序关闭：依赖者先关闭，被依赖的程序最后关闭
+        try:
+            levels = topological_levels(resolve_dependencies(apps))
+            levels.reverse()
+        except DependencyError as e:
+            log.warning("关闭顺序无效: %s，改为同时关闭", e)
+            levels = [paths]
+
+        if not paths:
+            self.status_label.setText(f"🛑 组 '{name}' 中没有已启用的程序")
+            return
 
+        # 该组尚未开始的启动任务不再执行（取消可能立即结束流水线并将其移出集合）
+        for pipeline in list(self.launch_pipelines):
+            if pipeline.group == name:
+                pipeline.cancel()
+
+        # 关闭操作在后台线程中并发执行，不阻塞界面
+        self.close_btn.setEnabled(False)
+        self.status_label.setText(f"🛑 正在关闭组 '{name}' 中的 {len(paths)} 个程序...")
+        grace = self.settings.get("close_grace_timeout")
+        self.run_in_background(
+            lambda reports: self.on_close_group_finished(name, reports),
+            close_applications_in_order, levels, grace=grace,
+            on_failed=lambda error: self.close_btn.setEnabled(True))
+
+    def on_close_group_finished(self, name, reports):
+        """关闭组完成后汇总结果"""
+        self.close_btn.setEnabled(True)
+        closed_count = sum(1 for report in reports.values() if report.closed)
+        killed_count = sum(report.killed for report in reports.values())
+        failed = [report.path for report in reports.values()
+                  if report.matched and not report.closed]
+
+        message = f"🛑 已关闭 {closed_count}/{len(reports)} 个已启用程序"
+        if killed_count:
+            message += f"，其中 {killed_count} 个进程被强制结束"
+        if failed:
+            message += f"，{len(failed)} 个未能关闭"
+        self.status_label.setText(message)
+
+    def freeze_group(self, name):
+        """冻结组：挂起组内已启用应用的整棵进程树"""
+        paths = [app['path'] for app in get_enabled_apps(self.data.get(name, []))]
+        if not paths:
+            self.status_label.setText(f"❄ 组 '{name}' 中没有已启用的程序")
+            return
+        self.status_label.setText(f"❄ 正在冻结组 '{name}'...")
+        self.run_in_background(
+            lambda counts: self.on_freeze_finished(name, counts, True),
+            freeze_applications, paths)
+
+    def thaw_group(self, name):
+        """解冻组：恢复组内已启用应用的进程"""
+        self.thaw_apps([app['path'] for app in get_enabled_apps(self.data.get(name, []))],
+                       name=name)
+
+    def thaw_apps(self, paths, name=None, quiet=False):
+        """在后台解冻指定应用，quiet 为 True 时不更新状态栏"""
+        if not paths:
+            return
+        self.run_in_background(
+            lambda counts: self.on_freeze_finished(name, counts, False, quiet),
+            thaw_applications, paths)
+
+    def on_freeze_finished(self, name, counts, frozen, quiet=False):
+        """冻结/解冻完成后更新卡片和状态栏"""
+        for path, count in counts.items():
+            if count:
+                self.set_card_status(path, STATUS_FROZEN if frozen else STATUS_RUNNING)
+        if quiet:
+            return
+        app_count = sum(1 for count in counts.values() if count)
+        action = "❄ 已冻结" if frozen else "🔥 已解冻"
+        target = f"组 '{name}' 中" if name else ""
         self.status_label.setText(
-            f"🛑 已尝试关闭 {closed_count}/{total_enabled} 个已启用程序")
+            f"{action}{target} {app_count} 个程序（{sum(counts.values())} 个进程）")
+
+    def run_in_background(self, on_finished, fn, *args, on_failed=None, **kwargs):
+        """在后台线程中执行函数，完成后在主线程回调 on_finished(结果)，出错时回调 on_failed(错误信息)"""
+        task = BackgroundTask(fn, *args, parent=self, **kwargs)
+        self.background_tasks.add(task)
+
+        def finish(result):
+            self.background_tasks.discard(task)
+            task.deleteLater()
+            on_finished(result)
+
+        def fail(error):
+            self.background_tasks.discard(task)
+            task.deleteLater()
+            log.error("后台任务失败: %s", error)
+            self.status_label.setText(f"❌ 操作失败: {error}")
+            if on_failed is not None:
+                on_failed(error)
+
+        task.finished.connect(finish)
+        task.failed.connect(fail)
+        return task.start()
 
     def group_list_mouse_press_event(self, event):
         """处理组列表鼠标按下事件，阻止右键选中"""
@@ -427,13 +797,15 @@ class SoftwareLauncher(QWidget):
                     if new_name in self.data:
                         QMessageBox.warning(self, "警告", "组名已存在")
                         return
-                    # 深拷贝，保持数据格式
-                    self.data[new_name] = copy.deepcopy(self.data[old_name])
+                    # 深拷贝，保持组级选项和应用配置
+                    old_data = copy.deepcopy(self.data[old_name])
+                    apps = get_group_apps(old_data)
                     # 复制时默认全部勾选
-                    for item in self.data[new_name]:
-                        if isinstance(item, dict):
-                            item['enabled'] = True
-                    save_config(self.data)  # 立即保存
+                    for app in apps:
+                        app['enabled'] = True
+                    self.data[new_name] = make_group_data(
+                        apps, get_group_options(old_data))
+                    self.save_data()  # 立即保存
                     self.refresh_group_list()
                     QMessageBox.information(
                         self, "复制成功", f"组 '{old_name}' 已复制为 '{new_name}'（默认全部勾选）")
@@ -446,6 +818,21 @@ class SoftwareLauncher(QWidget):
                 lambda: self.smart_switch_group(group_name))
             menu.addAction(action_switch)
 
+            action_preview = QAction("👁 预览切换", self)
+            action_preview.triggered.connect(
+                lambda: self.preview_smart_switch(group_name))
+            menu.addAction(action_preview)
+
+            action_freeze = QAction("❄ 冻结组", self)
+            action_freeze.triggered.connect(
+                lambda: self.freeze_group(group_name))
+            menu.addAction(action_freeze)
+
+            action_thaw = QAction("🔥 解冻组", self)
+            action_thaw.triggered.connect(
+                lambda: self.thaw_group(group_name))
+            menu.addAction(action_thaw)
+
             action_delete = QAction("🗑 删除组", self)
             action_delete.triggered.connect(
                 lambda: self.delete_group(group_name))
@@ -455,77 +842,148 @@ class SoftwareLauncher(QWidget):
             action_add.triggered.connect(self.add_group)
             menu.addAction(action_add)
 
+        action_export = QAction("📈 导出启动耗时", self)
+        action_export.triggered.connect(self.export_launch_telemetry)
+        menu.addAction(action_export)
+
         menu.exec_(self.group_list.mapToGlobal(pos))
 
-    def smart_switch_group(self, target_group_name):
-        """智能切换组：关闭原组启动但目标组未启用的应用，启动目标组启用但原组未启动的应用"""
-        if not self.current_group or target_group_name == self.current_group:
-            self.switch_to_group(target_group_name)
+    def export_launch_telemetry(self):
+        """把各应用和各组的启动耗时统计导出为 CSV"""
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "导出启动耗时", "launch_telemetry.csv", "CSV 文件 (*.csv)")
+        if not file_path:
             return
+        try:
+            rows = get_launch_telemetry().export_csv(file_path)
+        except Exception as e:
+            QMessageBox.warning(self, "导出失败", str(e))
+            return
+        self.status_label.setText(f"📈 已导出 {rows} 条启动耗时统计到 {file_path}")
+
+    def plan_smart_switch(self, target_group_name, policy=None):
+        """规划从当前组到目标组的智能切换，只返回计划，不执行任何操作"""
+        policy = policy or self.settings.get("switch_policy")
+        return plan_transition(
+            self.current_group, get_group_apps(self.data.get(self.current_group, [])),
+            target_group_name, get_group_apps(self.data.get(target_group_name, [])),
+            policy)
+
+    def smart_switch_group(self, target_group_name, dry_run=False, policy=None):
+        """智能切换组：关闭原组启动但目标组未启用的应用，启动目标组启用但原组未启动的应用
+
+        dry_run 为 True 时只返回切换计划；否则立即切换界面，关闭和启动在后台进行。
+        """
+        if not self.current_group or target_group_name == self.current_group:
+            if not dry_run:
+                self.switch_to_group(target_group_name)
+            return None
 
         try:
-            # 获取当前组和目标组的应用数据
-            current_group_data = self.data.get(self.current_group, [])
-            target_group_data = self.data.get(target_group_name, [])
-
-            # 标准化数据格式，确保都是字典格式
-            def normalize_group_data(group_data):
-                normalized = []
-                for item in group_data:
-                    if isinstance(item, str):
-                        normalized.append({'path': item, 'enabled': True})
-                    else:
-                        normalized.append(item)
-                return normalized
-
-            current_apps = normalize_group_data(current_group_data)
-            target_apps = normalize_group_data(target_group_data)
-
-            # 创建路径到启用状态的映射
-            current_enabled = {app['path']: app.get(
-                'enabled', True) for app in current_apps}
-            target_enabled = {app['path']: app.get(
-                'enabled', True) for app in target_apps}
-
-            # 统计操作
-            closed_count = 0
-            launched_count = 0
-
-            # 1. 关闭原组启动但目标组未启用的应用
-            for app_path in current_enabled:
-                if current_enabled[app_path]:  # 当前组中启用
-                    target_app_enabled = target_enabled.get(app_path, False)
-                    if not target_app_enabled:  # 目标组中未启用或不存在
-                        if is_application_running(app_path):
-                            if close_application_by_path(app_path):
-                                closed_count += 1
-
-            # 2. 启动目标组启用但原组未启动的应用
-            for app_path in target_enabled:
-                if target_enabled[app_path]:  # 目标组中启用
-                    current_app_enabled = current_enabled.get(app_path, False)
-                    if not current_app_enabled:  # 当前组中未启用或不存在
-                        if not is_application_running(app_path):
-                            if launch_application(app_path):
-                                launched_count += 1
-
-            # 3. 切换到目标组
-            self.switch_to_group(target_group_name)
-
-            # 显示操作结果
-            message = f"🔄 已切换到组 '{target_group_name}'"
+            # 整个切换过程只基于一次进程快照做判断
+            plan = self.plan_smart_switch(target_group_name, policy)
+        except Exception as e:
+            log.error("切换组失败: %s", e)
+            if not dry_run:
+                self.status_label.setText(f"❌ 切换组失败: {str(e)}")
+                # 即使出错也要切换组
+                self.switch_to_group(target_group_name)
+            return None
+
+        if dry_run:
+            return plan
+
+        self.switch_to_group(target_group_name)
+        self.execute_transition(plan)
+        return plan
+
+    def execute_transition(self, plan):
+        """在后台执行切换计划：先关后启，或按 overlap 策略同时进行；冻结的应用立即解冻"""
+        results = {}
+        # 解冻只需毫秒级，与关闭/启动互不影响
+        self.thaw_apps(plan.thaw, quiet=True)
+
+        def phase_done(phase, value):
+            results[phase] = value
+            if len(results) < 2:
+                return
+            closed_count = sum(
+                1 for report in results['close'].values() if report.closed)
+            launched_count = sum(
+                1 for result in results['launch'] if result.status == LAUNCH_LAUNCHED)
+            message = f"🔄 已切换到组 '{plan.target}'"
             if closed_count > 0 or launched_count > 0:
                 message += f"\n关闭了 {closed_count} 个应用，启动了 {launched_count} 个应用"
-
+            if plan.freeze or plan.thaw:
+                message += f"\n冻结了 {len(plan.freeze)} 个应用，解冻了 {len(plan.thaw)} 个应用"
             self.status_label.setText(message)
-            print(
-                f"[智能切换] {self.current_group} -> {target_group_name}, 关闭: {closed_count}, 启动: {launched_count}")
+            log.info("智能切换 %s -> %s, 关闭: %d, 启动: %d, 冻结: %d, 解冻: %d",
+                     plan.source, plan.target, closed_count, launched_count,
+                     len(plan.freeze), len(plan.thaw))
 
-        except Exception as e:
-            print(f"[切换组失败] {str(e)}")
-            self.status_label.setText(f"❌ 切换组失败: {str(e)}")
-            # 即使出错也要切换组
-            self.switch_to_group(target_group_name)
+        def start_launch():
+            if not plan.launch:
+                phase_done('launch', [])
+                return
+            apps = [app for app in get_group_apps(self.data.get(plan.target, []))
+                    if app['path'] in plan.launch]
+            try:
+                pipeline = self.create_launch_pipeline(plan.target, apps)
+            except DependencyError as e:
+                log.error("切换组启动失败: %s", e)
+                phase_done('launch', [])
+                return
+
+            def launch_finished(launch_results):
+                self.on_launch_finished(pipeline, launch_results)
+                phase_done('launch', launch_results)
+
+            pipeline.finished.connect(launch_finished)
+            pipeline.start()
+
+        def start_close(then=None):
+            def close_finished(reports):
+                phase_done('close', reports)
+                if then is not None:
+                    then()
+
+            if plan.freeze:
+                # 冻结代替关闭，启动可以立即开始
+                self.run_in_background(
+                    lambda counts: self.on_freeze_finished(plan.source, counts, True, quiet=True),
+                    freeze_applications, plan.freeze)
+            if not plan.close:
+                close_finished({})
+                return
+            # 原组内按依赖关系的逆序关闭
+            apps = [app for app in get_group_apps(self.data.get(plan.source, []))
+                    if app['path'] in plan.close]
+            try:
+                levels = topological_levels(resolve_dependencies(apps))
+                levels.reverse()
+            except DependencyError:
+                levels = [plan.close]
+            self.run_in_background(
+                close_finished, close_applications_in_order, levels,
+                grace=self.settings.get("close_grace_timeout"),
+                on_failed=lambda error: close_finished({}))
+
+        self.status_label.setText(
+            f"🔄 正在切换到组 '{plan.target}'：关闭 {len(plan.close)} 个，启动 {len(plan.launch)} 个...")
+        if plan.policy in (SWITCH_OVERLAP, SWITCH_FREEZE):
+            start_close()
+            start_launch()
+        else:
+            start_close(then=start_launch)
+
+    def preview_smart_switch(self, target_group_name):
+        """预览切换计划"""
+        plan = self.smart_switch_group(target_group_name, dry_run=True)
+        text = plan.describe() if plan else "目标组即为当前组，无需切换"
+        box = QMessageBox(QMessageBox.Information, "切换预览", text, QMessageBox.Ok, self)
+        box.setModal(False)
+        box.setAttribute(Qt.WA_DeleteOnClose)
+        box.show()
 
     def dragEnterEvent(self, event):
         if event.mimeData().hasUrls():
@@ -540,17 +998,28 @@ class SoftwareLauncher(QWidget):
             if is_valid_app_file(path):
                 self.add_program_item(path)
 
-    def add_program_item(self, path, enabled=True):
+    def add_program_item(self, path, enabled=True, config=None):
         # 应用名：.lnk用快捷方式名，exe用文件名
         name = get_app_name(path)
         display_path = path
-        icon = get_app_icon(path)
+        # 先用已加载的图标、图集中的图标或占位图标显示卡片，
+        # 后台检查来源图标，新增或有变化时加载完成后再替换
+        icon = self.card_icons.get(path)
+        if icon is None:
+            pixmap = self.icon_atlas.get_pixmap(path)
+            if pixmap is not None:
+                icon = self.card_icons[path] = QIcon(pixmap)
+        if path not in self.checked_icons:
+            # 图集中的图标未能读取（例如图集文件缺失或被截断）时不传缓存键，强制重新加载
+            self.icon_loader.request(path, self.icon_atlas.key(path) if icon is not None else None)
+        if icon is None:
+            icon = create_white_default_icon(ICON_SIZE)
 
         # 创建应用卡片
-        app_card = AppCardWidget(icon, name, display_path, self, enabled)
+        app_card = AppCardWidget(icon, name, display_path, self, enabled, config)
         self.program_cards_layout.addWidget(app_card)
 
-        print(f"[UI] 添加应用卡片: {name} (启用: {enabled})")
+        log.debug("添加应用卡片: %s (启用: %s)", name, enabled)
 
         # 如果不是加载状态，则自动保存
         if self.current_group and not self.loading_group:
@@ -562,6 +1031,7 @@ class SoftwareLauncher(QWidget):
             settings = dialog.get_settings()
             save_settings(settings)
             self.settings = settings
+            set_log_level(settings["log_level"])
             if settings["auto_start"]:
                 set_auto_start(True)
             else:
@@ -603,6 +1073,10 @@ class SoftwareLauncher(QWidget):
 
     def quit_app(self):
         """退出应用程序"""
+        for pipeline in list(self.launch_pipelines):
+            pipeline.cancel()
+        self.icon_loader.shutdown()
+        self.icon_atlas.close()
         self.tray_icon.hide()
         sys.exit(0)
 
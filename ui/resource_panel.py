@@ -0,0 +1,34 @@
+"""组资源面板"""
+from PyQt5.QtWidgets import QLabel
+from utils.resource_sampler import RSS, CPU, READ_RATE, WRITE_RATE, format_bytes
+from .styles import get_resource_panel_style
+
+
+class ResourcePanel(QLabel):
+    """显示当前组合计的资源占用（当前值 / 近期平均，提示中为长期平均）和采样自身的开销"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setStyleSheet(get_resource_panel_style())
+        self.setText("📊 资源占用: 暂无数据")
+
+    def update_usage(self, latest, recent, long_term, sampler):
+        """刷新显示，latest/recent/long_term 为组内应用合计的当前值、近期平均和长期平均"""
+        self.setText(
+            f"📊 内存 {format_bytes(latest[RSS])}（均 {format_bytes(recent[RSS])}）"
+            f"  CPU {latest[CPU]:.1f}%（均 {recent[CPU]:.1f}%）"
+            f"  读 {format_bytes(latest[READ_RATE])}/s  写 {format_bytes(latest[WRITE_RATE])}/s")
+        lines = []
+        if long_term is not None:
+            lines.append(f"长期平均: 内存 {format_bytes(long_term[RSS])}，CPU {long_term[CPU]:.1f}%，"
+                         f"读 {format_bytes(long_term[READ_RATE])}/s，"
+                         f"写 {format_bytes(long_term[WRITE_RATE])}/s")
+        lines.append(
+            f"采样间隔 {sampler.interval / 1000:.1f} 秒，"
+            f"单次耗时 {sampler.last_cost * 1000:.1f} 毫秒，"
+            f"占用 {sampler.cost_ratio() * 100:.2f}% 的采样时间")
+        self.setToolTip("\n".join(lines))
+
+    def clear_usage(self):
+        self.setText("📊 资源占用: 暂无数据")
+        self.setToolTip("")
@@ -1,8 +1,11 @@
 """设置对话框组件"""
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QFormLayout,
-                             QCheckBox, QPushButton, QLabel)
+                             QCheckBox, QPushButton, QLabel, QDoubleSpinBox,
+                             QComboBox)
 from PyQt5.QtCore import Qt
 from config.settings import load_settings, get_auto_start_status, set_auto_start
+from utils.transition_planner import SWITCH_CLOSE_THEN_LAUNCH, SWITCH_OVERLAP, SWITCH_FREEZE
+from utils.log_utils import LOG_LEVELS
 from .styles import get_settings_dialog_style
 
 
@@ -10,7 +13,7 @@ class SettingsDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("设置")
-        self.setFixedSize(400, 200)
+        self.setFixedSize(400, 380)
         self.setModal(True)
 
         # 加载当前设置
@@ -45,8 +48,51 @@ class SettingsDialog(QDialog):
         self.minimize_to_tray_checkbox.stateChanged.connect(
             self.on_minimize_to_tray_changed)
 
+        # 前台/后台组优先级
+        self.dynamic_priority_checkbox = QCheckBox("当前组优先，其他组降为后台优先级（仅由本程序启动的应用）")
+        self.dynamic_priority_checkbox.setChecked(self.settings["dynamic_priority"])
+        self.dynamic_priority_checkbox.stateChanged.connect(
+            self.on_dynamic_priority_changed)
+
+        # 启动预热
+        self.prewarm_checkbox = QCheckBox("启动组前预读程序文件（加快开机后首次启动）")
+        self.prewarm_checkbox.setChecked(self.settings["prewarm"])
+        self.prewarm_checkbox.stateChanged.connect(self.on_prewarm_changed)
+
+        # 关闭组时的等待时间
+        self.close_grace_spinbox = QDoubleSpinBox()
+        self.close_grace_spinbox.setRange(0.0, 60.0)
+        self.close_grace_spinbox.setSingleStep(0.5)
+        self.close_grace_spinbox.setSuffix(" 秒")
+        self.close_grace_spinbox.setValue(self.settings["close_grace_timeout"])
+        self.close_grace_spinbox.valueChanged.connect(
+            self.on_close_grace_changed)
+
         form_layout.addRow("", self.auto_start_checkbox)
         form_layout.addRow("", self.minimize_to_tray_checkbox)
+        form_layout.addRow("", self.dynamic_priority_checkbox)
+        form_layout.addRow("", self.prewarm_checkbox)
+        # 切换组策略
+        self.switch_policy_combo = QComboBox()
+        self.switch_policy_combo.addItem("先关闭再启动（内存占用低）", SWITCH_CLOSE_THEN_LAUNCH)
+        self.switch_policy_combo.addItem("同时关闭和启动（更快）", SWITCH_OVERLAP)
+        self.switch_policy_combo.addItem("冻结原组（切回时立即恢复）", SWITCH_FREEZE)
+        index = self.switch_policy_combo.findData(self.settings["switch_policy"])
+        self.switch_policy_combo.setCurrentIndex(max(index, 0))
+        self.switch_policy_combo.currentIndexChanged.connect(
+            self.on_switch_policy_changed)
+
+        # 日志级别
+        self.log_level_combo = QComboBox()
+        for level in LOG_LEVELS:
+            self.log_level_combo.addItem(level, level)
+        index = self.log_level_combo.findData(self.settings["log_level"])
+        self.log_level_combo.setCurrentIndex(max(index, 0))
+        self.log_level_combo.currentIndexChanged.connect(self.on_log_level_changed)
+
+        form_layout.addRow("关闭等待时间", self.close_grace_spinbox)
+        form_layout.addRow("切换组策略", self.switch_policy_combo)
+        form_layout.addRow("日志级别", self.log_level_combo)
 
         layout.addLayout(form_layout)
         layout.addStretch()
@@ -84,5 +130,20 @@ class SettingsDialog(QDialog):
     def on_minimize_to_tray_changed(self, state):
         self.settings["minimize_to_tray"] = (state == Qt.Checked)
 
+    def on_dynamic_priority_changed(self, state):
+        self.settings["dynamic_priority"] = (state == Qt.Checked)
+
+    def on_prewarm_changed(self, state):
+        self.settings["prewarm"] = (state == Qt.Checked)
+
+    def on_close_grace_changed(self, value):
+        self.settings["close_grace_timeout"] = value
+
+    def on_switch_policy_changed(self, index):
+        self.settings["switch_policy"] = self.switch_policy_combo.itemData(index)
+
+    def on_log_level_changed(self, index):
+        self.settings["log_level"] = self.log_level_combo.itemData(index)
+
     def get_settings(self):
         return self.settings
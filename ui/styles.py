@@ -248,3 +248,17 @@ def get_scroll_area_style():
             background: none;
         }
     """
+
+
+def get_resource_panel_style():
+    """获取组资源面板样式"""
+    return """
+        QLabel {
+            background-color: rgba(255, 255, 255, 0.7);
+            border: 1px solid #e2e8f0;
+            border-radius: 6px;
+            padding: 6px 10px;
+            color: #4a5568;
+            font-size: 12px;
+        }
+    """
@@ -0,0 +1,314 @@
+"""后台任务：在共享线程池中执行耗时操作，结果通过信号回到主线程"""
+import logging
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from PyQt5.QtCore import QObject, pyqtSignal
+from config.constants import WORKER_POOL_SIZE, ICON_LOADER_WORKERS
+from utils.icon_utils import load_app_icon_image
+from utils.process_utils import get_process_snapshot, spawn_application
+from utils.spawn_utils import resolve_launch_spec, find_executable
+from utils.launch_scheduler import LaunchScheduler
+from utils.readiness import wait_until_ready
+from utils.process_registry import is_app_running
+from utils.prewarm import prewarm_app, schedule_record_launch
+from utils.launch_telemetry import (LaunchTimer, start_follow_launch,
+                                    PHASE_SPAWN, PHASE_READY)
+
+log = logging.getLogger(__name__)
+
+_executor = None
+
+
+def get_executor():
+    """获取共享的后台线程池"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=WORKER_POOL_SIZE,
+                                       thread_name_prefix="aprogram-worker")
+    return _executor
+
+
+class BackgroundTask(QObject):
+    """在后台线程执行一个函数，完成后发出 finished(结果) 或 failed(错误信息)"""
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, fn, *args, parent=None, **kwargs):
+        super().__init__(parent)
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.future = None
+
+    def start(self):
+        """提交到线程池"""
+        self.future = get_executor().submit(self.fn, *self.args, **self.kwargs)
+        self.future.add_done_callback(self._on_done)
+        return self
+
+    def cancel(self):
+        """取消尚未开始执行的任务"""
+        return self.future is not None and self.future.cancel()
+
+    def _on_done(self, future):
+        # 在工作线程中执行，信号会排队送到主线程
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            self.failed.emit(str(error))
+        else:
+            self.finished.emit(future.result())
+
+
+class IconLoader(QObject):
+    """在独立的有界线程池中加载应用图标，完成后发出 icon_loaded(路径, QImage或None, 缓存键)
+
+    切换组时调用 cancel_pending() 取消尚未开始的任务，已在执行的任务结果会被丢弃，
+    避免旧组的图标拖慢新组。
+    """
+    icon_loaded = pyqtSignal(str, object, object)
+    _loaded = pyqtSignal(str, int, object, object)  # 工作线程 -> 主线程
+
+    def __init__(self, max_workers=ICON_LOADER_WORKERS, parent=None):
+        super().__init__(parent)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers,
+                                           thread_name_prefix="aprogram-icon")
+        self.generation = 0
+        self.pending = {}  # 路径 -> Future，同一路径只加载一次
+        self._loaded.connect(self._on_loaded)
+
+    def request(self, path, known_key=None):
+        """提交一个图标加载任务；known_key 为已有图标的缓存键，来源未变化时不重新加载"""
+        if path in self.pending:
+            return
+        self.pending[path] = self.executor.submit(self._load, path, self.generation, known_key)
+
+    def _load(self, path, generation, known_key):
+        if generation != self.generation:
+            return  # 已取消
+        try:
+            image, key = load_app_icon_image(path, known_key=known_key)
+        except Exception as e:
+            log.warning("图标加载失败 %s: %s", path, e)
+            image, key = None, None
+        self._loaded.emit(path, generation, image, key)
+
+    def _on_loaded(self, path, generation, image, key):
+        if generation != self.generation:
+            return
+        self.pending.pop(path, None)
+        self.icon_loaded.emit(path, image, key)
+
+    def cancel_pending(self):
+        """取消所有未完成的任务"""
+        self.generation += 1
+        for future in self.pending.values():
+            future.cancel()
+        self.pending.clear()
+
+    def shutdown(self):
+        self.cancel_pending()
+        self.executor.shutdown(wait=False)
+
+
+# 单个应用的启动结果
+LAUNCH_STARTING = "starting"    # 进程已创建，等待就绪（中间状态）
+LAUNCH_LAUNCHED = "launched"    # 已启动并就绪
+LAUNCH_RUNNING = "running"      # 已在运行，跳过（不重复启动）
+LAUNCH_FAILED = "failed"        # 启动失败
+LAUNCH_BLOCKED = "blocked"      # 依赖的程序未能启动，跳过
+LAUNCH_CANCELLED = "cancelled"  # 已取消
+
+
+class LaunchResult:
+    """单个应用的启动结果"""
+
+    def __init__(self, path, status, popen=None, message=""):
+        self.path = path
+        self.status = status
+        self.popen = popen
+        self.message = message
+
+    def __repr__(self):
+        return f"LaunchResult({self.path!r}, {self.status!r})"
+
+
+class LaunchPipeline(QObject):
+    """异步启动一组应用，每个应用的结果通过 app_result 逐个送回主线程
+
+    dependencies 为 {应用路径: {依赖的应用路径}}，依赖全部就绪后才启动该应用；
+    max_parallel 限制同时进行的启动数（0 表示不限制）；
+    probes 为 {应用路径: 就绪检测配置}，见 utils.readiness；
+    group 为所属组名，用于登记启动的进程；
+    allow_multiple 为允许重复启动的应用路径，其余已在运行（或正由其他流水线启动）的应用直接跳过；
+    launching 为其他流水线正在启动的应用路径；
+    prewarm 为 True 时启动开始即为所有应用预读文件，每个应用在自己的预读完成后才创建进程，
+    依赖其他应用的程序的预读与前面应用的启动重叠进行。
+    """
+    app_starting = pyqtSignal(object)  # LaunchResult，进程已创建
+    app_result = pyqtSignal(object)    # LaunchResult，最终结果
+    finished = pyqtSignal(object)      # [LaunchResult]
+    _starting_ready = pyqtSignal(object)  # 工作线程 -> 主线程
+    _result_ready = pyqtSignal(object)    # 工作线程 -> 主线程
+
+    def __init__(self, paths, dependencies=None, max_parallel=0, probes=None,
+                 group=None, prewarm=False, allow_multiple=None, launching=None,
+                 parent=None):
+        super().__init__(parent)
+        self.paths = list(dict.fromkeys(paths))  # 去重并保持顺序
+        self.group = group
+        if dependencies is None:
+            dependencies = {path: set() for path in self.paths}
+        self.scheduler = LaunchScheduler(dependencies, max_parallel)
+        self.probes = probes or {}
+        self.prewarm = prewarm
+        self.allow_multiple = set(allow_multiple or ())
+        self.launching = set(launching or ())
+        self.prewarm_futures = {}
+        self.snapshot = None
+        self.started = None
+        self.results = []
+        self.futures = []
+        self.cancelled = False
+        self._cancel_event = threading.Event()
+        self._starting_ready.connect(self.app_starting)
+        self._result_ready.connect(self._collect)
+
+    def start(self):
+        """基于同一份进程快照，提交依赖已满足的启动任务"""
+        self.started = time.monotonic()
+        if not self.paths:
+            self.finished.emit([])
+            return self
+
+        self.snapshot = get_process_snapshot()
+        if self.prewarm:
+            for path in self.paths:
+                if not self._should_skip(path, self.snapshot):
+                    self.prewarm_futures[path] = get_executor().submit(prewarm_app, path)
+        self._submit_ready()
+        return self
+
+    def cancel(self):
+        """取消尚未开始的启动任务，尚未调度的应用不再启动"""
+        self.cancelled = True
+        self._cancel_event.set()
+        for future in self.futures + list(self.prewarm_futures.values()):
+            future.cancel()
+        for path in list(self.scheduler.pending):
+            self.scheduler.pending.remove(path)
+            self._collect(LaunchResult(path, LAUNCH_CANCELLED))
+
+    def _submit_ready(self):
+        for path in self.scheduler.next_ready():
+            future = get_executor().submit(self._launch, path, self.snapshot)
+            future.add_done_callback(
+                lambda f, path=path: self._on_done(path, f))
+            self.futures.append(future)
+
+    def active_paths(self):
+        """尚未启动完成的应用（等待调度或正在启动）"""
+        return set(self.scheduler.pending) | self.scheduler.in_flight
+
+    def _should_skip(self, path, snapshot):
+        """应用已在运行或正由其他流水线启动，且不允许多开"""
+        if path in self.allow_multiple:
+            return False
+        return path in self.launching or is_app_running(path, snapshot)
+
+    def _launch(self, path, snapshot):
+        if self._should_skip(path, snapshot):
+            return LaunchResult(path, LAUNCH_RUNNING, message="已在运行，跳过")
+        if find_executable(resolve_launch_spec(path)) is None:
+            return LaunchResult(path, LAUNCH_FAILED, message="找不到要启动的程序")
+
+        prewarmed = self._wait_prewarm(path)
+        spawned_at = time.monotonic()
+        timer = LaunchTimer(path, parts=2)
+        popen = spawn_application(path)
+        if popen is None:
+            return LaunchResult(path, LAUNCH_FAILED, message="无法启动应用")
+        timer.mark(PHASE_SPAWN)
+        if popen.pid is not None:
+            start_follow_launch(timer, popen.pid, self._cancel_event)
+        else:
+            timer.part_done()
+
+        # 进程已创建，等待真正就绪后再让依赖它的应用启动
+        self._starting_ready.emit(LaunchResult(path, LAUNCH_STARTING, popen=popen))
+        probe = self.probes.get(path)
+        if not probe:
+            return self._finish_launch(path, popen, timer, prewarmed, None, True, "")
+
+        # 就绪检测可能持续到超时，在独立的守护线程中等待，不占用共享线程池（关闭、冻结、采样也在其中执行）
+        threading.Thread(target=self._wait_ready, args=(path, popen, probe, timer, prewarmed, spawned_at),
+                         name="aprogram-ready-wait", daemon=True).start()
+        return None  # 结果由等待线程送回
+
+    def _wait_ready(self, path, popen, probe, timer, prewarmed, spawned_at):
+        try:
+            ready, message = wait_until_ready(probe, path, popen.pid, self._cancel_event)
+        except Exception as e:
+            log.warning("就绪检测失败 %s: %s", path, e)
+            ready, message = False, str(e)
+        ready_seconds = time.monotonic() - spawned_at
+        self._result_ready.emit(
+            self._finish_launch(path, popen, timer, prewarmed, ready_seconds, ready, message))
+
+    def _finish_launch(self, path, popen, timer, prewarmed, ready_seconds, ready, message):
+        """ready_seconds 为 None 表示没有就绪检测"""
+        if ready and ready_seconds is not None:
+            timer.mark(PHASE_READY)
+        timer.part_done()
+        if not ready:
+            return LaunchResult(path, LAUNCH_FAILED, popen=popen, message=message)
+
+        # 在后台延迟记录，不推迟依赖它的应用启动：有就绪检测时记录就绪耗时（未开启预热时作为对照），
+        # 开启预热时记录用到的文件
+        if self.prewarm or ready_seconds is not None:
+            schedule_record_launch(path, popen.pid, prewarmed, ready_seconds,
+                                   collect_files=self.prewarm)
+        return LaunchResult(path, LAUNCH_LAUNCHED, popen=popen)
+
+    def _wait_prewarm(self, path):
+        """等待该应用的预读完成，返回是否完成了预热"""
+        future = self.prewarm_futures.get(path)
+        if future is None or future.cancelled():
+            return False
+        try:
+            files, size, seconds = future.result()
+        except Exception as e:
+            log.warning("预热失败 %s: %s", path, e)
+            return False
+        log.debug("预热 %s: %d 个文件，%.1f MB，耗时 %.0f 毫秒", path, files, size / 1024 / 1024, seconds * 1000)
+        return True
+
+    def _on_done(self, path, future):
+        # 可能在工作线程中执行，结果经信号排队送到主线程
+        if future.cancelled():
+            result = LaunchResult(path, LAUNCH_CANCELLED)
+        elif future.exception() is not None:
+            result = LaunchResult(path, LAUNCH_FAILED,
+                                  message=str(future.exception()))
+        else:
+            result = future.result()
+            if result is None:
+                return  # 正在独立线程中等待就绪
+        self._result_ready.emit(result)
+
+    def _collect(self, result):
+        self.results.append(result)
+        self.app_result.emit(result)
+
+        if result.path in self.scheduler.in_flight:
+            success = result.status in (LAUNCH_LAUNCHED, LAUNCH_RUNNING)
+            for path in self.scheduler.mark_done(result.path, success):
+                self._collect(LaunchResult(path, LAUNCH_BLOCKED,
+                                           message="依赖的程序未能启动"))
+            if not self.cancelled:
+                self._submit_ready()
+
+        if len(self.results) == len(self.paths):
+            self.finished.emit(self.results)
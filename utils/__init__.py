@@ -1,5 +1,23 @@
 """工具类模块"""
+from .icon_cache import *
+from .icon_convert import *
+from .icon_theme import *
+from .icon_atlas import *
+from .pixmap_cache import *
 from .icon_utils import *
+from .process_matcher import *
 from .process_utils import *
+from .process_watcher import *
+from .close_engine import *
+from .freeze_engine import *
+from .process_registry import *
+from .transition_planner import *
+from .priority_utils import *
+from .resource_sampler import *
+from .lnk_parser import *
 from .file_utils import *
+from .spawn_utils import *
+from .prewarm import *
+from .launch_telemetry import *
 from .system_utils import *
+from .log_utils import *
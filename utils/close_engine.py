@@ -0,0 +1,141 @@
+"""并发关闭引擎：一次快照、统一截止时间、整棵进程树结束"""
+import logging
+import psutil
+from config.constants import DEFAULT_SETTINGS, CLOSE_KILL_TIMEOUT
+from .process_utils import get_process_snapshot, invalidate_process_snapshot
+from .process_registry import get_process_registry
+
+log = logging.getLogger(__name__)
+
+
+class AppCloseReport:
+    """单个应用的关闭结果"""
+
+    def __init__(self, path):
+        self.path = path
+        self.names = set()   # 匹配到的进程名
+        self.matched = 0     # 匹配到的进程数（含子进程树）
+        self.exited = 0      # 收到终止信号后自行退出的进程数
+        self.killed = 0      # 超时后被强制结束的进程数
+        self.failed = 0      # 无权限或强制结束后仍存活的进程数
+
+    @property
+    def closed(self):
+        """是否找到并关闭了进程"""
+        return self.matched > 0 and self.failed == 0
+
+    def __repr__(self):
+        return (f"AppCloseReport({self.path!r}, matched={self.matched}, "
+                f"exited={self.exited}, killed={self.killed}, failed={self.failed})")
+
+
+def collect_process_trees(app_paths, snapshot, registry):
+    """收集每个应用的进程及其子进程树，返回 pid -> (应用路径, 进程对象, 进程名)
+
+    由启动器拉起的应用直接使用登记的PID，只关闭这些进程；
+    其余应用才按进程名/路径在快照中匹配。
+    """
+    owners = {}
+    for path in app_paths:
+        registered = registry.get_processes(path)
+        if registered:
+            roots = [(proc.pid, proc) for proc in registered]
+        else:
+            roots = [(pid, snapshot.entries[pid].proc)
+                     for pid in snapshot.find_pids(path)]
+
+        for root_pid, root_proc in roots:
+            # 同一进程只归属于最先匹配到的应用
+            if root_pid not in owners:
+                entry = snapshot.entries.get(root_pid)
+                owners[root_pid] = (path, root_proc, entry.name if entry else path)
+            for pid in snapshot.descendants(root_pid):
+                if pid not in owners:
+                    entry = snapshot.entries[pid]
+                    owners[pid] = (path, entry.proc, entry.name)
+    return owners
+
+
+def close_applications(app_paths, grace=None, snapshot=None):
+    """同时关闭多个应用，返回 {应用路径: AppCloseReport}
+
+    基于同一份快照向所有匹配进程及其子进程树发送终止信号，
+    在共同的截止时间内等待它们退出，之后强制结束剩余进程。
+    该函数会阻塞至多 grace + CLOSE_KILL_TIMEOUT 秒，应在后台线程中调用。
+    """
+    if grace is None:
+        grace = DEFAULT_SETTINGS["close_grace_timeout"]
+    if snapshot is None:
+        snapshot = get_process_snapshot()
+    registry = get_process_registry()
+
+    reports = {path: AppCloseReport(path) for path in app_paths}
+    owners = collect_process_trees(app_paths, snapshot, registry)
+
+    # 1. 一次性向所有进程发送终止信号
+    owner_of = {}
+    terminated = []
+    for pid, (path, proc, name) in owners.items():
+        report = reports[path]
+        report.matched += 1
+        report.names.add(name)
+        try:
+            proc.terminate()
+            if proc.status() == psutil.STATUS_STOPPED:
+                proc.resume()  # 被冻结的进程恢复后才能处理终止信号
+            terminated.append(proc)
+            owner_of[proc] = path
+        except (psutil.NoSuchProcess, psutil.ZombieProcess):
+            report.exited += 1
+        except psutil.AccessDenied:
+            report.failed += 1
+
+    # 2. 在同一个截止时间内等待全部进程退出
+    gone, alive = psutil.wait_procs(terminated, timeout=grace)
+    for proc in gone:
+        reports[owner_of[proc]].exited += 1
+
+    # 3. 强制结束仍存活的进程
+    killed = []
+    for proc in alive:
+        try:
+            proc.kill()
+            killed.append(proc)
+        except (psutil.NoSuchProcess, psutil.ZombieProcess):
+            reports[owner_of[proc]].exited += 1
+        except psutil.AccessDenied:
+            reports[owner_of[proc]].failed += 1
+
+    if killed:
+        gone, alive = psutil.wait_procs(killed, timeout=CLOSE_KILL_TIMEOUT)
+        for proc in gone:
+            reports[owner_of[proc]].killed += 1
+        for proc in alive:
+            reports[owner_of[proc]].failed += 1
+
+    if owners:
+        invalidate_process_snapshot()
+        registry.prune()
+
+    for report in reports.values():
+        if report.matched:
+            tag = "关闭成功" if report.closed else "关闭失败"
+            log.info("%s %s -> %s (退出 %d, 强制 %d, 失败 %d)", tag, report.path,
+                     ', '.join(sorted(report.names)), report.exited, report.killed, report.failed)
+        else:
+            log.debug("未找到进程: %s", report.path)
+
+    return reports
+
+
+def close_applications_in_order(levels, grace=None, snapshot=None):
+    """按层依次关闭应用，每层内部并发关闭，返回合并后的报告
+
+    levels 通常为依赖分层的逆序，保证依赖者先于被依赖者关闭。
+    """
+    if snapshot is None:
+        snapshot = get_process_snapshot()
+    reports = {}
+    for level in levels:
+        reports.update(close_applications(level, grace=grace, snapshot=snapshot))
+    return reports
@@ -1,16 +1,38 @@
 """文件处理工具"""
 import os
-from win32com.client import Dispatch
+from .lnk_parser import parse_lnk
 
 
 def resolve_lnk(path):
     """解析快捷方式文件，返回目标路径"""
+    shortcut = read_lnk(path)
+    return shortcut['target'] if shortcut is not None else path
+
+
+def read_lnk(path):
+    """读取快捷方式的目标路径、参数、工作目录和图标位置
+
+    直接解析文件（结果按修改时间缓存），解析失败时在 Windows 上回退到 WScript.Shell。
+    """
+    shortcut = parse_lnk(path)
+    if shortcut is None and os.name == 'nt':
+        shortcut = _read_lnk_com(path)
+    return shortcut
+
+
+def _read_lnk_com(path):
     try:
+        from win32com.client import Dispatch
         shell = Dispatch('WScript.Shell')
         shortcut = shell.CreateShortcut(path)
-        return shortcut.TargetPath
+        return {
+            'target': shortcut.TargetPath,
+            'arguments': shortcut.Arguments,
+            'working_dir': shortcut.WorkingDirectory,
+            'icon_location': shortcut.IconLocation,
+        }
     except Exception:
-        return path
+        return None
 
 
 def get_app_name(path):
@@ -0,0 +1,64 @@
+"""冻结/解冻：挂起整组应用的进程树，恢复时无需重新冷启动"""
+import logging
+import psutil
+from .process_utils import get_process_snapshot
+from .process_registry import get_process_registry
+from .close_engine import collect_process_trees
+
+log = logging.getLogger(__name__)
+
+
+def is_process_frozen(proc):
+    """进程是否处于挂起状态（Windows 上所有线程均被挂起时同样报告为 stopped）"""
+    try:
+        return proc.status() == psutil.STATUS_STOPPED
+    except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+        return False
+
+
+def _set_frozen(app_paths, frozen, snapshot):
+    if snapshot is None:
+        snapshot = get_process_snapshot()
+    owners = collect_process_trees(app_paths, snapshot, get_process_registry())
+
+    counts = {path: 0 for path in app_paths}
+    for pid, (path, proc, name) in owners.items():
+        # 已处于目标状态的进程跳过，重复冻结/解冻不会产生副作用
+        if is_process_frozen(proc) == frozen:
+            continue
+        try:
+            if frozen:
+                proc.suspend()
+            else:
+                proc.resume()
+            counts[path] += 1
+        except (psutil.NoSuchProcess, psutil.ZombieProcess):
+            continue
+        except psutil.AccessDenied:
+            log.warning("%s失败 %s (pid=%s): 无权限", '冻结' if frozen else '解冻', name, pid)
+    return counts
+
+
+def freeze_applications(app_paths, snapshot=None):
+    """挂起多个应用的整棵进程树，返回 {应用路径: 挂起的进程数}"""
+    counts = _set_frozen(app_paths, True, snapshot)
+    if any(counts.values()):
+        log.info("冻结 %d 个进程，涉及 %d 个应用", sum(counts.values()), sum(1 for n in counts.values() if n))
+    return counts
+
+
+def thaw_applications(app_paths, snapshot=None):
+    """恢复多个应用的整棵进程树，返回 {应用路径: 恢复的进程数}"""
+    counts = _set_frozen(app_paths, False, snapshot)
+    if any(counts.values()):
+        log.info("解冻 %d 个进程，涉及 %d 个应用", sum(counts.values()), sum(1 for n in counts.values() if n))
+    return counts
+
+
+def is_app_frozen(path, snapshot=None):
+    """应用是否已被冻结（匹配到的进程全部处于挂起状态）"""
+    if snapshot is None:
+        snapshot = get_process_snapshot()
+    owners = collect_process_trees([path], snapshot, get_process_registry())
+    procs = [proc for _path, proc, _name in owners.values()]
+    return bool(procs) and all(is_process_frozen(proc) for proc in procs)
@@ -0,0 +1,157 @@
+"""图标图集：所有卡片图标按渲染尺寸打包在一个文件中，启动时内存映射，按索引直接切片构造图像
+
+- icon_atlas.bin:  固定大小的槽位，每个槽位保存一个图标的预乘 ARGB32 像素
+- icon_atlas.json: 索引 {"size", "apps": {应用路径: {"slot", "key", "width", "height", "stride"}}, "free": [空闲槽位]}
+
+冷启动时每张卡片的图标只是映射内存上的一次切片，不需要逐个打开和解码文件；
+新增应用或来源图标变化（缓存键不同）时只重写对应槽位，删除的应用的槽位留给后续复用。
+只应在主线程使用。
+"""
+import logging
+import os
+import json
+import mmap
+import ctypes
+from PyQt5 import sip
+from PyQt5.QtGui import QImage, QPixmap
+from PyQt5.QtCore import Qt
+from config.constants import ICON_ATLAS_FILE, ICON_ATLAS_INDEX_FILE, ICON_SIZE
+
+log = logging.getLogger(__name__)
+
+ATLAS_VERSION = 1
+
+
+class IconAtlas:
+    """内存映射的图标图集"""
+
+    def __init__(self, file_path=ICON_ATLAS_FILE, index_path=ICON_ATLAS_INDEX_FILE, size=ICON_SIZE):
+        self.file_path = file_path
+        self.index_path = index_path
+        self.size = size
+        self.slot_bytes = size * size * 4
+        self.apps = {}
+        self.free = []
+        self._file = None
+        self._map = None
+        self.load()
+
+    def load(self):
+        """加载索引，版本或图标尺寸不一致时丢弃整个图集"""
+        self.close()
+        self.apps, self.free = {}, []
+        if not os.path.exists(self.index_path):
+            return
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception as e:
+            log.warning("图标图集索引加载失败: %s", e)
+            return
+        if data.get('version') != ATLAS_VERSION or data.get('size') != self.size:
+            return
+        self.apps = data.get('apps', {})
+        self.free = data.get('free', [])
+
+    def save_index(self):
+        data = json.dumps({'version': ATLAS_VERSION, 'size': self.size,
+                           'apps': self.apps, 'free': self.free}, ensure_ascii=False)
+        temp_path = self.index_path + ".tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(temp_path, self.index_path)
+        except OSError as e:
+            log.warning("图标图集索引保存失败: %s", e)
+
+    def _mapping(self):
+        if self._map is None:
+            try:
+                self._file = open(self.file_path, "rb")
+                # 写时复制映射：可以导出可写缓冲区给 ctypes，又不会改动文件
+                self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_COPY)
+            except (OSError, ValueError):  # 文件不存在或为空
+                self.close()
+        return self._map
+
+    def close(self):
+        """解除映射（写入槽位前需要解除）"""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def key(self, path):
+        """图集中应用图标的缓存键，没有记录时返回None"""
+        entry = self.apps.get(path)
+        return entry['key'] if entry else None
+
+    def get_pixmap(self, path):
+        """从映射内存中应用的槽位直接构造像素图，没有记录时返回None"""
+        entry = self.apps.get(path)
+        if entry is None:
+            return None
+        mapping = self._mapping()
+        offset = entry['slot'] * self.slot_bytes
+        length = entry['height'] * entry['stride']
+        if mapping is None or offset + length > len(mapping):
+            return None
+
+        # QImage 直接引用映射内存（零拷贝），QPixmap.fromImage 转换后即释放引用
+        buffer = (ctypes.c_char * length).from_buffer(mapping, offset)
+        try:
+            image = QImage(sip.voidptr(ctypes.addressof(buffer)), entry['width'], entry['height'],
+                           entry['stride'], QImage.Format_ARGB32_Premultiplied)
+            pixmap = QPixmap.fromImage(image)
+            del image
+        finally:
+            del buffer
+        return pixmap
+
+    def _next_slot(self):
+        if self.free:
+            return self.free.pop(0)
+        used = [entry['slot'] for entry in self.apps.values()]
+        return max(used, default=-1) + 1
+
+    def put(self, path, key, image):
+        """写入（或更新）应用的图标，只重写对应槽位"""
+        if image is None or image.isNull():
+            return False
+        if image.width() > self.size or image.height() > self.size:
+            image = image.scaled(self.size, self.size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        image = image.convertToFormat(QImage.Format_ARGB32_Premultiplied)
+        bits = image.constBits()
+        bits.setsize(image.byteCount())
+
+        entry = self.apps.get(path)
+        slot = entry['slot'] if entry else self._next_slot()
+        self.close()
+        try:
+            mode = "r+b" if os.path.exists(self.file_path) else "w+b"
+            with open(self.file_path, mode) as f:
+                f.seek(slot * self.slot_bytes)
+                f.write(bits.asstring())
+        except OSError as e:
+            log.warning("图标图集写入失败: %s", e)
+            if entry is None:
+                self.free.append(slot)
+            return False
+
+        self.apps[path] = {'slot': slot, 'key': key, 'width': image.width(),
+                           'height': image.height(), 'stride': image.bytesPerLine()}
+        self.save_index()
+        return True
+
+    def prune(self, paths):
+        """移除不在 paths 中的应用，槽位留给后续复用"""
+        paths = set(paths)
+        removed = [path for path in self.apps if path not in paths]
+        for path in removed:
+            self.free.append(self.apps.pop(path)['slot'])
+        if removed:
+            self.free.sort()
+            self.save_index()
+        return len(removed)
@@ -0,0 +1,143 @@
+"""磁盘图标缓存：按图标来源文件的 (路径, 大小, 修改时间) 和渲染尺寸保存PNG
+
+缓存文件名为键的哈希，来源文件变化后键随之变化，旧文件由LRU淘汰；
+读取时更新文件修改时间作为最近使用时间，总大小超过上限时删除最久未用的文件。
+使用 QImage 读写，可以在后台线程中调用。
+"""
+import logging
+import os
+import hashlib
+import threading
+from PyQt5.QtGui import QImage
+from config.constants import ICON_CACHE_DIR, ICON_CACHE_MAX_BYTES
+
+log = logging.getLogger(__name__)
+
+
+def _stat_key(path):
+    try:
+        stat = os.stat(path)
+        return (os.path.normcase(os.path.abspath(path)), stat.st_size, stat.st_mtime_ns)
+    except OSError:
+        return None
+
+
+def make_icon_cache_key(sources, size):
+    """由图标来源文件和渲染尺寸生成缓存键，任一来源文件不存在时返回None"""
+    parts = []
+    for source in dict.fromkeys(sources):
+        stat = _stat_key(source)
+        if stat is None:
+            return None
+        parts.append(stat)
+    if not parts:
+        return None
+    return hashlib.sha1(repr((parts, size)).encode('utf-8')).hexdigest()
+
+
+class IconDiskCache:
+    """带大小上限和LRU淘汰的PNG图标缓存目录"""
+
+    def __init__(self, directory=ICON_CACHE_DIR, max_bytes=ICON_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self._total = None  # 首次写入时统计目录大小
+        self.hits = 0
+        self.misses = 0
+
+    def _file(self, key):
+        return os.path.join(self.directory, key + ".png")
+
+    def get(self, key):
+        """读取缓存的图标，未命中时返回None"""
+        if key is None:
+            return None
+        file_path = self._file(key)
+        image = QImage(file_path) if os.path.exists(file_path) else QImage()
+        if image.isNull():
+            self.misses += 1
+            return None
+        self.hits += 1
+        try:
+            os.utime(file_path)  # 记录最近使用时间
+        except OSError:
+            pass
+        return image
+
+    def put(self, key, image):
+        """保存图标（QImage），写入临时文件后替换，避免读到半个文件"""
+        if key is None or image is None or image.isNull():
+            return False
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            file_path = self._file(key)
+            temp_path = f"{file_path}.{threading.get_ident()}.tmp"
+            if not image.save(temp_path, "PNG"):
+                return False
+            os.replace(temp_path, file_path)
+            added = os.path.getsize(file_path)
+        except OSError as e:
+            log.warning("图标缓存写入失败: %s", e)
+            return False
+
+        with self.lock:
+            if self._total is None:
+                self._total = self._scan_size()
+            else:
+                self._total += added
+            if self._total > self.max_bytes:
+                self._evict()
+        return True
+
+    def _scan_size(self):
+        total = 0
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".png"):
+                total += entry.stat().st_size
+        return total
+
+    def _evict(self):
+        """删除最久未用的文件，直到总大小降到上限的 80%"""
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".png"):
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        files.sort()
+        total = sum(size for _, size, _ in files)
+        target = self.max_bytes * 0.8
+        for _, size, file_path in files:
+            if total <= target:
+                break
+            try:
+                os.remove(file_path)
+                total -= size
+            except OSError:
+                pass
+        self._total = total
+
+    def clear(self):
+        """清空缓存目录"""
+        with self.lock:
+            if os.path.isdir(self.directory):
+                for entry in os.scandir(self.directory):
+                    if entry.name.endswith(".png"):
+                        try:
+                            os.remove(entry.path)
+                        except OSError:
+                            pass
+            self._total = 0
+
+
+_icon_cache = None
+_icon_cache_lock = threading.Lock()
+
+
+def get_icon_disk_cache():
+    """获取共享的磁盘图标缓存"""
+    global _icon_cache
+    with _icon_cache_lock:
+        if _icon_cache is None:
+            _icon_cache = IconDiskCache()
+        return _icon_cache
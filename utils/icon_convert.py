@@ -0,0 +1,48 @@
+"""位图数据到 QImage 的内存转换，不经过临时文件和中间编码
+
+与 Win32 截取图标的代码分开，可以在任何平台上用构造的位图数据测试和做基准。
+"""
+from PyQt5.QtGui import QImage
+
+# Windows 位图每像素位数 -> 对应的 QImage 格式（内存中均为 BGR(A) 顺序）
+_BITMAP_FORMATS = {
+    32: QImage.Format_RGB32,   # 小端下内存顺序为 B,G,R,X，与 32 位 DDB/DIB 一致
+    24: QImage.Format_RGB888,  # 内存顺序为 R,G,B，需要再交换红蓝通道
+}
+
+
+def bitmap_stride(width, bits_per_pixel):
+    """Windows 位图每行字节数（按 4 字节对齐）"""
+    return ((width * bits_per_pixel + 31) // 32) * 4
+
+
+def bitmap_bits_to_qimage(bits, width, height, bits_per_pixel=32, stride=None,
+                          bottom_up=False, alpha=False):
+    """把 Windows 位图的原始像素数据（BGR/BGRA）直接构造为 QImage
+
+    bits 为 bytes/bytearray/memoryview；stride 默认按 4 字节对齐计算；
+    bottom_up 表示行按自下而上存储（正高度的 DIB）；alpha 表示 32 位数据带有效的透明通道。
+    返回的 QImage 持有自己的像素副本，不再引用 bits。
+    """
+    if bits_per_pixel not in _BITMAP_FORMATS:
+        raise ValueError(f"不支持的位图格式: {bits_per_pixel} 位")
+    if stride is None:
+        stride = bitmap_stride(width, bits_per_pixel)
+    if len(bits) < stride * height:
+        raise ValueError(f"位图数据不足: 需要 {stride * height} 字节，实际 {len(bits)} 字节")
+
+    image_format = _BITMAP_FORMATS[bits_per_pixel]
+    if bits_per_pixel == 32 and alpha:
+        image_format = QImage.Format_ARGB32
+
+    # 直接在原缓冲区上构造，copy() 得到独立的像素数据后原缓冲区即可释放
+    image = QImage(bytes(bits) if isinstance(bits, memoryview) else bits,
+                   width, height, stride, image_format)
+    # mirrored()/rgbSwapped() 本身返回新图像，都不需要时才显式复制
+    if bottom_up:
+        image = image.mirrored(False, True)
+    if bits_per_pixel == 24:
+        image = image.rgbSwapped()
+    elif not bottom_up:
+        image = image.copy()
+    return image
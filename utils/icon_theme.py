@@ -0,0 +1,327 @@
+"""freedesktop 图标主题查找（Linux）：按 .desktop 文件的 Icon= 和图标主题规范定位图标文件
+
+首次使用时遍历一次主题目录（当前主题及其继承链、hicolor、pixmaps）和 applications 目录，
+建立 图标名 -> 文件 以及 可执行文件名 -> 图标名 的索引并持久化；
+之后每次查找只是字典查询，扫描过的目录的修改时间或当前主题变化时重建索引。
+"""
+import logging
+import os
+import sys
+import json
+import shlex
+import threading
+import configparser
+from config.constants import ICON_THEME_INDEX_FILE
+
+log = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+ICON_EXTENSIONS = ('.png', '.svg', '.xpm')  # 规范规定的优先顺序
+
+
+def _xdg_data_dirs():
+    data_home = os.environ.get('XDG_DATA_HOME') or os.path.expanduser('~/.local/share')
+    data_dirs = os.environ.get('XDG_DATA_DIRS') or '/usr/local/share:/usr/share'
+    return [data_home] + [d for d in data_dirs.split(':') if d]
+
+
+def icon_base_dirs():
+    """图标主题的基础目录，按规范的查找顺序"""
+    return ([os.path.expanduser('~/.icons')] +
+            [os.path.join(d, 'icons') for d in _xdg_data_dirs()])
+
+
+def pixmap_dirs():
+    return [os.path.join(d, 'pixmaps') for d in _xdg_data_dirs()]
+
+
+def application_dirs():
+    return [os.path.join(d, 'applications') for d in _xdg_data_dirs()]
+
+
+def get_icon_theme_name():
+    """当前图标主题名：读取 GTK / KDE 的配置，都没有时为 hicolor"""
+    config_home = os.environ.get('XDG_CONFIG_HOME') or os.path.expanduser('~/.config')
+    candidates = [
+        (os.path.join(config_home, 'gtk-4.0', 'settings.ini'), 'Settings', 'gtk-icon-theme-name'),
+        (os.path.join(config_home, 'gtk-3.0', 'settings.ini'), 'Settings', 'gtk-icon-theme-name'),
+        (os.path.join(config_home, 'kdeglobals'), 'Icons', 'Theme'),
+    ]
+    for file_path, section, key in candidates:
+        parser = _read_ini(file_path)
+        if parser is not None and parser.has_option(section, key):
+            name = parser.get(section, key).strip().strip('"')
+            if name:
+                return name
+    return 'hicolor'
+
+
+def _read_ini(file_path):
+    if not os.path.isfile(file_path):
+        return None
+    parser = configparser.ConfigParser(interpolation=None, strict=False)
+    parser.optionxform = str  # 键区分大小写
+    try:
+        with open(file_path, encoding='utf-8', errors='replace') as f:
+            parser.read_file(f)
+    except (OSError, configparser.Error):
+        return None
+    return parser
+
+
+def read_desktop_entry(file_path):
+    """读取 .desktop 文件的 [Desktop Entry] 段，失败时返回空字典"""
+    parser = _read_ini(file_path)
+    if parser is None or not parser.has_section('Desktop Entry'):
+        return {}
+    return dict(parser.items('Desktop Entry'))
+
+
+def desktop_exec_name(entry):
+    """.desktop 条目启动的可执行文件名（TryExec 或 Exec 的第一个参数）"""
+    command = entry.get('TryExec') or entry.get('Exec') or ''
+    try:
+        argv = shlex.split(command)
+    except ValueError:
+        argv = command.split()
+    # 跳过 env VAR=... 前缀
+    while argv and (argv[0] == 'env' or '=' in argv[0]):
+        argv = argv[1:]
+    return os.path.basename(argv[0]) if argv else None
+
+
+def _theme_info(theme, base_dirs):
+    """读取主题的 index.theme，返回 (子目录信息, 继承的主题)，主题不存在时返回None"""
+    for base in base_dirs:
+        parser = _read_ini(os.path.join(base, theme, 'index.theme'))
+        if parser is None or not parser.has_section('Icon Theme'):
+            continue
+        names = []
+        for key in ('Directories', 'ScaledDirectories'):
+            names += [n for n in parser.get('Icon Theme', key, fallback='').split(',') if n]
+        subdirs = {}
+        for name in dict.fromkeys(names):
+            if not parser.has_section(name):
+                continue
+            get = lambda key, default: parser.get(name, key, fallback=default)  # noqa: E731
+            try:
+                size = int(get('Size', '0'))
+                subdirs[name] = {
+                    'size': size,
+                    'scale': int(get('Scale', '1')),
+                    'type': get('Type', 'Threshold'),
+                    'min': int(get('MinSize', size)),
+                    'max': int(get('MaxSize', size)),
+                    'threshold': int(get('Threshold', '2')),
+                }
+            except ValueError:
+                continue
+        inherits = [t for t in parser.get('Icon Theme', 'Inherits', fallback='').split(',') if t]
+        return subdirs, inherits
+    return None
+
+
+def _theme_chain(theme, base_dirs):
+    """当前主题及其继承链（去重），最后是 hicolor"""
+    chain, queue = [], [theme]
+    while queue:
+        name = queue.pop(0)
+        if name in chain or name == 'hicolor':
+            continue
+        info = _theme_info(name, base_dirs)
+        if info is None:
+            continue
+        chain.append(name)
+        queue.extend(info[1])
+    return chain + ['hicolor']
+
+
+def _dir_mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _scan_icons(directory, dirs):
+    """列出目录中的图标文件 {图标名: 路径}，并记录目录修改时间"""
+    dirs[directory] = _dir_mtime(directory)
+    icons = {}
+    try:
+        entries = list(os.scandir(directory))
+    except OSError:
+        return icons
+    for entry in entries:
+        name, ext = os.path.splitext(entry.name)
+        if ext.lower() in ICON_EXTENSIONS:
+            current = icons.get(name)
+            if current is None or (ICON_EXTENSIONS.index(ext.lower()) <
+                                   ICON_EXTENSIONS.index(os.path.splitext(current)[1].lower())):
+                icons[name] = entry.path
+    return icons
+
+
+def build_icon_theme_index(theme=None):
+    """遍历主题目录和 applications 目录，建立索引"""
+    theme = theme or get_icon_theme_name()
+    base_dirs = icon_base_dirs()
+    dirs = {base: _dir_mtime(base) for base in base_dirs}
+
+    themes = []
+    for name in _theme_chain(theme, base_dirs):
+        info = _theme_info(name, base_dirs)
+        subdirs = info[0] if info else {}
+        icons = {}  # 图标名 -> [[子目录, 路径], ...]
+        for base in base_dirs:
+            theme_dir = os.path.join(base, name)
+            if not os.path.isdir(theme_dir):
+                continue
+            dirs[theme_dir] = _dir_mtime(theme_dir)
+            for subdir in subdirs:
+                for icon_name, path in _scan_icons(os.path.join(theme_dir, subdir), dirs).items():
+                    icons.setdefault(icon_name, []).append([subdir, path])
+        themes.append({'name': name, 'subdirs': subdirs, 'icons': icons})
+
+    pixmaps = {}
+    for directory in pixmap_dirs():
+        for icon_name, path in _scan_icons(directory, dirs).items():
+            pixmaps.setdefault(icon_name, path)
+
+    desktop = {}  # 可执行文件名 -> 图标名
+    for directory in application_dirs():
+        for root, _subdirs, files in os.walk(directory):
+            dirs[root] = _dir_mtime(root)
+            for file_name in files:
+                if not file_name.endswith('.desktop'):
+                    continue
+                entry = read_desktop_entry(os.path.join(root, file_name))
+                exec_name, icon = desktop_exec_name(entry), entry.get('Icon')
+                if exec_name and icon:
+                    desktop.setdefault(exec_name, icon)
+
+    return {'version': INDEX_VERSION, 'theme': theme, 'dirs': dirs,
+            'themes': themes, 'pixmaps': pixmaps, 'desktop': desktop}
+
+
+def _matches_size(subdir, size, scale):
+    if subdir['scale'] != scale:
+        return False
+    if subdir['type'] == 'Fixed':
+        return subdir['size'] == size
+    if subdir['type'] == 'Scalable':
+        return subdir['min'] <= size <= subdir['max']
+    return subdir['size'] - subdir['threshold'] <= size <= subdir['size'] + subdir['threshold']
+
+
+def _size_distance(subdir, size, scale):
+    want = size * scale
+    dscale = subdir['scale']
+    if subdir['type'] == 'Fixed':
+        return abs(subdir['size'] * dscale - want)
+    if subdir['type'] == 'Scalable':
+        low, high = subdir['min'], subdir['max']
+    else:
+        low, high = subdir['size'] - subdir['threshold'], subdir['size'] + subdir['threshold']
+    if want < low * dscale:
+        return low * dscale - want
+    if want > high * dscale:
+        return want - high * dscale
+    return 0
+
+
+class IconThemeIndex:
+    """持久化的图标主题索引"""
+
+    def __init__(self, file_path=ICON_THEME_INDEX_FILE):
+        self.file_path = file_path
+        self.data = None
+        self.lock = threading.Lock()
+
+    def _is_valid(self, data):
+        if data.get('version') != INDEX_VERSION or data.get('theme') != get_icon_theme_name():
+            return False
+        return all(_dir_mtime(path) == mtime for path, mtime in data.get('dirs', {}).items())
+
+    def _ensure(self):
+        if self.data is not None:
+            return self.data
+        data = None
+        if os.path.exists(self.file_path):
+            try:
+                with open(self.file_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except Exception as e:
+                log.warning("图标主题索引加载失败: %s", e)
+        if data is None or not self._is_valid(data):
+            data = build_icon_theme_index()
+            try:
+                with open(self.file_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f, ensure_ascii=False)
+            except OSError as e:
+                log.warning("图标主题索引保存失败: %s", e)
+        self.data = data
+        return data
+
+    def invalidate(self):
+        """丢弃内存中的索引，下次查找时重新校验"""
+        with self.lock:
+            self.data = None
+
+    def lookup(self, name, size, scale=1):
+        """按图标主题规范查找图标文件：先找尺寸匹配的目录，再找尺寸最接近的，最后是 pixmaps"""
+        if os.path.isabs(name):
+            return name if os.path.isfile(name) else None
+        with self.lock:
+            data = self._ensure()
+        for theme in data['themes']:
+            candidates = theme['icons'].get(name)
+            if not candidates:
+                continue
+            best, best_distance = None, None
+            for subdir_name, path in candidates:
+                subdir = theme['subdirs'].get(subdir_name)
+                if subdir is None:
+                    continue
+                if _matches_size(subdir, size, scale):
+                    return path
+                distance = _size_distance(subdir, size, scale)
+                if best_distance is None or distance < best_distance:
+                    best, best_distance = path, distance
+            if best is not None:
+                return best
+        return data['pixmaps'].get(name)
+
+    def desktop_icon(self, exec_name):
+        """可执行文件名对应的 .desktop 图标名"""
+        with self.lock:
+            data = self._ensure()
+        return data['desktop'].get(exec_name)
+
+
+_theme_index = None
+_theme_index_lock = threading.Lock()
+
+
+def get_icon_theme_index():
+    """获取共享的图标主题索引"""
+    global _theme_index
+    with _theme_index_lock:
+        if _theme_index is None:
+            _theme_index = IconThemeIndex()
+        return _theme_index
+
+
+def find_app_icon_file(app_path, size, scale=1):
+    """查找应用的主题图标文件：.desktop 文件用其 Icon=，可执行文件用对应 .desktop 条目的图标或同名图标
+
+    仅在非 Windows 平台查找，找不到时返回None。
+    """
+    if sys.platform == 'win32':
+        return None
+    index = get_icon_theme_index()
+    if app_path.endswith('.desktop'):
+        icon = read_desktop_entry(app_path).get('Icon')
+    else:
+        exec_name = os.path.basename(app_path)
+        icon = index.desktop_icon(exec_name) or exec_name
+    return index.lookup(icon, size, scale) if icon else None
@@ -1,60 +1,67 @@
 """图标处理工具"""
 import os
-import tempfile
-import pythoncom
-from win32com.client import Dispatch
-import win32gui
-import win32ui
-import win32con
-import win32api
-from PIL import Image
-from PyQt5.QtGui import QIcon, QPixmap, QPainter, QPainterPath
+import sys
+import logging
+from PyQt5.QtGui import QImage, QImageReader
 from PyQt5.QtCore import Qt
+from config.constants import ICON_SIZE
+from .file_utils import resolve_lnk, read_lnk
+from .icon_convert import bitmap_bits_to_qimage
+from .icon_cache import get_icon_disk_cache, make_icon_cache_key
+from .icon_theme import find_app_icon_file
+
+if sys.platform == 'win32':
+    import pythoncom
+    import win32gui
+    import win32ui
+    import win32con
+    import win32api
+
+log = logging.getLogger(__name__)
 
 
 def get_icon_from_lnk(path):
     """从快捷方式获取图标路径"""
-    try:
-        shell = Dispatch('WScript.Shell')
-        shortcut = shell.CreateShortcut(path)
-        icon_path = shortcut.IconLocation.split(',')[0]
-        if os.path.exists(icon_path):
-            return icon_path
-    except Exception as e:
-        print(f"[图标提取失败] {e}")
+    shortcut = read_lnk(path)
+    if shortcut is None:
+        return None
+    icon_path = shortcut['icon_location'].rsplit(',', 1)[0]
+    if icon_path and os.path.exists(icon_path):
+        return icon_path
     return None
 
 
-def extract_icon_from_exe(path):
-    """从EXE文件提取图标，使用win32ui的方法"""
+def extract_icon_image_from_exe(path):
+    """从EXE/DLL文件提取图标为 QImage，失败时返回None（不创建QPixmap，可在工作线程调用）
+
+    仅 Windows，其他平台返回None。
+    """
+    if sys.platform != 'win32':
+        return None
+    # 提取图标句柄
+    large, small = win32gui.ExtractIconEx(path, 0)
+    for handle in small:
+        win32gui.DestroyIcon(handle)
+    if not large:
+        log.debug("未提取到图标: %s", path)
+        return None
+
+    hicon = large[0]
+    for other in large[1:]:
+        win32gui.DestroyIcon(other)
+    ico_x = win32api.GetSystemMetrics(win32con.SM_CXICON)
+
+    # 创建设备上下文
+    screen_dc = win32gui.GetDC(0)
+    hdc = win32ui.CreateDCFromHandle(screen_dc)
+    hdc_mem = hdc.CreateCompatibleDC()
+    bmp = win32ui.CreateBitmap()
     try:
-        # 提取图标句柄
-        large, _ = win32gui.ExtractIconEx(path, 0)
-        if not large:
-            print(f"[extract_icon_from_exe] 未提取到图标: {path}")
-            # 尝试QIcon直接加载作为备选
-            icon = QIcon(path)
-            if not icon.isNull():
-                print(f"[extract_icon_from_exe] QIcon直接加载exe成功: {path}")
-                return icon
-            else:
-                print(f"[extract_icon_from_exe] QIcon直接加载exe失败: {path}")
-            # 返回空图标，让get_app_icon函数统一处理默认图标
-            return QIcon()
-
-        hicon = large[0]
-        ico_x = win32api.GetSystemMetrics(win32con.SM_CXICON)
-
-        # 创建设备上下文
-        hdc = win32ui.CreateDCFromHandle(win32gui.GetDC(0))
-        hdc_mem = hdc.CreateCompatibleDC()
-
         # 创建位图
-        bmp = win32ui.CreateBitmap()
         bmp.CreateCompatibleBitmap(hdc, ico_x, ico_x)
         hdc_mem.SelectObject(bmp)
 
-        # 先用白色填充背景（避免黑色背景），然后在PIL中转为透明
+        # 先用白色填充背景（避免黑色背景）
         white_brush = win32gui.CreateSolidBrush(win32api.RGB(255, 255, 255))
         rect = (0, 0, ico_x, ico_x)
         win32gui.FillRect(hdc_mem.GetHandleOutput(), rect, white_brush)
@@ -64,142 +71,102 @@ def extract_icon_from_exe(path):
         win32gui.DrawIconEx(hdc_mem.GetHandleOutput(), 0, 0,
                             hicon, ico_x, ico_x, 0, 0, win32con.DI_NORMAL)
 
-        # 创建临时文件
-        with tempfile.NamedTemporaryFile(suffix='.bmp', delete=False) as temp_bmp:
-            bmp_path = temp_bmp.name
-
-        with tempfile.NamedTemporaryFile(suffix='.ico', delete=False) as temp_ico:
-            ico_path = temp_ico.name
-
-        try:
-            # 保存为BMP并转换为ICO
-            bmp.SaveBitmapFile(hdc_mem, bmp_path)
-            img = Image.open(bmp_path)
-
-            # 保持白色背景，不做透明处理
-            print(f"[图标] 保持白色背景")
-            img.save(ico_path, format='ICO')
-
-            # 创建QIcon
-            icon = QIcon(ico_path)
-
-            # 清理临时文件
-            os.remove(bmp_path)
-            os.remove(ico_path)
-
-            # 销毁图标句柄
-            win32gui.DestroyIcon(hicon)
-
-            print(
-                f"[extract_icon_from_exe] 成功提取图标: {path}, isNull={icon.isNull()}, pixmap.isNull={icon.pixmap(32, 32).isNull()}")
-            return icon
-
-        except Exception as e:
-            # 清理临时文件
-            try:
-                os.remove(bmp_path)
-            except:
-                pass
-            try:
-                os.remove(ico_path)
-            except:
-                pass
-            raise e
-
-    except Exception as e:
-        print(f"[extract_icon_from_exe] 提取失败: {e}, 路径: {path}")
-        # 尝试QIcon直接加载作为备选
-        icon = QIcon(path)
-        if not icon.isNull():
-            print(f"[extract_icon_from_exe] QIcon直接加载exe成功: {path}")
-            return icon
-        else:
-            print(f"[extract_icon_from_exe] QIcon直接加载exe失败: {path}")
-        # 返回空图标，让get_app_icon函数统一处理默认图标
-        return QIcon()
-
-
-def get_app_icon(path):
-    """获取应用图标"""
-    from config.constants import APP_ICON_PATH, ICON_SIZE
-    from .system_utils import create_white_default_icon
-
-    icon = QIcon()
-
+        # 直接读取位图像素构造 QImage，不经过临时文件
+        info = bmp.GetInfo()
+        return bitmap_bits_to_qimage(bmp.GetBitmapBits(True), info['bmWidth'],
+                                     info['bmHeight'], info['bmBitsPixel'],
+                                     info['bmWidthBytes'])
+    finally:
+        win32gui.DeleteObject(bmp.GetHandle())
+        hdc_mem.DeleteDC()
+        win32gui.ReleaseDC(0, screen_dc)
+        win32gui.DestroyIcon(hicon)
+
+
+def get_icon_sources(path, size=ICON_SIZE):
+    """图标的来源文件：应用文件本身，快捷方式还包括其图标文件或目标exe，Linux 上还包括主题图标文件"""
+    sources = [path]
+    theme_file = find_app_icon_file(path, size)
+    if theme_file:
+        sources.append(theme_file)
     if path.endswith(".lnk"):
-        from .file_utils import resolve_lnk
-        resolved_path = resolve_lnk(path)
         icon_path = get_icon_from_lnk(path)
         if icon_path and os.path.exists(icon_path):
-            if icon_path.lower().endswith('.ico'):
-                icon = QIcon(icon_path)
-                print(
-                    f"[图标] 使用.lnk的IconLocation(ico): {icon_path}, isNull={icon.isNull()}, pixmap.isNull={icon.pixmap(ICON_SIZE, ICON_SIZE).isNull()}")
-            else:
-                icon = extract_icon_from_exe(icon_path)
-                print(
-                    f"[图标] 使用.lnk的IconLocation(exe/dll): {icon_path}, isNull={icon.isNull()}, pixmap.isNull={icon.pixmap(ICON_SIZE, ICON_SIZE).isNull()}")
-        elif resolved_path and os.path.exists(resolved_path) and resolved_path.lower().endswith('.exe'):
-            icon = extract_icon_from_exe(resolved_path)
-            print(
-                f"[图标] 使用.lnk目标exe: {resolved_path}, isNull={icon.isNull()}, pixmap.isNull={icon.pixmap(ICON_SIZE, ICON_SIZE).isNull()}")
-        else:
-            print(
-                f"[图标] .lnk无有效图标，路径: {path}，目标: {resolved_path}，IconLocation: {icon_path}")
-    elif os.path.exists(path):
-        icon = extract_icon_from_exe(path)
-
-    # 检查图标是否有效，如果无效则使用白色背景的默认图标
-    if icon.isNull() or icon.pixmap(ICON_SIZE, ICON_SIZE).isNull():
-        print(
-            f"[图标] icon无效，尝试QIcon({path})兜底: isNull={icon.isNull()}, pixmap.isNull={icon.pixmap(ICON_SIZE, ICON_SIZE).isNull()}")
-        fallback_icon = QIcon(path)
-        if not fallback_icon.isNull() and not fallback_icon.pixmap(ICON_SIZE, ICON_SIZE).isNull():
-            icon = QIcon(path)
-            print(f"[图标] QIcon({path})兜底成功")
+            sources.append(icon_path)
         else:
-            print(
-                f"[图标] QIcon({path})兜底失败，使用白色背景默认图标，尺寸: {ICON_SIZE}x{ICON_SIZE}")
-            # 使用白色背景的默认图标，使用实际需要的尺寸
-            if os.path.exists(APP_ICON_PATH):
-                icon = QIcon(APP_ICON_PATH)
-            else:
-                icon = create_white_default_icon(ICON_SIZE)
-
-    return icon
+            resolved_path = resolve_lnk(path)
+            if resolved_path and os.path.exists(resolved_path):
+                sources.append(resolved_path)
+    return sources
 
 
-def create_rounded_icon(icon, size, radius=8):
-    """创建圆角图标（修复所有角都是圆角）"""
-    if icon.isNull():
-        return icon
+def read_icon_image(file_path, size):
+    """读取图标文件为 QImage，矢量图（svg）直接按目标尺寸渲染"""
+    reader = QImageReader(file_path)
+    if file_path.lower().endswith('.svg'):
+        reader.setScaledSize(reader.size().scaled(size, size, Qt.KeepAspectRatio))
+    return reader.read()
 
-    # 获取原始像素图
-    pixmap = icon.pixmap(size, size)
-    if pixmap.isNull():
-        return icon
 
-    # 创建圆角像素图
-    rounded_pixmap = QPixmap(size, size)
-    rounded_pixmap.fill(Qt.transparent)
+def extract_app_icon_image(path, size=ICON_SIZE):
+    """从应用文件提取图标为 QImage，失败时返回None
 
-    painter = QPainter(rounded_pixmap)
-    painter.setRenderHint(QPainter.Antialiasing)
-    painter.setRenderHint(QPainter.SmoothPixmapTransform)
-
-    # 使用更精确的方法创建圆角路径
-    from PyQt5.QtCore import QRectF
-    rect = QRectF(0, 0, size, size)
-    path = QPainterPath()
-    path.addRoundedRect(rect, radius, radius, Qt.AbsoluteSize)
-
-    # 设置裁剪区域为圆角
-    painter.setClipPath(path)
-
-    # 绘制原始图标
-    painter.drawPixmap(0, 0, size, size, pixmap)
-
-    painter.end()
-
-    print(f"[图标] 创建圆角图标，尺寸: {size}x{size}, 圆角: {radius}px")
-    return QIcon(rounded_pixmap)
+    来源顺序：图标主题文件、快捷方式的图标位置或目标exe、exe本身，最后把文件本身当作图片读取。
+    """
+    image = None
+    try:
+        theme_file = find_app_icon_file(path, size)
+        if theme_file:
+            image = read_icon_image(theme_file, size)
+        elif path.endswith(".lnk"):
+            icon_path = get_icon_from_lnk(path)
+            if icon_path and os.path.exists(icon_path):
+                if icon_path.lower().endswith('.ico'):
+                    image = QImage(icon_path)
+                else:
+                    image = extract_icon_image_from_exe(icon_path)
+            else:
+                resolved_path = resolve_lnk(path)
+                if resolved_path and os.path.exists(resolved_path) and resolved_path.lower().endswith('.exe'):
+                    image = extract_icon_image_from_exe(resolved_path)
+        elif os.path.exists(path):
+            image = extract_icon_image_from_exe(path)
+    except Exception as e:
+        log.warning("提取图标失败: %s, 路径: %s", e, path)
+        image = None
+
+    if image is None or image.isNull():
+        image = QImage(path)  # 图片/ico 文件本身
+        if image.isNull():
+            return None
+    if image.width() > size or image.height() > size:
+        image = image.scaled(size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+    return image
+
+
+def load_app_icon_image(path, size=ICON_SIZE, known_key=None):
+    """加载应用图标为 QImage，返回 (图像, 缓存键)，优先使用磁盘缓存，提取失败时图像为None
+
+    缓存键与 known_key 相同（来源图标未变化）时不加载，图像为None。
+    只使用 QImage 和 Win32 调用，不创建 QPixmap/QIcon，可在工作线程中调用。
+    """
+    if sys.platform != 'win32':
+        return _load_app_icon_image(path, size, known_key)
+    pythoncom.CoInitialize()  # 快捷方式解析失败时回退到 COM，每个线程需要单独初始化
+    try:
+        return _load_app_icon_image(path, size, known_key)
+    finally:
+        pythoncom.CoUninitialize()
+
+
+def _load_app_icon_image(path, size, known_key):
+    key = make_icon_cache_key(get_icon_sources(path, size), size)
+    if known_key is not None and key == known_key:
+        return None, key
+    cache = get_icon_disk_cache()
+    image = cache.get(key)
+    if image is None:
+        image = extract_app_icon_image(path, size)
+        if image is not None:
+            cache.put(key, image)
+    return image, key
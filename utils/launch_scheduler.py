@@ -0,0 +1,106 @@
+"""依赖感知的组启动调度：按 after 依赖关系并发启动，限制并发数"""
+import logging
+import os
+from .file_utils import get_app_name
+
+log = logging.getLogger(__name__)
+
+
+class DependencyError(ValueError):
+    """组内应用的依赖关系存在循环"""
+
+
+def resolve_dependencies(apps):
+    """解析应用的 after 依赖，返回 {应用路径: {依赖的应用路径}}
+
+    after 中可以写组内其他应用的完整路径或应用名，不区分大小写；
+    不在本次启动范围内（不存在或未启用）的依赖会被忽略。
+    """
+    lookup = {}
+    for app in apps:
+        path = app['path']
+        lookup[os.path.normcase(path)] = path
+        name = get_app_name(path).lower()
+        lookup.setdefault(name, path)
+        lookup.setdefault(os.path.splitext(name)[0], path)
+
+    dependencies = {}
+    for app in apps:
+        after = app.get('after') or []
+        if isinstance(after, str):
+            after = [after]
+        deps = set()
+        for ref in after:
+            dep = lookup.get(os.path.normcase(ref)) or lookup.get(ref.lower())
+            if dep is None:
+                log.info("忽略依赖: %s 依赖的 %s 不在本次启动范围内", app['path'], ref)
+            elif dep != app['path']:
+                deps.add(dep)
+        dependencies[app['path']] = deps
+    return dependencies
+
+
+def topological_levels(dependencies):
+    """按依赖关系分层：每一层只依赖之前的层，存在循环时抛出 DependencyError"""
+    remaining = {path: set(deps) for path, deps in dependencies.items()}
+    levels = []
+    while remaining:
+        level = [path for path, deps in remaining.items() if not deps]
+        if not level:
+            raise DependencyError(f"依赖关系存在循环: {', '.join(sorted(remaining))}")
+        levels.append(level)
+        for path in level:
+            del remaining[path]
+        for deps in remaining.values():
+            deps.difference_update(level)
+    return levels
+
+
+class LaunchScheduler:
+    """启动调度状态：依赖全部完成的应用才可启动，同时进行的启动数不超过 max_parallel"""
+
+    def __init__(self, dependencies, max_parallel=0):
+        topological_levels(dependencies)  # 提前检查循环依赖
+        self.dependencies = {path: set(deps)
+                             for path, deps in dependencies.items()}
+        self.max_parallel = max_parallel or 0  # 0 表示不限制
+        self.pending = list(dependencies)  # 保持配置中的顺序
+        self.in_flight = set()
+        self.succeeded = set()
+        self.failed = set()
+        self.blocked = set()
+
+    def next_ready(self):
+        """取出当前可以启动的应用（标记为进行中）"""
+        ready = []
+        for path in list(self.pending):
+            if self.max_parallel and len(self.in_flight) >= self.max_parallel:
+                break
+            if self.dependencies[path] <= self.succeeded:
+                self.pending.remove(path)
+                self.in_flight.add(path)
+                ready.append(path)
+        return ready
+
+    def mark_done(self, path, success):
+        """记录应用启动结果，返回因依赖失败而无法启动的应用"""
+        self.in_flight.discard(path)
+        if success:
+            self.succeeded.add(path)
+            return []
+
+        self.failed.add(path)
+        newly_blocked = []
+        changed = True
+        while changed:
+            changed = False
+            for pending in list(self.pending):
+                if self.dependencies[pending] & (self.failed | self.blocked):
+                    self.pending.remove(pending)
+                    self.blocked.add(pending)
+                    newly_blocked.append(pending)
+                    changed = True
+        return newly_blocked
+
+    def is_finished(self):
+        return not self.pending and not self.in_flight
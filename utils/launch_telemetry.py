@@ -0,0 +1,254 @@
+"""启动耗时统计：每次启动按阶段计时，按应用保存滚动样本并计算分位数
+
+阶段（均从开始创建进程起计时，单位秒）：
+- spawn:  创建进程调用本身的耗时
+- alive:  应用开始稳定存活（持续 TELEMETRY_ALIVE_MS 毫秒）的时刻，启动器类程序按真正的主进程计
+- ready:  就绪检测通过（仅配置了就绪检测的启动）
+- window: 出现第一个可见窗口（仅 Windows）
+"""
+import logging
+import os
+import csv
+import sys
+import json
+import time
+import threading
+import numpy as np
+import psutil
+from config.constants import (LAUNCH_TELEMETRY_FILE, TELEMETRY_HISTORY, TELEMETRY_ALIVE_MS,
+                              TELEMETRY_FOLLOW_TIMEOUT, TELEMETRY_POLL_INTERVAL)
+from .process_utils import get_process_snapshot
+
+log = logging.getLogger(__name__)
+
+PHASE_SPAWN = "spawn"
+PHASE_ALIVE = "alive"
+PHASE_READY = "ready"
+PHASE_WINDOW = "window"
+PHASES = (PHASE_SPAWN, PHASE_ALIVE, PHASE_READY, PHASE_WINDOW)
+
+# 直方图分桶（秒），按对数间隔覆盖 10 毫秒到 2 分钟
+HISTOGRAM_EDGES = (0, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 20, 30, 60, 120, float('inf'))
+
+
+class LaunchTimer:
+    """单次启动的计时器，可由启动线程和跟进线程分别打点"""
+
+    def __init__(self, path, parts=1):
+        self.path = path
+        self.started = time.perf_counter()
+        self.timings = {}
+        self._parts = parts  # 全部部分完成后才写入统计
+        self._lock = threading.Lock()
+
+    def mark(self, phase):
+        """记录阶段耗时（同一阶段只记第一次）"""
+        with self._lock:
+            self.timings.setdefault(phase, time.perf_counter() - self.started)
+
+    def set(self, phase, seconds):
+        with self._lock:
+            self.timings.setdefault(phase, seconds)
+
+    def part_done(self):
+        """一个部分（启动流程或跟进检测）结束，最后一部分结束时写入统计"""
+        with self._lock:
+            self._parts -= 1
+            done = self._parts == 0
+        if done and self.timings:
+            get_launch_telemetry().record(self.path, dict(self.timings))
+
+
+class LaunchTelemetry:
+    """持久化的启动耗时样本：{"apps": {应用路径: {阶段: [秒]}}, "groups": {组名: [秒]}}"""
+
+    def __init__(self, file_path=LAUNCH_TELEMETRY_FILE):
+        self.file_path = file_path
+        self.apps = {}
+        self.groups = {}
+        self.lock = threading.RLock()
+
+    def load(self):
+        with self.lock:
+            self.apps, self.groups = {}, {}
+            if not os.path.exists(self.file_path):
+                return
+            try:
+                with open(self.file_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                self.apps = data.get('apps', {})
+                self.groups = data.get('groups', {})
+            except Exception as e:
+                log.warning("启动耗时记录加载失败: %s", e)
+
+    def save(self):
+        """写入临时文件后替换，多个跟进线程同时保存时串行进行"""
+        with self.lock:
+            data = json.dumps({'apps': self.apps, 'groups': self.groups},
+                              indent=2, ensure_ascii=False)
+            temp_path = self.file_path + ".tmp"
+            try:
+                with open(temp_path, "w", encoding="utf-8") as f:
+                    f.write(data)
+                os.replace(temp_path, self.file_path)
+            except OSError as e:
+                log.warning("启动耗时记录保存失败: %s", e)
+
+    @staticmethod
+    def _append(samples, seconds):
+        samples.append(round(seconds, 4))
+        del samples[:-TELEMETRY_HISTORY]
+
+    def record(self, path, timings):
+        """记录一次应用启动的各阶段耗时"""
+        with self.lock:
+            phases = self.apps.setdefault(path, {})
+            for phase, seconds in timings.items():
+                self._append(phases.setdefault(phase, []), seconds)
+        self.save()
+
+    def record_group(self, name, seconds):
+        """记录一次整组启动的耗时"""
+        with self.lock:
+            self._append(self.groups.setdefault(name, []), seconds)
+        self.save()
+
+    def samples(self, path, phase):
+        with self.lock:
+            return list(self.apps.get(path, {}).get(phase, []))
+
+    def percentiles(self, path, phase, q=(50, 95)):
+        """阶段耗时的分位数，没有样本时返回None"""
+        samples = self.samples(path, phase)
+        if not samples:
+            return None
+        return tuple(float(v) for v in np.percentile(samples, q))
+
+    def histogram(self, path, phase):
+        """阶段耗时直方图，返回 (分桶边界, 各桶次数)"""
+        counts, _ = np.histogram(self.samples(path, phase), bins=HISTOGRAM_EDGES)
+        return HISTOGRAM_EDGES, counts.tolist()
+
+    def startup_percentiles(self, path):
+        """应用启动耗时 (p50, p95)：依次使用就绪、首个窗口、稳定存活耗时，都没有时用创建进程耗时"""
+        for phase in (PHASE_READY, PHASE_WINDOW, PHASE_ALIVE, PHASE_SPAWN):
+            result = self.percentiles(path, phase)
+            if result is not None:
+                return result
+        return None
+
+    def export_csv(self, file_path):
+        """导出各应用各阶段和各组的耗时统计"""
+        with self.lock:
+            apps = {path: dict(phases) for path, phases in self.apps.items()}
+            groups = dict(self.groups)
+
+        rows = []
+        for path, phases in apps.items():
+            for phase in PHASES:
+                if phases.get(phase):
+                    rows.append(('app', path, phase, phases[phase]))
+        for name, samples in groups.items():
+            if samples:
+                rows.append(('group', name, 'total', samples))
+
+        with open(file_path, "w", encoding="utf-8-sig", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(['type', 'name', 'phase', 'count', 'p50', 'p95', 'mean', 'max',
+                             'histogram'])
+            for kind, name, phase, samples in rows:
+                p50, p95 = np.percentile(samples, (50, 95))
+                counts, _ = np.histogram(samples, bins=HISTOGRAM_EDGES)
+                writer.writerow([kind, name, phase, len(samples), f"{p50:.4f}", f"{p95:.4f}",
+                                 f"{np.mean(samples):.4f}", f"{np.max(samples):.4f}",
+                                 " ".join(str(c) for c in counts)])
+        return len(rows)
+
+
+_telemetry = None
+_telemetry_lock = threading.Lock()
+
+
+def get_launch_telemetry():
+    """获取共享的启动耗时记录，首次调用时从磁盘加载"""
+    global _telemetry
+    with _telemetry_lock:
+        if _telemetry is None:
+            _telemetry = LaunchTelemetry()
+            _telemetry.load()
+        return _telemetry
+
+
+def _process_tree_pids(pid):
+    try:
+        root = psutil.Process(pid)
+        if root.status() == psutil.STATUS_ZOMBIE:
+            return set()
+        return {pid} | {child.pid for child in root.children(recursive=True)}
+    except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+        return set()
+
+
+def has_visible_window(pids):
+    """进程中是否有可见的顶层窗口（仅 Windows，其他平台返回False）"""
+    if sys.platform != 'win32' or not pids:
+        return False
+    import win32gui
+    import win32process
+    found = []
+
+    def callback(hwnd, _):
+        if win32gui.IsWindowVisible(hwnd) and win32gui.GetWindowText(hwnd):
+            _, pid = win32process.GetWindowThreadProcessId(hwnd)
+            if pid in pids:
+                found.append(hwnd)
+                return False
+        return True
+
+    try:
+        win32gui.EnumWindows(callback, None)
+    except Exception:
+        pass  # 回调返回 False 终止枚举时会抛出异常
+    return bool(found)
+
+
+def start_follow_launch(timer, pid, cancelled=None):
+    """在独立的守护线程中跟进启动（跟进可能持续较久，不占用共享线程池）"""
+    thread = threading.Thread(target=follow_launch, args=(timer, pid, cancelled),
+                              name="aprogram-launch-follow", daemon=True)
+    thread.start()
+    return thread
+
+
+def follow_launch(timer, pid, cancelled=None):
+    """在后台跟进刚启动的应用，记录稳定存活和首个窗口出现的时间
+
+    应在后台线程中调用，最多持续 TELEMETRY_FOLLOW_TIMEOUT 秒，结束后调用 timer.part_done()。
+    """
+    try:
+        alive_since = None
+        want_window = sys.platform == 'win32'
+        deadline = timer.started + TELEMETRY_FOLLOW_TIMEOUT
+        while time.perf_counter() < deadline:
+            if cancelled is not None and cancelled.is_set():
+                break
+            now = time.perf_counter()
+            pids = _process_tree_pids(pid)
+            alive = bool(pids) or get_process_snapshot().is_running(timer.path)
+            if not alive:
+                alive_since = None
+            elif alive_since is None:
+                alive_since = now
+            if (alive_since is not None and PHASE_ALIVE not in timer.timings
+                    and now - alive_since >= TELEMETRY_ALIVE_MS / 1000.0):
+                timer.set(PHASE_ALIVE, alive_since - timer.started)
+
+            if want_window and has_visible_window(pids):
+                timer.mark(PHASE_WINDOW)
+                want_window = False
+
+            if PHASE_ALIVE in timer.timings and not want_window:
+                break
+            time.sleep(TELEMETRY_POLL_INTERVAL)
+    finally:
+        timer.part_done()
@@ -0,0 +1,255 @@
+"""快捷方式（.lnk，MS-SHLLINK 格式）解析：直接读取文件，不使用 COM，任何平台均可运行
+
+读取目标路径、参数、工作目录和图标位置，结果按 (路径, 修改时间, 大小) 缓存。
+目标路径依次取自：环境变量数据块（含 %VAR% 的路径）、LinkInfo 中的本地/网络路径、
+目标 ID 列表中的盘符和文件名（优先取 BEEF0004 扩展块中的长文件名）、相对路径。
+"""
+import logging
+import os
+import re
+import struct
+import threading
+
+log = logging.getLogger(__name__)
+
+LINK_CLSID = bytes.fromhex("0114020000000000c000000000000046")
+
+# LinkFlags
+HAS_TARGET_ID_LIST = 0x00000001
+HAS_LINK_INFO = 0x00000002
+HAS_NAME = 0x00000004
+HAS_RELATIVE_PATH = 0x00000008
+HAS_WORKING_DIR = 0x00000010
+HAS_ARGUMENTS = 0x00000020
+HAS_ICON_LOCATION = 0x00000040
+IS_UNICODE = 0x00000080
+FORCE_NO_LINK_INFO = 0x00000100
+HAS_EXP_STRING = 0x00000200
+HAS_EXP_ICON = 0x00004000
+
+# LinkInfoFlags
+VOLUME_ID_AND_LOCAL_BASE_PATH = 0x1
+COMMON_NETWORK_RELATIVE_LINK_AND_PATH_SUFFIX = 0x2
+
+# ExtraData 数据块签名
+ENVIRONMENT_VARIABLE_BLOCK = 0xA0000001
+ICON_ENVIRONMENT_BLOCK = 0xA0000007
+
+# 文件项（shell item）中保存长文件名的扩展块签名
+FILE_ENTRY_EXTENSION = b"\x04\x00\xef\xbe"  # 0xBEEF0004
+
+# 非 Unicode 字符串使用系统代码页
+ANSI_ENCODING = 'mbcs' if os.name == 'nt' else 'cp1252'
+
+
+class LnkFormatError(ValueError):
+    """文件不是有效的快捷方式"""
+
+
+def _read_cstring(data, offset, unicode=False):
+    """读取以 NUL 结尾的字符串"""
+    if unicode:
+        end = offset
+        while end + 1 < len(data) and data[end:end + 2] != b"\0\0":
+            end += 2
+        return data[offset:end].decode('utf-16-le', errors='replace')
+    end = data.find(b"\0", offset)
+    if end < 0:
+        end = len(data)
+    return data[offset:end].decode(ANSI_ENCODING, errors='replace')
+
+
+def _expand_env(value):
+    """展开 %VAR% 形式的环境变量，未定义的变量保持原样"""
+    return re.sub(r"%([^%]+)%", lambda m: os.environ.get(m.group(1), m.group(0)), value)
+
+
+def _extension_long_name(item, start):
+    """从文件项的 BEEF0004 扩展块读取长文件名，没有扩展块时返回None"""
+    index = item.find(FILE_ENTRY_EXTENSION, start + 4)
+    if index < 0:
+        return None
+    block = index - 4
+    size, version = struct.unpack_from("<HH", item, block)
+    if size < 20 or block + size > len(item):
+        return None
+    # 长文件名之前的字段随扩展块版本增加
+    offset = block + 18
+    if version >= 7:
+        offset += 18  # 空字段、NTFS 文件引用、未知字段
+    if version >= 3:
+        offset += 2   # 本地化名称长度
+    if version >= 9:
+        offset += 4
+    if version >= 8:
+        offset += 4
+    if offset >= block + size:
+        return None
+    return _read_cstring(item[:block + size], offset, unicode=True) or None
+
+
+def _file_entry_name(item):
+    """文件项的名称：优先使用扩展块中的长文件名，否则为主名称（通常是 8.3 短文件名）"""
+    short_name = _read_cstring(item, 14, unicode=bool(item[2] & 0x04))
+    return _extension_long_name(item, 14) or short_name
+
+
+def _parse_id_list(data):
+    """从目标 ID 列表中还原文件系统路径（盘符项 + 文件项的文件名），无法还原时返回空串"""
+    parts = []
+    offset = 0
+    while offset + 2 <= len(data):
+        (size,) = struct.unpack_from("<H", data, offset)
+        if size == 0:
+            break
+        item = data[offset:offset + size]
+        offset += size
+        if len(item) < 3:
+            continue
+        kind = item[2] & 0x70
+        if kind == 0x20:  # 卷（盘符）
+            parts = [_read_cstring(item, 3).rstrip("\\")]
+        elif kind == 0x30 and parts and len(item) > 14:  # 文件或文件夹
+            parts.append(_file_entry_name(item))
+    if not parts or not parts[0]:
+        return ""
+    return "\\".join(parts) if len(parts) > 1 else parts[0] + "\\"
+
+
+def _parse_link_info(data):
+    """从 LinkInfo 结构读取目标路径"""
+    if len(data) < 28:
+        return ""
+    (header_size, flags, _volume_id, local_base, network, suffix) = struct.unpack_from(
+        "<6I", data, 4)
+    local_base_unicode = suffix_unicode = None
+    if header_size >= 0x24 and len(data) >= 36:
+        local_base_unicode, suffix_unicode = struct.unpack_from("<2I", data, 28)
+
+    if suffix_unicode:
+        path_suffix = _read_cstring(data, suffix_unicode, unicode=True)
+    else:
+        path_suffix = _read_cstring(data, suffix) if suffix else ""
+
+    if flags & VOLUME_ID_AND_LOCAL_BASE_PATH:
+        if local_base_unicode:
+            base = _read_cstring(data, local_base_unicode, unicode=True)
+        else:
+            base = _read_cstring(data, local_base)
+        return base + path_suffix
+
+    if flags & COMMON_NETWORK_RELATIVE_LINK_AND_PATH_SUFFIX and network + 20 <= len(data):
+        (net_name_offset,) = struct.unpack_from("<I", data, network + 8)
+        if net_name_offset > 0x14 and network + 28 <= len(data):
+            (net_name_unicode,) = struct.unpack_from("<I", data, network + 20)
+            net_name = _read_cstring(data, network + net_name_unicode, unicode=True)
+        else:
+            net_name = _read_cstring(data, network + net_name_offset)
+        if path_suffix:
+            return net_name.rstrip("\\") + "\\" + path_suffix
+        return net_name
+    return ""
+
+
+def _parse_extra_data(data, offset):
+    """读取 ExtraData 中的环境变量数据块，返回 {签名: 路径}"""
+    blocks = {}
+    while offset + 8 <= len(data):
+        size, signature = struct.unpack_from("<II", data, offset)
+        if size < 8 or offset + size > len(data):
+            break
+        if signature in (ENVIRONMENT_VARIABLE_BLOCK, ICON_ENVIRONMENT_BLOCK) and size >= 788:
+            value = _read_cstring(data, offset + 268, unicode=True) or \
+                _read_cstring(data, offset + 8)
+            blocks[signature] = value
+        offset += size
+    return blocks
+
+
+def parse_lnk_bytes(data, lnk_path=None):
+    """解析快捷方式内容，返回 {target, arguments, working_dir, icon_location, name, relative_path}
+
+    icon_location 与 WScript.Shell 的 IconLocation 格式相同（"路径,序号"）。
+    """
+    if len(data) < 76 or struct.unpack_from("<I", data, 0)[0] != 0x4C or data[4:20] != LINK_CLSID:
+        raise LnkFormatError("不是有效的快捷方式文件")
+    (flags,) = struct.unpack_from("<I", data, 20)
+    (icon_index,) = struct.unpack_from("<i", data, 56)
+    offset = 76
+
+    target = ""
+    if flags & HAS_TARGET_ID_LIST:
+        (id_list_size,) = struct.unpack_from("<H", data, offset)
+        target = _parse_id_list(data[offset + 2:offset + 2 + id_list_size])
+        offset += 2 + id_list_size
+
+    if flags & HAS_LINK_INFO and not flags & FORCE_NO_LINK_INFO:
+        (link_info_size,) = struct.unpack_from("<I", data, offset)
+        target = _parse_link_info(data[offset:offset + link_info_size]) or target
+        offset += link_info_size
+    elif flags & HAS_LINK_INFO:
+        (link_info_size,) = struct.unpack_from("<I", data, offset)
+        offset += link_info_size
+
+    unicode = bool(flags & IS_UNICODE)
+    strings = {}
+    for flag, key in ((HAS_NAME, 'name'), (HAS_RELATIVE_PATH, 'relative_path'),
+                      (HAS_WORKING_DIR, 'working_dir'), (HAS_ARGUMENTS, 'arguments'),
+                      (HAS_ICON_LOCATION, 'icon_location')):
+        if not flags & flag:
+            continue
+        if offset + 2 > len(data):
+            raise LnkFormatError("快捷方式字符串数据不完整")
+        (count,) = struct.unpack_from("<H", data, offset)
+        offset += 2
+        length = count * 2 if unicode else count
+        raw = data[offset:offset + length]
+        strings[key] = raw.decode('utf-16-le' if unicode else ANSI_ENCODING, errors='replace')
+        offset += length
+
+    blocks = _parse_extra_data(data, offset)
+    if flags & HAS_EXP_STRING and blocks.get(ENVIRONMENT_VARIABLE_BLOCK):
+        target = _expand_env(blocks[ENVIRONMENT_VARIABLE_BLOCK])
+    relative_path = strings.get('relative_path', "")
+    if not target and relative_path and lnk_path:
+        target = os.path.normpath(os.path.join(os.path.dirname(lnk_path),
+                                               relative_path.replace("\\", os.sep)))
+
+    icon_path = strings.get('icon_location', "")
+    if flags & HAS_EXP_ICON and blocks.get(ICON_ENVIRONMENT_BLOCK):
+        icon_path = blocks[ICON_ENVIRONMENT_BLOCK]
+
+    return {
+        'target': target,
+        'arguments': strings.get('arguments', ""),
+        'working_dir': _expand_env(strings.get('working_dir', "")),
+        'icon_location': f"{_expand_env(icon_path)},{icon_index}",
+        'name': strings.get('name', ""),
+        'relative_path': relative_path,
+    }
+
+
+_lnk_cache = {}  # path -> ((mtime_ns, size), 解析结果或None)
+_lnk_cache_lock = threading.Lock()
+
+
+def parse_lnk(path):
+    """解析快捷方式文件，按 (路径, 修改时间, 大小) 缓存，文件无效或无法读取时返回None"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cached = _lnk_cache.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    try:
+        with open(path, "rb") as f:
+            info = parse_lnk_bytes(f.read(), path)
+    except (OSError, LnkFormatError, struct.error) as e:
+        log.warning("快捷方式解析失败 %s: %s", path, e)
+        info = None
+    with _lnk_cache_lock:
+        _lnk_cache[path] = (stamp, info)
+    return info
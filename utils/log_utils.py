@@ -0,0 +1,72 @@
+"""日志：分级输出到内存环形缓冲、滚动日志文件和控制台
+
+各模块使用 log = logging.getLogger(__name__)，消息用 %-格式参数（log.debug("... %s", x)），
+只有级别启用时才会格式化；构造调试信息本身有开销时先用 log.isEnabledFor(logging.DEBUG) 判断。
+"""
+import sys
+import logging
+import logging.handlers
+from collections import deque
+from config.constants import LOG_FILE, LOG_MAX_BYTES, LOG_BACKUP_COUNT, LOG_BUFFER_SIZE
+
+LOG_FORMAT = "%(asctime)s %(levelname)s [%(name)s] %(message)s"
+LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR")
+
+
+class RingBufferHandler(logging.Handler):
+    """在内存中保留最近的日志行（有界），供查看或导出"""
+
+    def __init__(self, capacity=LOG_BUFFER_SIZE):
+        super().__init__()
+        self.records = deque(maxlen=capacity)
+
+    def emit(self, record):
+        try:
+            self.records.append(self.format(record))
+        except Exception:
+            self.handleError(record)
+
+    def lines(self):
+        return list(self.records)
+
+    def clear(self):
+        self.records.clear()
+
+
+_buffer_handler = None
+
+
+def setup_logging(level="INFO", file_path=LOG_FILE):
+    """配置根记录器（可重复调用，只更新级别）"""
+    global _buffer_handler
+    root = logging.getLogger()
+    if _buffer_handler is None:
+        formatter = logging.Formatter(LOG_FORMAT)
+        _buffer_handler = RingBufferHandler()
+        handlers = [_buffer_handler]
+        file_error = None
+        try:
+            handlers.append(logging.handlers.RotatingFileHandler(
+                file_path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT,
+                encoding="utf-8", delay=True))
+        except OSError as e:
+            file_error = e  # 只保留内存缓冲（和控制台）
+        if sys.stderr is not None:  # 无控制台（pythonw）时不输出到控制台
+            handlers.append(logging.StreamHandler())
+        for handler in handlers:
+            handler.setFormatter(formatter)
+            root.addHandler(handler)
+        if file_error is not None:
+            logging.getLogger(__name__).warning("日志文件不可用: %s", file_error)
+    set_log_level(level)
+    return _buffer_handler
+
+
+def set_log_level(level):
+    """设置日志级别（"DEBUG"/"INFO"/"WARNING"/"ERROR"）"""
+    logging.getLogger().setLevel(level if level in LOG_LEVELS else "INFO")
+
+
+def get_log_lines():
+    """内存环形缓冲中最近的日志行"""
+    return _buffer_handler.lines() if _buffer_handler is not None else []
@@ -0,0 +1,136 @@
+"""内存中的卡片图标缓存：按 (图标内容哈希, 尺寸, 圆角, 设备像素比) 共享已绘制好的圆角图标
+
+内容相同的图标（多个指向同一exe的快捷方式、所有默认图标）只绘制一次、只占一份内存；
+总占用超过上限时按最近最少使用淘汰。QPixmap 只能在主线程使用，本缓存也只应在主线程调用。
+"""
+import hashlib
+from collections import OrderedDict
+from PyQt5.QtGui import QGuiApplication, QImage, QPainter, QPainterPath, QPixmap
+from PyQt5.QtCore import Qt, QRectF
+from config.constants import PIXMAP_CACHE_MAX_BYTES
+
+
+def image_content_hash(image):
+    """图像像素内容的哈希（统一转为预乘ARGB32后计算）"""
+    image = image.convertToFormat(QImage.Format_ARGB32_Premultiplied)
+    bits = image.constBits()
+    bits.setsize(image.byteCount())
+    digest = hashlib.blake2b(bits.asstring(), digest_size=16)
+    digest.update(f"{image.width()}x{image.height()}".encode('ascii'))
+    return digest.hexdigest()
+
+
+def default_device_pixel_ratio():
+    app = QGuiApplication.instance()
+    return app.devicePixelRatio() if app is not None else 1.0
+
+
+def render_rounded_pixmap(pixmap, size, radius, dpr=1.0):
+    """把图标裁剪为圆角，按设备像素比绘制物理像素"""
+    physical = max(1, round(size * dpr))
+    rounded_pixmap = QPixmap(physical, physical)
+    rounded_pixmap.fill(Qt.transparent)
+
+    painter = QPainter(rounded_pixmap)
+    painter.setRenderHint(QPainter.Antialiasing)
+    painter.setRenderHint(QPainter.SmoothPixmapTransform)
+
+    path = QPainterPath()
+    path.addRoundedRect(QRectF(0, 0, physical, physical), radius * dpr, radius * dpr,
+                        Qt.AbsoluteSize)
+    painter.setClipPath(path)
+    painter.drawPixmap(0, 0, physical, physical, pixmap)
+    painter.end()
+
+    rounded_pixmap.setDevicePixelRatio(dpr)
+    return rounded_pixmap
+
+
+def _pixmap_bytes(pixmap):
+    return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+
+class PixmapCache:
+    """带内存上限的 LRU 圆角图标缓存"""
+
+    def __init__(self, max_bytes=PIXMAP_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # (内容哈希, 尺寸, 圆角, 像素比) -> QPixmap
+        self.icon_hashes = {}  # (QIcon.cacheKey, 物理尺寸) -> 内容哈希，同一图标对象免去重复哈希
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _content_hash(self, icon, physical):
+        icon_key = (icon.cacheKey(), physical)
+        content_hash = self.icon_hashes.get(icon_key)
+        if content_hash is None:
+            pixmap = icon.pixmap(physical, physical)
+            if pixmap.isNull():
+                return None, None
+            content_hash = image_content_hash(pixmap.toImage())
+            if len(self.icon_hashes) > 4096:
+                self.icon_hashes.clear()
+            self.icon_hashes[icon_key] = content_hash
+            return content_hash, pixmap
+        return content_hash, None
+
+    def get_rounded(self, icon, size, radius=8, dpr=None):
+        """获取圆角图标，图标为空时返回None"""
+        if icon is None or icon.isNull():
+            return None
+        if dpr is None:
+            dpr = default_device_pixel_ratio()
+        physical = max(1, round(size * dpr))
+
+        content_hash, pixmap = self._content_hash(icon, physical)
+        if content_hash is None:
+            return None
+        key = (content_hash, size, radius, dpr)
+        cached = self.entries.get(key)
+        if cached is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        if pixmap is None:
+            pixmap = icon.pixmap(physical, physical)
+        rounded = render_rounded_pixmap(pixmap, size, radius, dpr)
+        self.entries[key] = rounded
+        self.total_bytes += _pixmap_bytes(rounded)
+        self._evict()
+        return rounded
+
+    def _evict(self):
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            _key, pixmap = self.entries.popitem(last=False)
+            self.total_bytes -= _pixmap_bytes(pixmap)
+            self.evictions += 1
+
+    def clear(self):
+        self.entries.clear()
+        self.icon_hashes.clear()
+        self.total_bytes = 0
+
+    def stats(self):
+        """缓存统计：条目数、占用字节、命中、未命中、淘汰次数"""
+        return {'entries': len(self.entries), 'bytes': self.total_bytes, 'hits': self.hits,
+                'misses': self.misses, 'evictions': self.evictions}
+
+
+_pixmap_cache = None
+
+
+def get_pixmap_cache():
+    """获取共享的圆角图标缓存（仅主线程）"""
+    global _pixmap_cache
+    if _pixmap_cache is None:
+        _pixmap_cache = PixmapCache()
+    return _pixmap_cache
+
+
+def get_rounded_pixmap(icon, size, radius=8, dpr=None):
+    """从共享缓存获取圆角图标"""
+    return get_pixmap_cache().get_rounded(icon, size, radius, dpr)
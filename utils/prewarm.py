@@ -0,0 +1,189 @@
+"""启动前预热：提前把应用的可执行文件和上次用到的库文件读入页缓存
+
+开启预热时，每个应用就绪后在后台延迟记录其进程树实际映射/打开的文件，下次预热时一并读取；
+配置了就绪检测的应用无论是否开启预热都记录从创建进程到就绪的耗时（分为预热/未预热），
+用于评估预热效果。没有就绪检测的应用不等待就绪，耗时没有意义，不参与统计。
+"""
+import logging
+import os
+import json
+import time
+import threading
+import psutil
+from config.constants import (PREWARM_CACHE_FILE, PREWARM_MAX_FILES, PREWARM_MAX_BYTES,
+                              PREWARM_READ_CHUNK, PREWARM_HISTORY, PREWARM_RECORD_DELAY)
+from .spawn_utils import resolve_launch_spec, find_executable
+
+log = logging.getLogger(__name__)
+
+
+class PrewarmStore:
+    """持久化的预热记录：{应用路径: {"files": [...], "warm": [秒], "cold": [秒]}}"""
+
+    def __init__(self, file_path=PREWARM_CACHE_FILE):
+        self.file_path = file_path
+        self.apps = {}
+        self.lock = threading.RLock()
+
+    def load(self):
+        with self.lock:
+            self.apps = {}
+            if not os.path.exists(self.file_path):
+                return
+            try:
+                with open(self.file_path, "r", encoding="utf-8") as f:
+                    self.apps = json.load(f)
+            except Exception as e:
+                log.warning("预热记录加载失败: %s", e)
+
+    def save(self):
+        """持锁写入临时文件后替换"""
+        with self.lock:
+            data = json.dumps(self.apps, indent=2, ensure_ascii=False)
+            temp_path = self.file_path + ".tmp"
+            try:
+                with open(temp_path, "w", encoding="utf-8") as f:
+                    f.write(data)
+                os.replace(temp_path, self.file_path)
+            except OSError as e:
+                log.warning("预热记录保存失败: %s", e)
+
+    def get_files(self, path):
+        """上次记录的应用相关文件"""
+        with self.lock:
+            return list(self.apps.get(path, {}).get('files', []))
+
+    def set_files(self, path, files):
+        with self.lock:
+            self.apps.setdefault(path, {})['files'] = files[:PREWARM_MAX_FILES]
+        self.save()
+
+    def record_ready_time(self, path, prewarmed, seconds):
+        """记录一次从创建进程到就绪的耗时"""
+        key = 'warm' if prewarmed else 'cold'
+        with self.lock:
+            times = self.apps.setdefault(path, {}).setdefault(key, [])
+            times.append(round(seconds, 3))
+            del times[:-PREWARM_HISTORY]
+        self.save()
+
+    def savings(self, path):
+        """预热与未预热的平均就绪耗时 (预热, 未预热)，任一方没有数据时为None"""
+        with self.lock:
+            app = self.apps.get(path, {})
+            warm, cold = app.get('warm'), app.get('cold')
+        return (sum(warm) / len(warm) if warm else None,
+                sum(cold) / len(cold) if cold else None)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_prewarm_store():
+    """获取共享的预热记录，首次调用时从磁盘加载"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = PrewarmStore()
+            _store.load()
+        return _store
+
+
+def get_prewarm_files(app_path):
+    """应用需要预热的文件：可执行文件 + 上次记录的文件"""
+    executable = find_executable(resolve_launch_spec(app_path)) or app_path
+    files = [executable] + get_prewarm_store().get_files(app_path)
+    return [f for f in dict.fromkeys(files) if os.path.isfile(f)]
+
+
+def readahead_file(file_path, max_bytes=PREWARM_MAX_BYTES):
+    """提示内核预读文件（posix_fadvise WILLNEED），不支持时顺序读取，返回预读字节数"""
+    try:
+        size = min(os.path.getsize(file_path), max_bytes)
+        fd = os.open(file_path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+    except OSError:
+        return 0
+    try:
+        if hasattr(os, 'posix_fadvise'):
+            os.posix_fadvise(fd, 0, size, os.POSIX_FADV_WILLNEED)
+            return size
+        done = 0
+        while done < size:
+            chunk = os.read(fd, min(PREWARM_READ_CHUNK, size - done))
+            if not chunk:
+                break
+            done += len(chunk)
+        return done
+    except OSError:
+        return 0
+    finally:
+        os.close(fd)
+
+
+def prewarm_app(app_path):
+    """预热应用相关文件，返回 (文件数, 字节数, 耗时秒)，应在后台线程中调用"""
+    start = time.perf_counter()
+    files = get_prewarm_files(app_path)
+    budget = PREWARM_MAX_BYTES
+    total = 0
+    for file_path in files:
+        if budget <= 0:
+            break
+        done = readahead_file(file_path, budget)
+        total += done
+        budget -= done
+    return len(files), total, time.perf_counter() - start
+
+
+def collect_touched_files(pid):
+    """收集进程树映射和打开的普通文件（可执行文件、动态库、数据文件）"""
+    try:
+        root = psutil.Process(pid)
+        procs = [root] + root.children(recursive=True)
+    except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+        return []
+
+    files = []
+    for proc in procs:
+        try:
+            files.extend(m.path for m in proc.memory_maps(grouped=True))
+            files.extend(f.path for f in proc.open_files())
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess,
+                NotImplementedError, AttributeError):
+            continue
+    return [f for f in dict.fromkeys(files) if os.path.isabs(f) and os.path.isfile(f)]
+
+
+def record_launch(app_path, pid, prewarmed, ready_seconds, collect_files=True):
+    """应用就绪后记录实际用到的文件和就绪耗时，返回 (预热平均, 未预热平均)
+
+    ready_seconds 为 None（没有就绪检测）时不记录耗时；collect_files 为 False 时不扫描进程文件。
+    """
+    store = get_prewarm_store()
+    files = collect_touched_files(pid) if collect_files and pid is not None else []
+    if files:
+        store.set_files(app_path, files)
+    if ready_seconds is not None:
+        store.record_ready_time(app_path, prewarmed, ready_seconds)
+    return store.savings(app_path)
+
+
+def schedule_record_launch(app_path, pid, prewarmed, ready_seconds, collect_files=True,
+                           delay=PREWARM_RECORD_DELAY):
+    """延迟在后台线程中记录（扫描进程树的映射和打开文件开销较大，不能占用启动流程）"""
+    def run():
+        try:
+            warm, cold = record_launch(app_path, pid, prewarmed, ready_seconds, collect_files)
+        except Exception as e:
+            log.warning("预热记录失败 %s: %s", app_path, e)
+            return
+        if ready_seconds is not None and warm is not None and cold is not None:
+            log.info("%s %s就绪 %.2f 秒（预热平均 %.2f 秒，未预热平均 %.2f 秒）",
+                     app_path, "预热后" if prewarmed else "未预热", ready_seconds, warm, cold)
+
+    timer = threading.Timer(delay, run)
+    timer.name = "aprogram-prewarm-record"
+    timer.daemon = True
+    timer.start()
+    return timer
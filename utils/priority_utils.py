@@ -0,0 +1,196 @@
+"""前台/后台组的进程优先级：nice、IO优先级和CPU亲和性
+
+应用条目和组级选项中的 priority 字段按角色配置，应用条目覆盖组级设置：
+    "priority": {
+        "foreground": {"nice": 0, "ionice": "normal"},
+        "background": {"nice": 10, "ionice": "idle", "affinity": [0, 1]}
+    }
+- nice: -20（最高）~ 19（最低），Windows 上映射为对应的优先级类
+- ionice: "high"、"normal"、"low"、"idle"
+- affinity: 允许使用的CPU编号列表，"all" 为全部CPU，"half" 为前一半CPU
+未配置的项使用 DEFAULT_PRIORITY_PROFILES，值为 None 的项保持不变。
+只调整启动器拉起（已登记）的进程及其子进程，不会改动用户自行启动的同名程序。
+Linux 上普通用户无法把 nice 调回更小的值：调低优先级后无法恢复的 nice 调整会被跳过，
+无权限的调整同样跳过并打印原因。
+"""
+import logging
+import os
+import sys
+import psutil
+from config.constants import DEFAULT_PRIORITY_PROFILES
+from config.groups import get_enabled_apps, get_group_options
+from .process_utils import get_process_snapshot
+from .process_registry import get_process_registry
+
+log = logging.getLogger(__name__)
+
+PRIORITY_FOREGROUND = "foreground"
+PRIORITY_BACKGROUND = "background"
+
+IS_WINDOWS = sys.platform == 'win32'
+
+
+def resolve_priority(role, app=None, group_options=None):
+    """合并默认值、组级设置和应用设置，得到指定角色的优先级配置"""
+    profile = dict(DEFAULT_PRIORITY_PROFILES[role])
+    for source in (group_options, app):
+        if source:
+            profile.update((source.get('priority') or {}).get(role) or {})
+    return profile
+
+
+def _windows_priority_class(nice):
+    if nice <= -15:
+        return psutil.HIGH_PRIORITY_CLASS
+    if nice < 0:
+        return psutil.ABOVE_NORMAL_PRIORITY_CLASS
+    if nice == 0:
+        return psutil.NORMAL_PRIORITY_CLASS
+    if nice < 15:
+        return psutil.BELOW_NORMAL_PRIORITY_CLASS
+    return psutil.IDLE_PRIORITY_CLASS
+
+
+def _ionice_args(level):
+    """把 ionice 级别转换为 psutil.Process.ionice 的参数，不支持时返回None"""
+    if not hasattr(psutil.Process, 'ionice'):
+        return None
+    if IS_WINDOWS:
+        return ({'high': psutil.IOPRIO_HIGH, 'normal': psutil.IOPRIO_NORMAL,
+                 'low': psutil.IOPRIO_LOW, 'idle': psutil.IOPRIO_VERYLOW}[level],)
+    if level == 'idle':
+        return (psutil.IOPRIO_CLASS_IDLE,)
+    if level == 'high':
+        return (psutil.IOPRIO_CLASS_RT, 4)
+    return (psutil.IOPRIO_CLASS_BE, 7 if level == 'low' else 4)
+
+
+def _affinity_cpus(affinity):
+    """把 affinity 配置转换为本机存在的CPU编号列表"""
+    count = psutil.cpu_count() or 1
+    if affinity == 'all':
+        return list(range(count))
+    if affinity == 'half':
+        return list(range(max(count // 2, 1)))
+    return [cpu for cpu in affinity if 0 <= cpu < count] or list(range(count))
+
+
+def can_restore_nice(current):
+    """把 nice 调高后能否再调回 current（root 或 RLIMIT_NICE 允许时可以，Windows 总是可以）"""
+    if IS_WINDOWS or os.geteuid() == 0:
+        return True
+    try:
+        import resource
+        soft, _hard = resource.getrlimit(resource.RLIMIT_NICE)
+    except (ImportError, AttributeError, OSError, ValueError):
+        return False
+    # RLIMIT_NICE 为 n 时，普通用户可以把 nice 调低到 20 - n
+    return soft == resource.RLIM_INFINITY or 20 - soft <= current
+
+
+def apply_priority(proc, profile):
+    """把优先级配置应用到进程，返回未能应用的项的说明列表"""
+    errors = []
+    nice = profile.get('nice')
+    if nice is not None:
+        try:
+            value = _windows_priority_class(nice) if IS_WINDOWS else nice
+            current = proc.nice()
+            if current == value:
+                pass
+            elif not IS_WINDOWS and value > current and not can_restore_nice(current):
+                errors.append(f"nice={nice}: 调整后无法恢复到 {current}，已跳过")
+            else:
+                proc.nice(value)
+        except (psutil.AccessDenied, ValueError) as e:
+            errors.append(f"nice={nice}: {e}")
+
+    ionice = profile.get('ionice')
+    if ionice is not None:
+        try:
+            args = _ionice_args(ionice)
+            if args is not None:
+                proc.ionice(*args)
+        except (psutil.AccessDenied, KeyError, ValueError) as e:
+            errors.append(f"ionice={ionice}: {e}")
+
+    affinity = profile.get('affinity')
+    if affinity is not None and hasattr(proc, 'cpu_affinity'):
+        try:
+            proc.cpu_affinity(_affinity_cpus(affinity))
+        except (psutil.AccessDenied, TypeError, ValueError) as e:
+            errors.append(f"affinity={affinity}: {e}")
+    return errors
+
+
+def apply_pid_priority(pid, profile):
+    """把优先级配置应用到指定PID的进程，返回是否成功"""
+    try:
+        errors = apply_priority(psutil.Process(pid), profile)
+    except (psutil.NoSuchProcess, psutil.ZombieProcess):
+        return False
+    if errors:
+        log.info("优先级调整 pid=%s 部分未生效: %s", pid, '; '.join(errors))
+    return not errors
+
+
+def group_priority_profiles(groups, current_group):
+    """计算所有组内应用的优先级配置：当前组为前台，其余为后台
+
+    同时属于当前组和其他组的应用按前台处理。
+    """
+    profiles = {}
+    for name, group_data in groups.items():
+        if name == current_group:
+            continue
+        options = get_group_options(group_data)
+        for app in get_enabled_apps(group_data):
+            profiles[app['path']] = resolve_priority(PRIORITY_BACKGROUND, app, options)
+
+    if current_group in groups:
+        group_data = groups[current_group]
+        options = get_group_options(group_data)
+        for app in get_enabled_apps(group_data):
+            profiles[app['path']] = resolve_priority(PRIORITY_FOREGROUND, app, options)
+    return profiles
+
+
+def collect_registered_trees(app_paths, snapshot, registry):
+    """收集各应用已登记的进程及其子进程树，返回 pid -> (应用路径, 进程对象, 进程名)
+
+    与关闭不同，没有登记记录的应用不按名称匹配，用户自行启动的进程不受影响。
+    """
+    owners = {}
+    for path in app_paths:
+        for root in registry.get_processes(path):
+            if root.pid not in owners:
+                entry = snapshot.entries.get(root.pid)
+                owners[root.pid] = (path, root, entry.name if entry else path)
+            for pid in snapshot.descendants(root.pid):
+                if pid not in owners:
+                    entry = snapshot.entries[pid]
+                    owners[pid] = (path, entry.proc, entry.name)
+    return owners
+
+
+def apply_priorities(profiles, snapshot=None, registry=None):
+    """按 {应用路径: 优先级配置} 调整各应用由启动器拉起的进程树，返回调整的进程数
+
+    应在后台线程中调用；没有权限或调整后无法恢复的项会跳过并打印原因。
+    """
+    if snapshot is None:
+        snapshot = get_process_snapshot()
+    if registry is None:
+        registry = get_process_registry()
+
+    owners = collect_registered_trees(list(profiles), snapshot, registry)
+    adjusted = 0
+    for pid, (path, proc, name) in owners.items():
+        try:
+            errors = apply_priority(proc, profiles[path])
+        except (psutil.NoSuchProcess, psutil.ZombieProcess):
+            continue
+        if errors:
+            log.info("优先级调整 %s (pid=%s) 部分未生效: %s", name, pid, '; '.join(errors))
+        adjusted += 1
+    return adjusted
@@ -0,0 +1,198 @@
+"""多规则进程匹配：所有应用的匹配规则编译为一个匹配器，一次遍历快照完成分类
+
+应用条目中的 match 字段配置匹配规则，可以是一条规则或规则列表（任一条满足即可），
+一条规则内的各项需要同时满足：
+    "match": {"name": "java.exe", "cmdline": "idea.Main"}
+    "match": [{"exe": "C:/tools/node.exe", "regex": "vite\\\\b"}, {"name": "vite.exe"}]
+- exe:     完整可执行文件路径（不区分大小写）
+- name:    可执行文件名（不区分大小写）
+- cmdline: 命令行包含的子串（不区分大小写）
+- regex:   命令行需匹配的正则表达式
+- parent:  父进程的可执行文件路径或文件名
+未配置 match 的应用按文件名或完整路径匹配。
+"""
+import logging
+import os
+import re
+from functools import lru_cache
+from .file_utils import resolve_lnk
+
+log = logging.getLogger(__name__)
+
+
+def _shortcut_mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def get_app_match_keys(app_path):
+    """获取应用的匹配键：(小写可执行文件名, 规范化的小写exe路径)
+
+    快捷方式按其修改时间缓存，重新指向其他程序后会重新解析。
+    """
+    if app_path.endswith('.lnk'):
+        return _shortcut_match_keys(app_path, _shortcut_mtime(app_path))
+    return _path_match_keys(app_path)
+
+
+@lru_cache(maxsize=512)
+def _path_match_keys(app_path):
+    return os.path.basename(app_path).lower(), os.path.normpath(app_path.lower())
+
+
+@lru_cache(maxsize=512)
+def _shortcut_match_keys(app_path, mtime):
+    target_path = resolve_lnk(app_path)
+    if target_path and os.path.exists(target_path):
+        app_path = target_path
+    return _path_match_keys(app_path)
+
+
+def _normalize_exe(path):
+    return os.path.normpath(path.lower())
+
+
+class MatchRule:
+    """一条已编译的匹配规则"""
+    __slots__ = ('app', 'exe', 'name', 'cmdline', 'regex', 'parent')
+
+    def __init__(self, app, exe=None, name=None, cmdline=None, regex=None, parent=None):
+        self.app = app
+        self.exe = _normalize_exe(exe) if exe else None
+        self.name = name.lower() if name else None
+        self.cmdline = cmdline.lower() if cmdline else None
+        self.regex = re.compile(regex) if regex else None
+        self.parent = _normalize_exe(parent) if parent else None
+
+    @classmethod
+    def from_config(cls, app, config):
+        return cls(app, config.get('exe'), config.get('name'), config.get('cmdline'),
+                   config.get('regex'), config.get('parent'))
+
+    @property
+    def needs_cmdline(self):
+        return self.cmdline is not None or self.regex is not None
+
+    def matches(self, entry, entries):
+        """判断进程条目是否满足规则；entries 为 pid -> ProcessEntry，用于检查父进程"""
+        if self.exe is not None and entry.match_exe != self.exe:
+            return False
+        if self.name is not None and entry.match_name != self.name:
+            return False
+        if self.needs_cmdline:
+            cmdline = entry.get_cmdline()
+            if self.cmdline is not None and self.cmdline not in cmdline.lower():
+                return False
+            if self.regex is not None and not self.regex.search(cmdline):
+                return False
+        if self.parent is not None:
+            parent = entries.get(entry.ppid) if entries is not None else None
+            if parent is None:
+                return False
+            if self.parent != parent.match_exe and self.parent != parent.match_name:
+                return False
+        return True
+
+
+class ProcessMatcher:
+    """编译后的匹配器：按 exe 路径和文件名建立规则索引，只有无法索引的规则需要逐个检查"""
+
+    def __init__(self, app_rules):
+        """app_rules 为 {应用路径: match 配置或None}"""
+        self.app_rules = dict(app_rules)
+        self.apps = set(app_rules)
+        # 按快捷方式目标匹配的应用，记录编译时快捷方式的修改时间
+        self.shortcut_mtimes = {app: _shortcut_mtime(app) for app, config in app_rules.items()
+                                if not config and app.endswith('.lnk')}
+        self.by_exe = {}     # 规范化exe路径 -> [MatchRule]
+        self.by_name = {}    # 小写文件名 -> [MatchRule]
+        self.unindexed = []  # 只按命令行/父进程匹配的规则
+
+        for app, config in app_rules.items():
+            for rule in self._compile(app, config):
+                if rule.exe is not None:
+                    self.by_exe.setdefault(rule.exe, []).append(rule)
+                elif rule.name is not None:
+                    self.by_name.setdefault(rule.name, []).append(rule)
+                else:
+                    self.unindexed.append(rule)
+
+        # 无法索引的规则都带命令行条件时，合并为一个正则做预筛选，避免逐条检查
+        self._prefilter = None
+        if self.unindexed and all(rule.needs_cmdline for rule in self.unindexed):
+            patterns = [rule.regex.pattern if rule.regex is not None else re.escape(rule.cmdline)
+                        for rule in self.unindexed]
+            try:
+                self._prefilter = re.compile("|".join(f"(?:{p})" for p in patterns),
+                                             re.IGNORECASE)
+            except re.error:
+                pass  # 含全局标志等无法合并的表达式时逐条检查
+
+    @staticmethod
+    def _compile(app, config):
+        if not config:
+            name, exe = get_app_match_keys(app)
+            return [MatchRule(app, name=name), MatchRule(app, exe=exe)]
+        if isinstance(config, dict):
+            config = [config]
+        rules = []
+        for item in config:
+            try:
+                rules.append(MatchRule.from_config(app, item))
+            except re.error as e:
+                log.warning("匹配规则无效 %s: %s (%s)", app, item.get('regex'), e)
+        return rules
+
+    def is_stale(self):
+        """是否有快捷方式在编译后被修改（可能已指向其他程序）"""
+        return any(_shortcut_mtime(app) != mtime for app, mtime in self.shortcut_mtimes.items())
+
+    def match_entry(self, entry, entries=None):
+        """返回进程条目匹配到的应用路径集合"""
+        apps = set()
+        candidates = (self.by_exe.get(entry.match_exe, []) +
+                      self.by_name.get(entry.match_name, []))
+        for rule in candidates:
+            if rule.app not in apps and rule.matches(entry, entries):
+                apps.add(rule.app)
+
+        if self.unindexed:
+            if self._prefilter is not None and not self._prefilter.search(entry.get_cmdline()):
+                return apps
+            for rule in self.unindexed:
+                if rule.app not in apps and rule.matches(entry, entries):
+                    apps.add(rule.app)
+        return apps
+
+    def classify(self, entries):
+        """一次遍历进程条目，返回 {应用路径: [pid]}"""
+        result = {}
+        for entry in entries.values():
+            for app in self.match_entry(entry, entries):
+                result.setdefault(app, []).append(entry.pid)
+        return result
+
+
+_matcher = ProcessMatcher({})
+
+
+def set_app_match_rules(app_rules):
+    """设置所有应用的匹配规则（{应用路径: match 配置或None}），重新编译匹配器"""
+    global _matcher
+    _matcher = ProcessMatcher(app_rules)
+    return _matcher
+
+
+def refresh_app_match_rules():
+    """快捷方式被修改时按原有规则重新编译匹配器，返回是否重新编译"""
+    if not _matcher.is_stale():
+        return False
+    set_app_match_rules(_matcher.app_rules)
+    return True
+
+
+def get_process_matcher():
+    """获取当前的匹配器"""
+    return _matcher
@@ -0,0 +1,173 @@
+"""已启动进程登记表：记录启动器拉起的进程，关闭和状态检测直接使用登记的PID"""
+import logging
+import os
+import json
+import threading
+import psutil
+from config.constants import LAUNCH_REGISTRY_FILE
+from .process_utils import get_process_snapshot
+
+log = logging.getLogger(__name__)
+
+# 创建时间比较容差（秒），不同平台读取精度不同
+CREATE_TIME_TOLERANCE = 0.01
+
+
+class ProcessRecord:
+    """一条登记记录"""
+    __slots__ = ('pid', 'create_time', 'path', 'group')
+
+    def __init__(self, pid, create_time, path, group=None):
+        self.pid = pid
+        self.create_time = create_time
+        self.path = path
+        self.group = group
+
+    def to_dict(self):
+        return {'pid': self.pid, 'create_time': self.create_time,
+                'path': self.path, 'group': self.group}
+
+    def get_process(self):
+        """返回仍在运行的原进程，PID已退出或被复用时返回None"""
+        try:
+            proc = psutil.Process(self.pid)
+            if abs(proc.create_time() - self.create_time) > CREATE_TIME_TOLERANCE:
+                return None
+            if proc.status() == psutil.STATUS_ZOMBIE:
+                return None
+            return proc
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return None
+
+    def __repr__(self):
+        return f"ProcessRecord(pid={self.pid}, path={self.path!r}, group={self.group!r})"
+
+
+class ProcessRegistry:
+    """持久化的已启动进程登记表，启动器重启后重新校验"""
+
+    def __init__(self, file_path=LAUNCH_REGISTRY_FILE):
+        self.file_path = file_path
+        self.records = {}  # pid -> ProcessRecord
+        self.lock = threading.RLock()
+
+    def load(self):
+        """从磁盘加载登记表，丢弃已退出或PID已被复用的记录"""
+        with self.lock:
+            self.records = {}
+            if not os.path.exists(self.file_path):
+                return
+            try:
+                with open(self.file_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except Exception as e:
+                log.warning("进程登记表加载失败: %s", e)
+                return
+
+            for item in data:
+                record = ProcessRecord(item['pid'], item['create_time'],
+                                       item['path'], item.get('group'))
+                if record.get_process() is not None:
+                    self.records[record.pid] = record
+
+            if len(self.records) != len(data):
+                self.save()
+
+    def save(self):
+        """保存登记表：持锁写入临时文件后替换，主线程和工作线程的保存不会交错"""
+        with self.lock:
+            data = json.dumps([record.to_dict() for record in self.records.values()],
+                              indent=2, ensure_ascii=False)
+            temp_path = self.file_path + ".tmp"
+            try:
+                with open(temp_path, "w", encoding="utf-8") as f:
+                    f.write(data)
+                os.replace(temp_path, self.file_path)
+            except OSError as e:
+                log.warning("进程登记表保存失败: %s", e)
+
+    def register(self, path, pid, group=None):
+        """登记启动器拉起的进程，返回是否成功"""
+        try:
+            create_time = psutil.Process(pid).create_time()
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return False
+        with self.lock:
+            if pid in self.records and self.records[pid].create_time == create_time:
+                return True
+            self.records[pid] = ProcessRecord(pid, create_time, path, group)
+        self.save()
+        return True
+
+    def unregister(self, pid):
+        """移除登记记录"""
+        with self.lock:
+            removed = self.records.pop(pid, None)
+        if removed is not None:
+            self.save()
+
+    def has_records(self, path):
+        """应用是否有登记记录（不校验进程是否存活）"""
+        with self.lock:
+            return any(record.path == path for record in self.records.values())
+
+    def get_records(self, path=None):
+        """获取应用（或全部）的登记记录"""
+        with self.lock:
+            return [record for record in self.records.values()
+                    if path is None or record.path == path]
+
+    def get_processes(self, path):
+        """获取应用仍在运行的已登记进程，同时清理失效记录"""
+        alive = []
+        stale = []
+        for record in self.get_records(path):
+            proc = record.get_process()
+            if proc is None:
+                stale.append(record.pid)
+            else:
+                alive.append(proc)
+        if stale:
+            with self.lock:
+                for pid in stale:
+                    self.records.pop(pid, None)
+            self.save()
+        return alive
+
+    def is_running(self, path):
+        """应用是否有仍在运行的已登记进程"""
+        return bool(self.get_processes(path))
+
+    def prune(self):
+        """清理所有已退出的进程记录"""
+        stale = [record.pid for record in self.get_records()
+                 if record.get_process() is None]
+        if stale:
+            with self.lock:
+                for pid in stale:
+                    self.records.pop(pid, None)
+            self.save()
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_process_registry():
+    """获取共享的进程登记表，首次调用时从磁盘加载并校验"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ProcessRegistry()
+            _registry.load()
+        return _registry
+
+
+def is_app_running(path, snapshot=None):
+    """应用是否在运行：启动器拉起的应用看登记的进程，其余按名称在快照中匹配"""
+    registry = get_process_registry()
+    if registry.has_records(path):
+        return registry.is_running(path)
+    if snapshot is None:
+        snapshot = get_process_snapshot()
+    return snapshot.is_running(path)
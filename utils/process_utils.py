@@ -1,113 +1,332 @@
 """进程管理工具"""
+import logging
 import os
 import time
+import threading
 import psutil
-from .file_utils import resolve_lnk
+from config.constants import PROCESS_SNAPSHOT_TTL, PROCESS_REUSE_CHECK_BATCH
+from .process_matcher import get_app_match_keys, get_process_matcher
+from .spawn_utils import resolve_launch_spec, spawn_process
 
+log = logging.getLogger(__name__)
 
-def close_application_by_path(app_path):
-    """根据应用路径关闭对应的进程"""
-    try:
-        # 处理快捷方式
-        if app_path.endswith('.lnk'):
-            target_path = resolve_lnk(app_path)
-            if target_path and os.path.exists(target_path):
-                app_path = target_path
 
-        # 获取应用的可执行文件名
-        app_name = os.path.basename(app_path).lower()
+class ProcessEntry:
+    """进程表条目，由 (pid, create_time) 唯一标识，PID被复用时视为新进程"""
+    __slots__ = ('pid', 'create_time', 'name', 'exe', 'ppid', 'proc',
+                 'match_name', 'match_exe', 'cmdline')
 
-        closed_processes = []
+    def __init__(self, pid, create_time, name, exe, ppid, proc):
+        self.pid = pid
+        self.create_time = create_time
+        self.name = name
+        self.exe = exe
+        self.ppid = ppid
+        self.proc = proc
+        # 匹配键只在进程首次出现时计算一次
+        self.match_name = name.lower() if name else None
+        self.match_exe = os.path.normpath(exe.lower()) if exe else None
+        self.cmdline = None  # 按需读取，进程存活期间只读一次
 
-        # 遍历所有进程
-        for proc in psutil.process_iter(['pid', 'name', 'exe']):
+    def get_cmdline(self):
+        """进程命令行（空格连接），无权限读取时为空串"""
+        if self.cmdline is None:
             try:
-                proc_info = proc.info
+                self.cmdline = " ".join(self.proc.cmdline())
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                self.cmdline = ""
+        return self.cmdline
 
-                # 检查进程名是否匹配
-                if proc_info['name'] and proc_info['name'].lower() == app_name:
-                    proc.terminate()  # 先尝试优雅关闭
-                    closed_processes.append(proc_info['name'])
-                    continue
+    @property
+    def key(self):
+        return (self.pid, self.create_time)
+
+    def __repr__(self):
+        return f"ProcessEntry(pid={self.pid}, name={self.name!r})"
+
+
+def _inspect_process(pid):
+    """读取新进程的信息，进程已退出时返回None"""
+    try:
+        proc = psutil.Process(pid)
+        with proc.oneshot():
+            create_time = proc.create_time()
+            name = proc.name()
+            ppid = proc.ppid()
+            try:
+                exe = proc.exe()
+            except (psutil.AccessDenied, psutil.ZombieProcess):
+                exe = None
+        return ProcessEntry(pid, create_time, name, exe, ppid, proc)
+    except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+        return None
+
+
+def _read_create_time(pid):
+    """读取进程创建时间，进程已退出时返回None"""
+    try:
+        return psutil.Process(pid).create_time()
+    except (psutil.NoSuchProcess, psutil.ZombieProcess):
+        return None
+    except psutil.AccessDenied:
+        return False  # 无法校验，按未变化处理
+
+
+class ProcessDelta:
+    """两次刷新之间的进程变化：新启动和已退出的进程"""
+
+    def __init__(self, started, exited, entries=None):
+        self.started = started
+        self.exited = exited
+        self.entries = entries  # pid -> ProcessEntry，用于按父进程匹配
+        self._match_keys = None
+        self._matched_apps = None
+
+    def __bool__(self):
+        return bool(self.started or self.exited)
+
+    def match_keys(self):
+        """变化进程涉及的所有匹配键（小写进程名和规范化exe路径）"""
+        if self._match_keys is None:
+            keys = set()
+            for entry in self.started + self.exited:
+                if entry.match_name:
+                    keys.add(entry.match_name)
+                if entry.match_exe:
+                    keys.add(entry.match_exe)
+            self._match_keys = keys
+        return self._match_keys
 
-                # 检查完整路径是否匹配
-                if proc_info['exe'] and os.path.normpath(proc_info['exe'].lower()) == os.path.normpath(app_path.lower()):
-                    proc.terminate()  # 先尝试优雅关闭
-                    closed_processes.append(proc_info['name'])
+    def matched_apps(self):
+        """变化进程按匹配规则分类后涉及的应用"""
+        if self._matched_apps is None:
+            matcher = get_process_matcher()
+            apps = set()
+            for entry in self.started + self.exited:
+                apps |= matcher.match_entry(entry, self.entries)
+            self._matched_apps = apps
+        return self._matched_apps
+
+    def affects(self, app_path):
+        """判断变化是否涉及指定应用"""
+        if app_path in get_process_matcher().apps:
+            return app_path in self.matched_apps()
+        keys = self.match_keys()
+        app_name, app_exe = get_app_match_keys(app_path)
+        return app_name in keys or app_exe in keys
+
+
+class ProcessTable:
+    """增量进程表：每次刷新只对比PID集合并读取新进程的信息"""
+
+    def __init__(self, verify_reuse=True, reuse_batch=PROCESS_REUSE_CHECK_BATCH):
+        self.entries = {}  # pid -> ProcessEntry
+        self.verify_reuse = verify_reuse
+        self.reuse_batch = reuse_batch
+        self._reuse_cursor = 0
+
+    def _reuse_candidates(self, pids):
+        """需要校验创建时间的已知PID：匹配到应用的进程每次都校验，其余进程每次轮流校验一批"""
+        matcher = get_process_matcher()
+        matched, others = [], []
+        for pid in sorted(pids):
+            if matcher.match_entry(self.entries[pid], self.entries):
+                matched.append(pid)
+            else:
+                others.append(pid)
+        if len(others) > self.reuse_batch:
+            start = self._reuse_cursor % len(others)
+            self._reuse_cursor = start + self.reuse_batch
+            others = (others + others)[start:start + self.reuse_batch]
+        return matched + others
+
+    def refresh(self):
+        """刷新进程表，返回本次的进程变化"""
+        current_pids = set(psutil.pids())
+        known_pids = set(self.entries)
+
+        exited = [self.entries.pop(pid) for pid in known_pids - current_pids]
+        new_pids = current_pids - known_pids
+
+        # 通过创建时间识别被复用的PID（只读取部分进程，避免每次刷新对所有进程发起系统调用）
+        if self.verify_reuse:
+            for pid in self._reuse_candidates(known_pids & current_pids):
+                create_time = _read_create_time(pid)
+                if create_time is False:
                     continue
+                if create_time != self.entries[pid].create_time:
+                    exited.append(self.entries.pop(pid))
+                    if create_time is not None:
+                        new_pids.add(pid)
 
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                continue
+        started = []
+        for pid in new_pids:
+            entry = _inspect_process(pid)
+            if entry is not None:
+                self.entries[pid] = entry
+                started.append(entry)
+
+        return ProcessDelta(started, exited, self.entries)
+
+    def snapshot(self):
+        """基于当前进程表生成快照"""
+        return ProcessSnapshot(self.entries.values())
+
+
+class ProcessSnapshot:
+    """进程快照，按小写进程名和规范化exe路径建立索引"""
+
+    def __init__(self, entries):
+        self.timestamp = time.monotonic()
+        self.entries = {}  # pid -> ProcessEntry
+        self.by_name = {}  # 小写进程名 -> [pid]
+        self.by_exe = {}   # 规范化小写exe路径 -> [pid]
+        self.children = {}  # 父进程pid -> [子进程pid]
+        self._matches = None  # (匹配器, {应用路径: [pid]})，首次查询时一次遍历生成
+        self._match_lock = threading.Lock()
 
-        # 等待一下，然后强制关闭还在运行的进程
-        if closed_processes:
-            time.sleep(1)
+        for entry in entries:
+            self.entries[entry.pid] = entry
+            if entry.match_name:
+                self.by_name.setdefault(entry.match_name, []).append(entry.pid)
+            if entry.match_exe:
+                self.by_exe.setdefault(entry.match_exe, []).append(entry.pid)
+            if entry.ppid:
+                self.children.setdefault(entry.ppid, []).append(entry.pid)
 
-            for proc in psutil.process_iter(['pid', 'name', 'exe']):
-                try:
-                    proc_info = proc.info
+    def age(self):
+        """快照已存在的秒数"""
+        return time.monotonic() - self.timestamp
 
-                    # 检查是否还有相关进程在运行
-                    if (proc_info['name'] and proc_info['name'].lower() == app_name) or \
-                       (proc_info['exe'] and os.path.normpath(proc_info['exe'].lower()) == os.path.normpath(app_path.lower())):
-                        proc.kill()  # 强制关闭
+    def app_matches(self):
+        """按当前匹配器对整个快照分类，返回 {应用路径: [pid]}（每份快照只遍历一次）"""
+        matcher = get_process_matcher()
+        with self._match_lock:
+            if self._matches is None or self._matches[0] is not matcher:
+                self._matches = (matcher, matcher.classify(self.entries))
+            return self._matches[1]
 
-                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+    def find_pids(self, app_path):
+        """查找与应用匹配的进程PID"""
+        if app_path in get_process_matcher().apps:
+            return list(self.app_matches().get(app_path, ()))
+        app_name, app_exe = get_app_match_keys(app_path)
+        pids = list(self.by_name.get(app_name, ()))
+        for pid in self.by_exe.get(app_exe, ()):
+            if pid not in pids:
+                pids.append(pid)
+        return pids
+
+    def find_entries(self, app_path):
+        """查找与应用匹配的进程表条目"""
+        return [self.entries[pid] for pid in self.find_pids(app_path)]
+
+    def find_processes(self, app_path):
+        """查找与应用匹配的进程对象"""
+        return [entry.proc for entry in self.find_entries(app_path)]
+
+    def descendants(self, pid):
+        """获取进程在快照中的全部子孙进程PID"""
+        result = []
+        stack = [pid]
+        while stack:
+            parent = self.entries.get(stack.pop())
+            if parent is None:
+                continue
+            for child_pid in self.children.get(parent.pid, ()):
+                child = self.entries[child_pid]
+                # 父进程PID被复用时，子进程会早于"父进程"创建
+                if child.create_time < parent.create_time or child_pid in result:
                     continue
+                result.append(child_pid)
+                stack.append(child_pid)
+        return result
 
-        if closed_processes:
-            print(f"[关闭成功] {app_path} -> {', '.join(set(closed_processes))}")
-            return True
-        else:
-            print(f"[未找到进程] {app_path}")
-            return False
+    def is_running(self, app_path):
+        """判断应用是否在快照中运行"""
+        if app_path in get_process_matcher().apps:
+            return app_path in self.app_matches()
+        app_name, app_exe = get_app_match_keys(app_path)
+        return app_name in self.by_name or app_exe in self.by_exe
 
-    except Exception as e:
-        print(f"[关闭失败] {app_path}: {str(e)}")
-        return False
 
+_snapshot_lock = threading.Lock()
+_process_table = ProcessTable()
+_snapshot = None
+_delta_listeners = []
 
-def launch_application(path):
-    """启动应用程序"""
-    try:
-        import subprocess
-        subprocess.Popen(path, shell=True)
-        return True
-    except Exception as e:
-        print(f"[启动失败] {path}: {str(e)}")
-        return False
 
+def add_process_delta_listener(callback):
+    """注册进程变化监听器，每次刷新出现进程启动或退出时以ProcessDelta调用
+
+    回调可能在任意线程中执行，UI组件应通过信号转发到主线程。
+    """
+    if callback not in _delta_listeners:
+        _delta_listeners.append(callback)
+
+
+def remove_process_delta_listener(callback):
+    """移除进程变化监听器"""
+    if callback in _delta_listeners:
+        _delta_listeners.remove(callback)
 
-def is_application_running(app_path):
-    """检测应用程序是否正在运行"""
-    try:
-        # 处理快捷方式
-        if app_path.endswith('.lnk'):
-            target_path = resolve_lnk(app_path)
-            if target_path and os.path.exists(target_path):
-                app_path = target_path
 
-        # 获取应用的可执行文件名
-        app_name = os.path.basename(app_path).lower()
+def get_process_snapshot(max_age=PROCESS_SNAPSHOT_TTL):
+    """获取共享的进程快照，在有效期内直接复用，过期时增量刷新进程表"""
+    global _snapshot
+    delta = None
+    with _snapshot_lock:
+        if _snapshot is None or _snapshot.age() > max_age:
+            delta = _process_table.refresh()
+            _snapshot = _process_table.snapshot()
+        snapshot = _snapshot
 
-        # 遍历所有进程
-        for proc in psutil.process_iter(['pid', 'name', 'exe']):
+    if delta:
+        for callback in list(_delta_listeners):
             try:
-                proc_info = proc.info
+                callback(delta)
+            except Exception as e:
+                log.warning("进程变化通知失败: %s", e)
+    return snapshot
 
-                # 检查进程名是否匹配
-                if proc_info['name'] and proc_info['name'].lower() == app_name:
-                    return True
 
-                # 检查完整路径是否匹配
-                if proc_info['exe'] and os.path.normpath(proc_info['exe'].lower()) == os.path.normpath(app_path.lower()):
-                    return True
+def invalidate_process_snapshot():
+    """使共享快照失效，下一次查询将刷新进程表（启动或关闭应用后调用）"""
+    global _snapshot
+    with _snapshot_lock:
+        _snapshot = None
 
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                continue
 
-        return False
+def close_application_by_path(app_path, snapshot=None):
+    """根据应用路径关闭对应的进程（及其子进程树）"""
+    from .close_engine import close_applications
+    report = close_applications([app_path], snapshot=snapshot)[app_path]
+    return report.closed
+
+
+def spawn_application(path):
+    """启动应用程序（不经过shell），返回子进程句柄，失败时返回None"""
+    try:
+        popen = spawn_process(resolve_launch_spec(path))
+        invalidate_process_snapshot()
+        return popen
+    except Exception as e:
+        log.error("启动失败 %s: %s", path, e)
+        return None
+
+
+def launch_application(path):
+    """启动应用程序"""
+    return spawn_application(path) is not None
+
+
+def is_application_running(app_path, snapshot=None):
+    """检测应用程序是否正在运行"""
+    try:
+        if snapshot is None:
+            snapshot = get_process_snapshot()
+        return snapshot.is_running(app_path)
 
     except Exception as e:
-        print(f"[状态检测失败] {app_path}: {str(e)}")
+        log.warning("状态检测失败 %s: %s", app_path, e)
         return False
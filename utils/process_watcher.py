@@ -0,0 +1,143 @@
+"""已启动进程的退出通知（Linux pidfd + QSocketNotifier）"""
+import logging
+import os
+import sys
+import psutil
+from PyQt5.QtCore import QObject, QSocketNotifier, QTimer, pyqtSignal
+
+log = logging.getLogger(__name__)
+
+# 启动后分几次收养子孙进程（启动器类程序常常拉起真正的主进程后自行退出）
+ADOPT_DELAYS = (300, 1500, 5000)
+
+
+def is_pidfd_supported():
+    """当前平台是否支持pidfd"""
+    if not sys.platform.startswith('linux') or not hasattr(os, 'pidfd_open'):
+        return False
+    try:
+        fd = os.pidfd_open(os.getpid())
+        os.close(fd)
+        return True
+    except OSError:
+        return False
+
+
+class _Watch:
+    """单个被跟踪进程"""
+    __slots__ = ('pid', 'path', 'fd', 'notifier', 'popen')
+
+    def __init__(self, pid, path, fd, notifier, popen):
+        self.pid = pid
+        self.path = path
+        self.fd = fd
+        self.notifier = notifier
+        self.popen = popen
+
+
+class ProcessExitWatcher(QObject):
+    """跟踪启动器拉起的进程及其子孙进程，进程退出时立即通知，无需轮询"""
+    process_exited = pyqtSignal(int)
+    process_adopted = pyqtSignal(str, int)  # 应用路径, 新纳入跟踪的子孙进程pid
+    app_exited = pyqtSignal(str)  # 应用的所有被跟踪进程均已退出
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.supported = is_pidfd_supported()
+        self._watches = {}  # pid -> _Watch
+        self._apps = {}     # path -> set(pid)
+
+    def is_tracking(self, path):
+        """应用是否有被跟踪且仍在运行的进程"""
+        return bool(self._apps.get(path))
+
+    def tracked_pids(self, path):
+        """获取应用被跟踪的进程PID"""
+        return set(self._apps.get(path, ()))
+
+    def watch(self, path, pid, popen=None):
+        """开始跟踪进程，返回是否成功（不支持pidfd的平台返回False）"""
+        if not self.supported:
+            return False
+        if not self._add_watch(path, pid, popen):
+            return False
+
+        # 稍后收养子孙进程
+        for delay in ADOPT_DELAYS:
+            QTimer.singleShot(delay, lambda: self.adopt_descendants(path, pid))
+        return True
+
+    def adopt_descendants(self, path, pid):
+        """把仍在运行的子孙进程纳入跟踪"""
+        if pid not in self._watches:
+            return
+        try:
+            children = psutil.Process(pid).children(recursive=True)
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return
+        for child in children:
+            if child.pid not in self._watches:
+                if self._add_watch(path, child.pid):
+                    self.process_adopted.emit(path, child.pid)
+
+    def _add_watch(self, path, pid, popen=None):
+        try:
+            fd = os.pidfd_open(pid)
+        except OSError as e:
+            log.warning("进程跟踪失败 %s (pid=%s): %s", path, pid, e)
+            return False
+
+        notifier = QSocketNotifier(fd, QSocketNotifier.Read, self)
+        notifier.activated.connect(lambda _fd, pid=pid: self._on_exit(pid))
+        self._watches[pid] = _Watch(pid, path, fd, notifier, popen)
+        self._apps.setdefault(path, set()).add(pid)
+        return True
+
+    def _on_exit(self, pid):
+        watch = self._watches.pop(pid, None)
+        if watch is None:
+            return
+
+        watch.notifier.setEnabled(False)
+        watch.notifier.deleteLater()
+        os.close(watch.fd)
+        if watch.popen is not None:
+            watch.popen.poll()  # 回收直接子进程，避免僵尸进程
+
+        self.process_exited.emit(pid)
+
+        pids = self._apps.get(watch.path)
+        if pids is not None:
+            pids.discard(pid)
+            if not pids:
+                # 启动器类程序可能在收养子进程之前就已退出，此时子进程已托管给 init，
+                # 按父子关系找不到，但仍在它创建的会话中
+                self.adopt_session(watch.path, pid)
+            if not pids:
+                del self._apps[watch.path]
+                self.app_exited.emit(watch.path)
+
+    def adopt_session(self, path, sid):
+        """把会话 sid（启动的进程以新会话启动，会话号即其pid）中仍在运行的进程纳入跟踪，返回收养数量"""
+        adopted = 0
+        for pid in psutil.pids():
+            if pid == sid or pid in self._watches:
+                continue
+            try:
+                if os.getsid(pid) != sid:
+                    continue
+            except OSError:
+                continue
+            if self._add_watch(path, pid):
+                self.process_adopted.emit(path, pid)
+                adopted += 1
+        return adopted
+
+    def clear(self):
+        """停止跟踪所有进程"""
+        for watch in self._watches.values():
+            watch.notifier.setEnabled(False)
+            watch.notifier.deleteLater()
+            os.close(watch.fd)
+        self._watches.clear()
+        self._apps.clear()
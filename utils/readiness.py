@@ -0,0 +1,109 @@
+"""就绪检测：判断刚启动的应用是否真正可用
+
+应用条目中的 ready 字段配置检测方式，每种检测都有超时（timeout，秒）：
+- {"type": "alive", "ms": 1500}                       进程持续存活 N 毫秒
+- {"type": "tcp", "port": 5432, "host": "127.0.0.1"}  端口可以建立连接
+- {"type": "path", "path": "C:/app/ready.flag"}       文件或套接字出现
+- {"type": "cpu_idle", "threshold": 5, "ms": 2000}    CPU占用持续低于阈值
+未配置 ready 时，进程创建成功即视为就绪。
+"""
+import logging
+import os
+import time
+import socket
+import psutil
+from config.constants import READINESS_POLL_INTERVAL, DEFAULT_READY_TIMEOUT
+from .process_utils import get_process_snapshot
+
+log = logging.getLogger(__name__)
+
+
+def _app_alive(path, pid):
+    """应用是否存活：优先看启动的进程，进程已退出（如启动器类程序）时看进程快照"""
+    if pid is not None and psutil.pid_exists(pid):
+        try:
+            if psutil.Process(pid).status() != psutil.STATUS_ZOMBIE:
+                return True
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            pass
+    return get_process_snapshot().is_running(path)
+
+
+def _tcp_open(host, port):
+    try:
+        with socket.create_connection((host, port), timeout=READINESS_POLL_INTERVAL):
+            return True
+    except OSError:
+        return False
+
+
+def _process_tree(pid):
+    try:
+        proc = psutil.Process(pid)
+        return [proc] + proc.children(recursive=True)
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        return []
+
+
+def _tree_cpu_percent(procs):
+    total = 0.0
+    for proc in procs:
+        try:
+            total += proc.cpu_percent(interval=None)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+    return total
+
+
+def wait_until_ready(probe, path, pid, cancelled=None):
+    """等待应用就绪，返回 (是否就绪, 说明)
+
+    在后台线程中调用；cancelled 为 threading.Event，设置后立即返回。
+    """
+    if not probe:
+        return True, ""
+
+    kind = probe.get('type', 'alive')
+    timeout = probe.get('timeout', DEFAULT_READY_TIMEOUT)
+    start = time.monotonic()
+    deadline = start + timeout
+    settle = probe.get('ms', 1000) / 1000.0
+
+    # cpu_idle 需要先建立基准采样
+    cpu_procs = _process_tree(pid) if kind == 'cpu_idle' and pid else []
+    _tree_cpu_percent(cpu_procs)
+    idle_since = None
+
+    while time.monotonic() < deadline:
+        if cancelled is not None and cancelled.is_set():
+            return False, "已取消"
+
+        now = time.monotonic()
+        if kind == 'alive':
+            if not _app_alive(path, pid):
+                return False, "进程已退出"
+            if now - start >= settle:
+                return True, ""
+        elif kind == 'tcp':
+            if _tcp_open(probe.get('host', '127.0.0.1'), probe['port']):
+                return True, ""
+        elif kind == 'path':
+            if os.path.exists(probe['path']):
+                return True, ""
+        elif kind == 'cpu_idle':
+            if not _app_alive(path, pid):
+                return False, "进程已退出"
+            if _tree_cpu_percent(cpu_procs) < probe.get('threshold', 5.0):
+                if idle_since is None:
+                    idle_since = now
+                if now - idle_since >= settle:
+                    return True, ""
+            else:
+                idle_since = None
+        else:
+            log.warning("未知的就绪检测类型 %s，视为已就绪: %s", kind, path)
+            return True, ""
+
+        time.sleep(READINESS_POLL_INTERVAL)
+
+    return False, f"就绪检测超时（{timeout} 秒）"
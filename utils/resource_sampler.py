@@ -0,0 +1,265 @@
+"""应用资源采样：按应用记录内存、CPU和IO，存入定长NumPy环形缓冲区"""
+import time
+import numpy as np
+import psutil
+from config.constants import (RESOURCE_SAMPLE_INTERVAL, RESOURCE_SAMPLE_MAX_INTERVAL,
+                              RESOURCE_SAMPLE_BUDGET, RESOURCE_RAW_CAPACITY,
+                              RESOURCE_COARSE_CAPACITY, RESOURCE_DOWNSAMPLE_FACTOR)
+from .process_utils import get_process_snapshot
+from .process_registry import get_process_registry
+
+# 采样字段：常驻内存(字节)、CPU(%)、读/写速率(字节/秒)
+FIELDS = ('rss', 'cpu', 'read_rate', 'write_rate')
+RSS, CPU, READ_RATE, WRITE_RATE = range(len(FIELDS))
+
+
+class RingBuffer:
+    """定长环形缓冲区，写满后覆盖最旧的数据"""
+
+    def __init__(self, capacity, width):
+        self.times = np.zeros(capacity, dtype=np.float64)
+        self.data = np.zeros((capacity, width), dtype=np.float64)
+        self.capacity = capacity
+        self.index = 0
+        self.count = 0
+
+    def append(self, timestamp, values):
+        self.times[self.index] = timestamp
+        self.data[self.index] = values
+        self.index = (self.index + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def latest(self):
+        """最近一次的数据，没有数据时返回None"""
+        if not self.count:
+            return None
+        return self.data[(self.index - 1) % self.capacity]
+
+    def values(self):
+        """按时间顺序返回 (时间, 数据)"""
+        if self.count < self.capacity:
+            return self.times[:self.count], self.data[:self.count]
+        order = np.r_[self.index:self.capacity, 0:self.index]
+        return self.times[order], self.data[order]
+
+    def mean_since(self, timestamp):
+        """时间不早于 timestamp 的数据的平均值，没有数据时返回None"""
+        times, data = self.values()
+        recent = data[times >= timestamp]
+        return recent.mean(axis=0) if len(recent) else None
+
+    def mean(self):
+        """全部数据的平均值"""
+        if not self.count:
+            return None
+        if self.count < self.capacity:
+            return self.data[:self.count].mean(axis=0)
+        return self.data.mean(axis=0)
+
+
+class DownsampledSeries:
+    """两级序列：近期原始采样 + 每 N 个采样取平均后的长期序列
+
+    应用所在组不是当前组时不采样，序列保留，切换回来后继续累积。
+    """
+
+    def __init__(self, raw_capacity=RESOURCE_RAW_CAPACITY,
+                 coarse_capacity=RESOURCE_COARSE_CAPACITY,
+                 factor=RESOURCE_DOWNSAMPLE_FACTOR):
+        self.raw = RingBuffer(raw_capacity, len(FIELDS))
+        self.coarse = RingBuffer(coarse_capacity, len(FIELDS))
+        self.factor = factor
+        self._sum = np.zeros(len(FIELDS), dtype=np.float64)
+        self._pending = 0
+
+    def append(self, timestamp, values):
+        self.raw.append(timestamp, values)
+        self._sum += values
+        self._pending += 1
+        if self._pending >= self.factor:
+            self.coarse.append(timestamp, self._sum / self._pending)
+            self._sum[:] = 0
+            self._pending = 0
+
+    def latest(self):
+        return self.raw.latest()
+
+    def recent_mean(self, now):
+        """近期（原始采样覆盖的时长内）的平均值，之前切走时留下的旧采样不计入"""
+        window = self.raw.capacity * RESOURCE_SAMPLE_INTERVAL / 1000.0
+        return self.raw.mean_since(now - window)
+
+    def long_term(self, now):
+        """长期统计 (平均值, 峰值, 覆盖秒数)，长期序列还没有数据时返回None"""
+        times, data = self.coarse.values()
+        if not len(times):
+            return None
+        return data.mean(axis=0), data.max(axis=0), now - times[0]
+
+
+class ResourceSampler:
+    """按应用采样资源占用，自身开销受预算约束并对外报告
+
+    sample() 在后台线程中调用；每次的耗时记为 last_cost，
+    当耗时超过采样间隔的 RESOURCE_SAMPLE_BUDGET 比例时自动拉长间隔。
+    """
+
+    def __init__(self):
+        self.series = {}    # 应用路径 -> DownsampledSeries
+        self._procs = {}    # pid -> psutil.Process（cpu_percent 需要复用同一对象）
+        self._io_prev = {}  # pid -> (时间, 读字节, 写字节)
+        self.interval = RESOURCE_SAMPLE_INTERVAL
+        self.last_cost = 0.0
+        self.cost_history = RingBuffer(RESOURCE_RAW_CAPACITY, 1)
+
+    def _app_pids(self, path, snapshot, registry):
+        registered = registry.get_processes(path)
+        roots = [proc.pid for proc in registered] or snapshot.find_pids(path)
+        pids = []
+        for pid in roots:
+            for member in [pid] + snapshot.descendants(pid):
+                if member not in pids:
+                    pids.append(member)
+        return pids
+
+    def _get_process(self, pid, snapshot):
+        """复用进程对象：快照中的对象在进程存活期间保持不变"""
+        proc = self._procs.get(pid)
+        entry = snapshot.entries.get(pid)
+        if entry is not None and entry.proc is not proc:
+            proc = entry.proc
+        elif proc is None:
+            proc = psutil.Process(pid)
+        else:
+            return proc
+        self._procs[pid] = proc
+        self._io_prev.pop(pid, None)
+        return proc
+
+    def sample(self, app_paths):
+        """对指定应用采样一次，返回 {应用路径: 当前数据}"""
+        start = time.perf_counter()
+        now = time.monotonic()
+        snapshot = get_process_snapshot()
+        registry = get_process_registry()
+
+        current = {}
+        seen = set()
+        for path in app_paths:
+            values = np.zeros(len(FIELDS), dtype=np.float64)
+            for pid in self._app_pids(path, snapshot, registry):
+                seen.add(pid)
+                try:
+                    proc = self._get_process(pid, snapshot)
+                    with proc.oneshot():
+                        values[RSS] += proc.memory_info().rss
+                        values[CPU] += proc.cpu_percent(interval=None)
+                        try:
+                            io = proc.io_counters()
+                        except (psutil.AccessDenied, AttributeError):
+                            io = None
+                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                    continue
+
+                if io is not None:
+                    prev = self._io_prev.get(pid)
+                    if prev is not None and now > prev[0]:
+                        elapsed = now - prev[0]
+                        values[READ_RATE] += max(io.read_bytes - prev[1], 0) / elapsed
+                        values[WRITE_RATE] += max(io.write_bytes - prev[2], 0) / elapsed
+                    self._io_prev[pid] = (now, io.read_bytes, io.write_bytes)
+
+            series = self.series.get(path)
+            if series is None:
+                series = self.series[path] = DownsampledSeries()
+            series.append(now, values)
+            current[path] = values
+
+        # 清理已退出进程的缓存
+        for pid in list(self._procs):
+            if pid not in seen:
+                del self._procs[pid]
+                self._io_prev.pop(pid, None)
+
+        self.last_cost = time.perf_counter() - start
+        self.cost_history.append(now, (self.last_cost,))
+        self._adjust_interval()
+        return current
+
+    def _adjust_interval(self):
+        """采样耗时超出预算时拉长间隔，恢复后逐步回到默认间隔"""
+        budget = self.interval / 1000.0 * RESOURCE_SAMPLE_BUDGET
+        if self.last_cost > budget:
+            self.interval = min(int(self.interval * 1.5), RESOURCE_SAMPLE_MAX_INTERVAL)
+        elif self.last_cost < budget / 2 and self.interval > RESOURCE_SAMPLE_INTERVAL:
+            self.interval = max(int(self.interval / 1.5), RESOURCE_SAMPLE_INTERVAL)
+
+    def cost_ratio(self):
+        """平均采样耗时占采样间隔的比例"""
+        mean = self.cost_history.mean()
+        if mean is None:
+            return 0.0
+        return float(mean[0]) / (self.interval / 1000.0)
+
+    def app_usage(self, path, now=None):
+        """应用的 (当前数据, 近期平均, 长期统计)，没有数据时返回 (None, None, None)
+
+        长期统计为 (平均值, 峰值, 覆盖秒数)，长期序列还没有数据时为None。
+        """
+        series = self.series.get(path)
+        if series is None:
+            return None, None, None
+        if now is None:
+            now = time.monotonic()
+        return series.latest().copy(), series.recent_mean(now), series.long_term(now)
+
+    def group_usage(self, app_paths, now=None):
+        """一组应用合计的 (当前数据, 近期平均, 长期平均)，组内都还没有长期数据时长期平均为None"""
+        if now is None:
+            now = time.monotonic()
+        latest = np.zeros(len(FIELDS), dtype=np.float64)
+        recent = np.zeros(len(FIELDS), dtype=np.float64)
+        long_term = None
+        for path in app_paths:
+            app_latest, app_recent, app_long_term = self.app_usage(path, now)
+            if app_latest is not None:
+                latest += app_latest
+                recent += app_recent
+            if app_long_term is not None:
+                long_term = app_long_term[0] + (long_term if long_term is not None else 0)
+        return latest, recent, long_term
+
+    def sample_group(self, app_paths, keep_paths=None):
+        """采样一组应用，返回 ({应用路径: (当前, 近期平均, 长期统计)}, 组合计)
+
+        keep_paths 为仍在配置中的全部应用，不在其中的应用的序列被丢弃；
+        其他组的应用保留历史，切换回来后长期统计继续累积。
+        """
+        self.sample(app_paths)
+        if keep_paths is not None:
+            self.forget(keep_paths)
+        now = time.monotonic()
+        usage = {path: self.app_usage(path, now) for path in app_paths}
+        return usage, self.group_usage(app_paths, now)
+
+    def forget(self, keep_paths):
+        """丢弃不在 keep_paths 中的应用序列（应用已从所有组中删除）"""
+        keep_paths = set(keep_paths)
+        for path in list(self.series):
+            if path not in keep_paths:
+                del self.series[path]
+
+
+def format_bytes(value):
+    """把字节数格式化为可读字符串"""
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if abs(value) < 1024 or unit == 'GB':
+            return f"{value:.0f} {unit}" if unit == 'B' else f"{value:.1f} {unit}"
+        value /= 1024.0
+
+
+def format_duration(seconds):
+    """把秒数格式化为可读的时长（分钟或小时）"""
+    if seconds < 3600:
+        return f"{max(seconds / 60.0, 1):.0f} 分钟"
+    return f"{seconds / 3600.0:.1f} 小时"
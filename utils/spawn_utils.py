@@ -0,0 +1,177 @@
+"""直接启动引擎：不经过shell，解析结果缓存"""
+import os
+import shlex
+import shutil
+import threading
+import subprocess
+from .file_utils import read_lnk
+
+
+class LaunchSpec:
+    """应用的启动参数：argv、额外参数串和工作目录"""
+
+    def __init__(self, argv, arguments="", cwd=None, open_with_shell=False):
+        self.argv = argv                        # [可执行文件, 参数...]
+        self.arguments = arguments              # 快捷方式中的原始参数串
+        self.cwd = cwd or None                  # None 表示继承启动器的工作目录
+        self.open_with_shell = open_with_shell  # 非可执行目标，交给系统默认程序打开
+
+    def command_line(self):
+        """Windows 下传给 CreateProcess 的命令行"""
+        command = subprocess.list2cmdline(self.argv)
+        if self.arguments:
+            command += " " + self.arguments
+        return command
+
+    def posix_argv(self):
+        """POSIX 下的完整 argv"""
+        if self.arguments:
+            return self.argv + shlex.split(self.arguments)
+        return list(self.argv)
+
+    def __repr__(self):
+        return f"LaunchSpec({self.argv!r}, arguments={self.arguments!r}, cwd={self.cwd!r})"
+
+
+_spec_cache = {}  # path -> (mtime, LaunchSpec)
+
+
+def _is_executable(path):
+    if os.name == 'nt':
+        return path.lower().endswith(('.exe', '.com', '.bat', '.cmd'))
+    return os.access(path, os.X_OK) and not os.path.isdir(path)
+
+
+def _build_launch_spec(path):
+    if path.lower().endswith('.lnk'):
+        shortcut = read_lnk(path)
+        if shortcut and shortcut['target']:
+            target = shortcut['target']
+            if _is_executable(target):
+                return LaunchSpec([target], shortcut['arguments'] or "",
+                                  shortcut['working_dir'])
+        # 目标不是可执行文件（文件夹、文档等），交给系统打开快捷方式本身
+        return LaunchSpec([path], open_with_shell=True)
+
+    if os.path.isfile(path):
+        if _is_executable(path):
+            return LaunchSpec([path])
+        return LaunchSpec([path], open_with_shell=True)
+
+    # 不是文件：按命令行解析（例如手动配置的 "程序 参数"）
+    return LaunchSpec(_split_command(path))
+
+
+def _split_command(command):
+    """拆分命令行为 argv；Windows 下去掉引号，由 list2cmdline 重新按需加引号"""
+    if os.name != 'nt':
+        return shlex.split(command)
+    return [arg.replace('"', '') for arg in shlex.split(command, posix=False)]
+
+
+def resolve_launch_spec(path):
+    """解析应用的启动参数，按 (路径, 修改时间) 缓存"""
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        mtime = None
+
+    cached = _spec_cache.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    spec = _build_launch_spec(path)
+    _spec_cache[path] = (mtime, spec)
+    return spec
+
+
+def find_executable(spec):
+    """启动参数中要运行（或交给系统打开）的文件的实际路径，找不到时返回None
+
+    "程序 参数" 形式的命令按 PATH 查找程序。
+    """
+    if not spec.argv:
+        return None
+    target = spec.argv[0]
+    if os.path.isfile(target):
+        return target
+    return shutil.which(target)
+
+
+class SpawnedProcess:
+    """posix_spawn 启动的子进程句柄，接口与 Popen 的 pid/poll 一致
+
+    pid 为 None 表示已交给系统默认程序打开，无法跟踪具体进程。
+    """
+
+    def __init__(self, pid):
+        self.pid = pid
+        self.returncode = None
+
+    def poll(self):
+        """回收已退出的子进程，返回退出码，仍在运行时返回None"""
+        if self.pid is None:
+            return None
+        if self.returncode is None:
+            try:
+                pid, status = os.waitpid(self.pid, os.WNOHANG)
+            except ChildProcessError:
+                self.returncode = -1
+                return self.returncode
+            if pid:
+                self.returncode = os.waitstatus_to_exitcode(status)
+        return self.returncode
+
+
+_spawned = set()  # 尚未回收的 posix_spawn 子进程（工作线程添加，主线程回收）
+_spawned_lock = threading.Lock()
+
+
+def reap_spawned_processes():
+    """回收已退出的 posix_spawn 子进程，避免僵尸进程"""
+    with _spawned_lock:
+        exited = [proc for proc in _spawned if proc.poll() is not None]
+        _spawned.difference_update(exited)
+
+
+def _posix_spawn(argv):
+    devnull = os.devnull
+    file_actions = [
+        (os.POSIX_SPAWN_OPEN, 0, devnull, os.O_RDONLY, 0),
+        (os.POSIX_SPAWN_OPEN, 1, devnull, os.O_WRONLY, 0),
+        (os.POSIX_SPAWN_OPEN, 2, devnull, os.O_WRONLY, 0),
+    ]
+    pid = os.posix_spawnp(argv[0], argv, os.environ,
+                          file_actions=file_actions, setsid=True)
+    proc = SpawnedProcess(pid)
+    with _spawned_lock:
+        _spawned.add(proc)
+    return proc
+
+
+def spawn_process(spec):
+    """按启动参数直接创建进程（不经过shell），子进程与启动器分离
+
+    返回带 pid 和 poll() 的子进程句柄。
+    """
+    reap_spawned_processes()
+
+    if spec.open_with_shell:
+        if os.name == 'nt':
+            os.startfile(spec.argv[0])
+            return SpawnedProcess(None)
+        spec = LaunchSpec(['xdg-open', spec.argv[0]])
+
+    if os.name == 'nt':
+        # 控制台程序和批处理获得自己的控制台窗口（启动器本身没有控制台），
+        # 图形界面程序不受 CREATE_NEW_CONSOLE 影响；不重定向标准句柄，输出显示在新控制台中
+        flags = subprocess.CREATE_NEW_CONSOLE | subprocess.CREATE_NEW_PROCESS_GROUP
+        return subprocess.Popen(spec.command_line(), cwd=spec.cwd,
+                                creationflags=flags, close_fds=True)
+
+    argv = spec.posix_argv()
+    if spec.cwd is None and hasattr(os, 'posix_spawnp'):
+        return _posix_spawn(argv)
+    return subprocess.Popen(argv, cwd=spec.cwd, start_new_session=True,
+                            close_fds=True, stdin=subprocess.DEVNULL,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
@@ -1,9 +1,12 @@
 """系统相关工具"""
+import logging
 import os
 import sys
 from PyQt5.QtGui import QIcon, QPixmap
 from PyQt5.QtCore import Qt
 
+log = logging.getLogger(__name__)
+
 
 def create_default_icon():
     """创建默认图标"""
@@ -18,13 +21,18 @@ def create_default_icon():
         return QIcon(pixmap)
 
 
+_white_default_icons = {}  # 尺寸 -> 已绘制的默认图标，所有无图标的应用共享
+
+
 def create_white_default_icon(size=32):
-    """创建白色背景的默认图标"""
+    """创建白色背景的默认图标，同一尺寸只绘制一次"""
     from config.constants import APP_ICON_PATH
     from PyQt5.QtGui import QPainter, QBrush, QPen, QColor
 
     if os.path.exists(APP_ICON_PATH):
         return QIcon(APP_ICON_PATH)
+    elif size in _white_default_icons:
+        return _white_default_icons[size]
     else:
         # 创建一个白色背景的默认图标
         pixmap = QPixmap(size, size)
@@ -70,8 +78,9 @@ def create_white_default_icon(size=32):
             painter.drawEllipse(dot_x, dot_y - dot_size//2, dot_size, dot_size)
 
         painter.end()
-        print(f"[图标] 创建白色背景默认图标，尺寸: {size}x{size}")
-        return QIcon(pixmap)
+        log.debug("创建白色背景默认图标，尺寸: %dx%d", size, size)
+        _white_default_icons[size] = QIcon(pixmap)
+        return _white_default_icons[size]
 
 
 def get_app_directory():
@@ -0,0 +1,76 @@
+"""组切换规划：基于一次进程快照决定关闭、启动和保留哪些应用"""
+from .process_utils import get_process_snapshot
+from .process_registry import is_app_running
+from .freeze_engine import is_app_frozen
+
+# 切换策略
+SWITCH_CLOSE_THEN_LAUNCH = "close_then_launch"  # 先关闭再启动，峰值内存更低
+SWITCH_OVERLAP = "overlap"                      # 关闭与启动同时进行，更快
+SWITCH_FREEZE = "freeze"                        # 冻结原组而不关闭，切回时立即解冻
+SWITCH_POLICIES = (SWITCH_CLOSE_THEN_LAUNCH, SWITCH_OVERLAP, SWITCH_FREEZE)
+
+
+class TransitionPlan:
+    """组切换计划"""
+
+    def __init__(self, source, target, policy=SWITCH_CLOSE_THEN_LAUNCH):
+        self.source = source
+        self.target = target
+        self.policy = policy
+        self.close = []   # 原组启用、目标组未启用且正在运行 -> 关闭
+        self.launch = []  # 目标组启用、原组未启用且未运行 -> 启动
+        self.keep = []    # 两组都启用，或目标组启用且已在运行 -> 保持不动
+        self.freeze = []  # freeze 策略下代替关闭 -> 冻结
+        self.thaw = []    # 目标组启用且已被冻结 -> 解冻
+
+    def is_empty(self):
+        return not self.close and not self.launch and not self.freeze and not self.thaw
+
+    def describe(self):
+        """生成可读的计划说明"""
+        lines = [f"'{self.source}' -> '{self.target}'（策略: {self.policy}）"]
+        for title, paths in (("关闭", self.close), ("冻结", self.freeze), ("启动", self.launch),
+                             ("解冻", self.thaw), ("保留", self.keep)):
+            lines.append(f"{title} {len(paths)} 个:")
+            lines.extend(f"  {path}" for path in paths)
+        return "\n".join(lines)
+
+    def __repr__(self):
+        return (f"TransitionPlan({self.source!r} -> {self.target!r}, close={len(self.close)}, "
+                f"freeze={len(self.freeze)}, launch={len(self.launch)}, "
+                f"thaw={len(self.thaw)}, keep={len(self.keep)})")
+
+
+def plan_transition(source, source_apps, target, target_apps,
+                    policy=SWITCH_CLOSE_THEN_LAUNCH, snapshot=None):
+    """根据两组的应用列表规划切换，只做判断不执行任何操作（可用于预演）"""
+    if snapshot is None:
+        snapshot = get_process_snapshot()
+
+    source_enabled = {app['path'] for app in source_apps if app.get('enabled', True)}
+    target_enabled = [app['path'] for app in target_apps if app.get('enabled', True)]
+    target_set = set(target_enabled)
+
+    plan = TransitionPlan(source, target, policy)
+    for app in source_apps:
+        path = app['path']
+        if path in source_enabled and path not in target_set:
+            if not is_app_running(path, snapshot):
+                continue
+            if policy == SWITCH_FREEZE:
+                if not is_app_frozen(path, snapshot):
+                    plan.freeze.append(path)
+            else:
+                plan.close.append(path)
+
+    for path in target_enabled:
+        if not is_app_running(path, snapshot):
+            if path in source_enabled:
+                plan.keep.append(path)
+            else:
+                plan.launch.append(path)
+        elif is_app_frozen(path, snapshot):
+            plan.thaw.append(path)
+        else:
+            plan.keep.append(path)
+    return plan